@@ -1,7 +1,12 @@
+import time
+
+STARTED = time.perf_counter()
+
 from util.task_manager import TaskManager
-from util.logger import CLogger
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+from util import profiler
 from ui.main_component import MainComponent
-from ui.table import TableWidget
 from structs.result import Result
 from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog
 from PyQt6.QtGui import QAction
@@ -12,15 +17,14 @@ from qasync import QEventLoop, asyncSlot
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
+from functools import cached_property
 import sys
 import asyncio
 import os
-import pdb
-pdb.set_trace()
 
 
 load_dotenv()
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 project_root = Path(__file__).resolve().parent.parent
 ERROR = Result.ERROR
@@ -39,19 +43,35 @@ def args_parser(app) -> [str, str]:
     debug_option = QCommandLineOption(["d", "debug"], "Set logging to debug.")
     parser.addOption(debug_option)
 
+    database_option = QCommandLineOption(
+        ["database"], "SQLite database to use (default: DB from .env).",
+        "path")
+    parser.addOption(database_option)
+
+    profile_option = QCommandLineOption(
+        ["p", "profile"],
+        "Profile ingest, queries and UI tasks; write the results to logs/.")
+    parser.addOption(profile_option)
+
     parser.process(app)
 
+    if parser.isSet(profile_option):
+        profiler.enable()
+
     parser.isSet(debug_option)
 
     if parser.isSet(debug_option):
         BUILD = "DEBUG"
         DB = os.environ.get("DB")
-        log.info("BUILD: " + BUILD)
+        log.info("BUILD: %s", BUILD)
     else:
         BUILD = os.environ.get("BUILD")
-        log.info("BUILD: " + BUILD)
+        log.info("BUILD: %s", BUILD)
         DB = os.environ.get("DB")
 
+    if parser.isSet(database_option):
+        DB = parser.value(database_option)
+
     return [BUILD, DB]
 
 
@@ -62,13 +82,13 @@ class MainWindow(QMainWindow):
         super().__init__()
 
         self.manager = manager
+        self.painted = False
 
         if BUILD == "DEBUG":
             log.info("Main Window: %s", BUILD)
 
         self.setWindowTitle("Time Sheet App")
 
-        self.new_table_widget = TableWidget()
         self.main_component = MainComponent(self.manager)
 
         open_button = QAction("Open File", self)
@@ -88,8 +108,6 @@ class MainWindow(QMainWindow):
         export_button_connect = export_button.triggered.connect
         export_button_connect(self.main_component.export_button_action)
 
-        breakpoint()
-
         import_button = QAction("Import", self)
         import_button.setStatusTip(
             "Import compressed dump file to use as database.\
@@ -116,10 +134,24 @@ class MainWindow(QMainWindow):
 
         file_menu.addAction(close_button)
 
-        QTimer.singleShot(0, self.safe_async_startup)
-
         self.setCentralWidget(self.main_component)
 
+    @cached_property
+    def new_table_widget(self):
+        # Built on first use; it isn't shown at startup.
+        from ui.table import TableWidget
+        return TableWidget()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+        # DB init and the first combo box fill wait for the first paint,
+        # so the window appears before any database work starts.
+        if not self.painted:
+            self.painted = True
+            log.info("First paint after %.3fs", time.perf_counter() - STARTED)
+            QTimer.singleShot(0, self.safe_async_startup)
+
     def now(self) -> str:
         return datetime.now().strftime("%I:%M:%S")
 
@@ -203,6 +235,10 @@ def main():
     app.setApplicationVersion("0.0.9")
 
     BUILD, DB = args_parser(app)
+
+    if DB:
+        AsyncDBInterface.configure(DB)
+
     manager = TaskManager()
 
     # Start main window after loop is running
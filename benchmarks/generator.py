@@ -0,0 +1,174 @@
+"""
+Synthetic Time Trax reports for benchmarks and tests.
+
+Writes .xls workbooks with the layout `Processor.parse_sheet` expects:
+one sheet per employee, the "MM/DD/YYYY hh:mm AM" print stamp, the
+"User Name:" and "Employee Group" anchors, a "DAILY" hours column and,
+for a share of the sheets, the punch/special-pay comment rows at the
+bottom. Requires xlwt:
+
+    python -m benchmarks.generator reports/ --files 4 --sheets 50
+"""
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    import xlwt
+except ImportError:
+    xlwt = None
+
+PAY_PERIOD_DAYS = 14
+
+# Real reports are 37 columns wide; parse_sheet scans up to ncols.
+LAST_CELL = (36, 36)
+HEADER_ROW = 6
+COMMENT_ROW = 36
+HOURS_COLUMN = 4
+
+FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer",
+               "Michael", "Linda", "David", "Elizabeth", "Maria", "Jose",
+               "Wei", "Fatima", "Olga", "Kwame", "Aiko", "Lucas")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia",
+              "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez",
+              "Lopez", "Nguyen", "Kim", "Okafor", "Novak", "Sato", "Van Dyke")
+GROUPS = ("Warehouse", "Office", "Drivers", "Maintenance")
+HOURS = ("8:00", "8:00", "8:00", "8:15", "7:45", "9:30", "10:00", "6:00", "")
+WEEKEND_HOURS = ("", "", "", "", "4:00", "8:00")
+PUNCH_COMMENTS = ("", "late", "forgot to punch", "left early", "doctor")
+SPECIAL_PAY_COMMENTS = ("", "holiday pay", "vacation", "sick", "jury duty",
+                        "bereavement", "training")
+
+
+def employee_name(i: int) -> tuple[str, str, str]:
+    """
+    Deterministic, unique (first, middle initial, last) for employee `i`.
+    """
+    i, first = divmod(i, len(FIRST_NAMES))
+    i, last = divmod(i, len(LAST_NAMES))
+    i, middle = divmod(i, 26)
+
+    return (FIRST_NAMES[first], chr(ord("A") + middle),
+            f"{LAST_NAMES[last]}{i or ''}")
+
+
+def employee_group(i: int) -> str:
+    return GROUPS[i % len(GROUPS)]
+
+
+def day_hours(rnd: random.Random, day: date) -> str:
+    return rnd.choice(HOURS if day.weekday() < 5 else WEEKEND_HOURS)
+
+
+def write_sheet(sheet, rnd: random.Random, employee: int, start: date,
+                comment_density: float):
+    first, middle, last = employee_name(employee)
+
+    sheet.write(1, 0, f"{start.strftime('%m/%d/%Y')} 08:00 AM")
+    sheet.write(3, 0, "User Name:")
+    sheet.write(3, 2, f"{last}, {first} {middle}")
+    sheet.write(4, 0, "Employee Group")
+    sheet.write(4, 8, employee_group(employee))
+    sheet.write(HEADER_ROW, HOURS_COLUMN, "DAILY")
+    sheet.write(*LAST_CELL, "-")
+
+    for offset in range(PAY_PERIOD_DAYS):
+        day = start + timedelta(days=offset)
+        row = HEADER_ROW + 1 + offset
+
+        sheet.write(row, 1, day.strftime("%a %m/%d"))
+        sheet.write(row, HOURS_COLUMN, day_hours(rnd, day))
+
+    if rnd.random() < comment_density:
+        day = start + timedelta(days=rnd.randrange(PAY_PERIOD_DAYS))
+
+        sheet.write(COMMENT_ROW, 1, "DATE")
+        sheet.write(COMMENT_ROW, 2, "IN PUNCH COMMENT")
+        sheet.write(COMMENT_ROW, 3, "OUT PUNCH COMMENT")
+        sheet.write(COMMENT_ROW, 4, "SPECIAL PAY COMMENT")
+        sheet.write(COMMENT_ROW + 1, 1, day.isoformat())
+        sheet.write(COMMENT_ROW + 1, 2, rnd.choice(PUNCH_COMMENTS))
+        sheet.write(COMMENT_ROW + 1, 3, rnd.choice(PUNCH_COMMENTS))
+        sheet.write(COMMENT_ROW + 1, 4, rnd.choice(SPECIAL_PAY_COMMENTS[1:]))
+
+
+def write_report(path: str,
+                 start: date = date(2025, 1, 6),
+                 sheets: int = 25,
+                 first_employee: int = 0,
+                 comment_density: float = 0.3,
+                 seed: int = 0) -> Path:
+    """
+    Writes one pay period's report with a sheet for each of `sheets`
+    employees, starting at employee number `first_employee`.
+    """
+    if xlwt is None:
+        raise RuntimeError("xlwt is required to generate reports")
+
+    rnd = random.Random(f"{seed}-{start}-{first_employee}")
+    workbook = xlwt.Workbook()
+
+    for i in range(sheets):
+        employee = first_employee + i
+        sheet = workbook.add_sheet(f"Employee {employee}")
+        write_sheet(sheet, rnd, employee, start, comment_density)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(str(path))
+
+    return path
+
+
+def write_reports(directory: str,
+                  files: int = 4,
+                  sheets: int = 25,
+                  start: date = date(2025, 1, 6),
+                  comment_density: float = 0.3,
+                  seed: int = 0) -> list[Path]:
+    """
+    One report per consecutive pay period, each covering the same
+    `sheets` employees.
+    """
+    return [
+        write_report(
+            Path(directory) / f"report_{i:03d}.xls",
+            start=start + timedelta(days=PAY_PERIOD_DAYS * i),
+            sheets=sheets,
+            comment_density=comment_density,
+            seed=seed,
+        )
+        for i in range(files)
+    ]
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.generator",
+        description="Write synthetic Time Trax reports.")
+    parser.add_argument("directory", help="Output directory.")
+    parser.add_argument("--files", type=int, default=4,
+                        help="Reports (consecutive pay periods) to write.")
+    parser.add_argument("--sheets", type=int, default=25,
+                        help="Employees (sheets) per report.")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        default=date(2025, 1, 6),
+                        help="First pay period start (YYYY-MM-DD).")
+    parser.add_argument("--comment-density", type=float, default=0.3,
+                        help="Share of sheets with a comment row.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = write_reports(args.directory, args.files, args.sheets,
+                          args.start, args.comment_density, args.seed)
+
+    for path in paths:
+        print(path)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
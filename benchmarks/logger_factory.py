@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of logger creation: the old `inspect.stack()` caller
+lookup against `sys._getframe` and the `get_logger(__name__)` factory.
+
+    python -m benchmarks.logger_factory --number 2000
+"""
+import argparse
+import inspect
+import logging
+import os
+import sys
+import timeit
+
+from util.logger import CLogger, get_logger
+
+
+def stack_logger() -> logging.Logger:
+    # What CLogger did before: read every frame on the stack, with
+    # source context, to name the logger after the caller's file.
+    caller_frame = inspect.stack()[1]
+    return logging.getLogger(os.path.basename(caller_frame.filename))
+
+
+def frame_logger() -> logging.Logger:
+    return CLogger().get_logger()
+
+
+def factory_logger() -> logging.Logger:
+    return get_logger(__name__)
+
+
+CASES = {
+    "inspect.stack()": stack_logger,
+    "sys._getframe": frame_logger,
+    "get_logger(__name__)": factory_logger,
+}
+
+
+def nested(func, depth: int):
+    """
+    Calls `func` `depth` frames down, since the stack walk costs more
+    the deeper the caller is (e.g. imports inside the Qt event loop).
+    """
+    if depth == 0:
+        return func()
+
+    return nested(func, depth - 1)
+
+
+def run(number: int = 2000, depth: int = 20) -> dict[str, float]:
+    """
+    Microseconds per logger creation for every case in `CASES`.
+    """
+    return {
+        name: min(timeit.repeat(
+            lambda: nested(func, depth), number=number, repeat=3)
+        ) / number * 1e6
+        for name, func in CASES.items()
+    }
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.logger_factory",
+        description="Cost per logger creation.")
+    parser.add_argument("-n", "--number", type=int, default=2000,
+                        help="Loggers created per timing run.")
+    parser.add_argument("--depth", type=int, default=20,
+                        help="Stack depth of the calling frame.")
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.depth)
+    baseline = results["inspect.stack()"]
+
+    for name, us in results.items():
+        print(f"{name:>22}: {us:>9.2f} us/call  ({baseline / us:>6.0f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Seeds a database with N employees x M pay periods of synthetic work
+entries and comments, for the query, backup and restore benchmarks.
+
+The rows follow the same names, groups, hours and comments as
+`benchmarks.generator`, so a seeded database looks like one built by
+ingesting generated reports, only much faster:
+
+    python -m benchmarks.seeder bench.db --employees 500 --pay-periods 26
+"""
+import argparse
+import asyncio
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.generator import (
+    PAY_PERIOD_DAYS, PUNCH_COMMENTS, SPECIAL_PAY_COMMENTS,
+    day_hours, employee_group, employee_name,
+)
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.summaries import refresh_summaries
+
+ERROR = Result.ERROR
+
+
+def hours_value(hours: str) -> float:
+    """
+    "8:15" -> 8.25
+    """
+    h, _, m = hours.partition(":")
+    return int(h) + int(m) / 60
+
+
+def seed_rows(employees: int, pay_periods: int, start: date,
+              comment_density: float, seed: int) -> dict[str, list[tuple]]:
+    """
+    Employee, PayPeriod, WorkEntry and PayPeriodComment rows, with
+    explicit IDs so they can be bulk inserted without lookups.
+    """
+    rnd = random.Random(seed)
+    rows = {"employees": [], "pay_periods": [], "entries": [], "comments": []}
+
+    for employee_id in range(1, employees + 1):
+        first, middle, last = employee_name(employee_id - 1)
+        rows["employees"].append(
+            (employee_id, first, middle, last, employee_group(employee_id - 1)))
+
+    pay_period_id = 0
+
+    for period in range(pay_periods):
+        period_start = start + timedelta(days=PAY_PERIOD_DAYS * period)
+        period_end = period_start + timedelta(days=PAY_PERIOD_DAYS)
+
+        for employee_id in range(1, employees + 1):
+            pay_period_id += 1
+            rows["pay_periods"].append((pay_period_id, employee_id,
+                                        period_start.isoformat(),
+                                        period_end.isoformat()))
+
+            for offset in range(PAY_PERIOD_DAYS):
+                day = period_start + timedelta(days=offset)
+                hours = day_hours(rnd, day)
+
+                if hours:
+                    rows["entries"].append(
+                        (pay_period_id, day.isoformat(), hours_value(hours)))
+
+            if rnd.random() < comment_density:
+                day = period_start + timedelta(
+                    days=rnd.randrange(PAY_PERIOD_DAYS))
+                rows["comments"].append((
+                    pay_period_id, employee_id, day.isoformat(),
+                    rnd.choice(PUNCH_COMMENTS), rnd.choice(PUNCH_COMMENTS),
+                    rnd.choice(SPECIAL_PAY_COMMENTS[1:]),
+                ))
+
+    return rows
+
+
+async def seed_database(path: str,
+                        employees: int = 200,
+                        pay_periods: int = 12,
+                        start: date = date(2025, 1, 6),
+                        comment_density: float = 0.3,
+                        seed: int = 0) -> dict[str, int]:
+    """
+    Creates the schema at `path` (which must not exist yet), inserts
+    the synthetic rows in one transaction and builds PayPeriodSummary.
+    Returns the number of rows written per table.
+    """
+    if Path(path).exists():
+        raise FileExistsError(f"Refusing to seed existing database: {path}")
+
+    rows = seed_rows(employees, pay_periods, start, comment_density, seed)
+
+    async with AsyncDBInterface(path) as db:
+        if await db.create_from_schema() == ERROR:
+            raise RuntimeError(f"Failed to create schema at {path}")
+
+        async with db.transaction():
+            await db.connection.executemany(
+                """
+                INSERT INTO Employee
+                (EmployeeID, FirstName, MiddleName, LastName, EmployeeGroup)
+                VALUES (?, ?, ?, ?, ?);
+                """, rows["employees"])
+            await db.connection.executemany(
+                """
+                INSERT INTO PayPeriod
+                (PayPeriodID, EmployeeID, StartDate, EndDate)
+                VALUES (?, ?, ?, ?);
+                """, rows["pay_periods"])
+
+            if await db.save_work_entries(args=rows["entries"]) == ERROR:
+                raise RuntimeError("Failed to seed work entries")
+
+            await db.connection.executemany(
+                """
+                INSERT OR IGNORE INTO PayPeriodComment (
+                    PayPeriodID, EmployeeID, WorkDate,
+                    PunchInComment, PunchOutComment, SpecialPayComment
+                )
+                VALUES (?, ?, ?, ?, ?, ?);
+                """, rows["comments"])
+
+            summaries = await refresh_summaries(db)
+
+    return {**{table: len(r) for table, r in rows.items()},
+            "summaries": summaries}
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.seeder",
+        description="Seed a database with synthetic pay periods.")
+    parser.add_argument("path", help="Database file to create.")
+    parser.add_argument("-e", "--employees", type=int, default=200)
+    parser.add_argument("-p", "--pay-periods", type=int, default=12)
+    parser.add_argument("--start", type=date.fromisoformat,
+                        default=date(2025, 1, 6),
+                        help="First pay period start (YYYY-MM-DD).")
+    parser.add_argument("--comment-density", type=float, default=0.3,
+                        help="Share of pay periods with a comment.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    counts = asyncio.run(seed_database(
+        args.path, args.employees, args.pay_periods, args.start,
+        args.comment_density, args.seed))
+
+    print(", ".join(f"{count} {table}" for table, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""
+Repeatable parse, ingest, query, backup and restore benchmarks.
+
+Every run works on generated reports and a seeded database in a
+temporary directory, so it never touches app.db, backups/ or the
+metrics log. Results are saved as JSON; pass an earlier result as
+`--baseline` to flag cases that got slower than `--threshold`:
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --baseline baseline.json --only ingest query
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import util.metrics
+from benchmarks.generator import write_report, write_reports, xlwt
+from benchmarks.seeder import seed_database
+from util.async_db import AsyncDBInterface
+from util.comment_search import search_comments
+from util.lazy import lazy_import
+from util.logger import LOG_DIRECTORY
+from util.pipeline import IngestPipeline
+from util.processor import Processor
+from util.reports import REPORTS, run_report
+from util.summaries import read_summaries
+
+xlrd = lazy_import("xlrd")
+
+project_root = Path(__file__).resolve().parent.parent
+
+CASES = ("parse", "ingest", "query", "backup", "restore")
+
+# Default share a case may slow down by before it counts as a regression.
+# Timings on a shared machine vary by about 10% from run to run.
+THRESHOLD = 0.20
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+    def regressed(self, threshold: float) -> bool:
+        return self.change > threshold
+
+
+def timing(runs: list[float], items: int, unit: str) -> dict:
+    """
+    Result entry for one case. `best` is the figure compared against
+    baselines; it is the least affected by scheduler and cache noise.
+    """
+    best = min(runs)
+
+    return {
+        "best": round(best, 6),
+        "median": round(statistics.median(runs), 6),
+        "runs": [round(r, 6) for r in runs],
+        "items": items,
+        "unit": unit,
+        "per_second": round(items / best, 1) if best else 0.0,
+    }
+
+
+async def measure(func, repeat: int, setup=None) -> list[float]:
+    """
+    Wall time of `repeat` calls of the coroutine function `func`, after
+    one untimed warm-up. `setup` runs untimed before every call.
+    """
+    runs = []
+
+    for i in range(repeat + 1):
+        if setup is not None:
+            await setup()
+
+        started = time.perf_counter()
+        await func()
+        elapsed = time.perf_counter() - started
+
+        if i:
+            runs.append(elapsed)
+
+    return runs
+
+
+@contextmanager
+def isolated(db_path: Path, metrics_path: Path):
+    """
+    Points every `AsyncDBInterface()` at `db_path` and the ingest
+    metrics log at `metrics_path` for the duration of the block.
+    """
+    db_default = AsyncDBInterface.database
+    metrics_default = util.metrics.METRICS_FILE
+    AsyncDBInterface.configure(db_path)
+    util.metrics.METRICS_FILE = str(metrics_path)
+
+    try:
+        yield
+
+    finally:
+        AsyncDBInterface.configure(db_default)
+        util.metrics.METRICS_FILE = metrics_default
+
+
+class Workspace:
+    """
+    Generated reports and a seeded database, created on first use in a
+    temporary directory and shared by every case of a run.
+    """
+
+    def __init__(self, directory: str, args: argparse.Namespace):
+        self.directory = Path(directory)
+        self.args = args
+        self._reports = None
+        self._seeded = None
+        self.seeded_rows = 0
+
+    def path(self, name: str) -> Path:
+        return self.directory / name
+
+    @property
+    def reports(self) -> list[Path]:
+        if self._reports is None:
+            self._reports = write_reports(
+                self.path("reports"), files=self.args.files,
+                sheets=self.args.sheets,
+                comment_density=self.args.comment_density,
+                seed=self.args.seed)
+
+        return self._reports
+
+    async def seeded(self) -> Path:
+        if self._seeded is None:
+            self._seeded = self.path("seeded.db")
+            counts = await seed_database(
+                self._seeded, employees=self.args.employees,
+                pay_periods=self.args.pay_periods,
+                comment_density=self.args.comment_density,
+                seed=self.args.seed)
+            self.seeded_rows = counts["entries"]
+
+        return self._seeded
+
+    def connect(self, path: Path) -> AsyncDBInterface:
+        return AsyncDBInterface(path)
+
+
+async def bench_parse(ws: Workspace, repeat: int) -> dict:
+    """
+    Opens a workbook and parses every sheet, without normalizing or
+    touching the database.
+    """
+    report = write_report(ws.path("parse.xls"), sheets=ws.args.sheets,
+                          comment_density=ws.args.comment_density,
+                          seed=ws.args.seed)
+    processor = Processor()
+
+    async def parse():
+        workbook = xlrd.open_workbook(str(report))
+
+        for i in range(workbook.nsheets):
+            processor.parse_sheet(workbook.sheet_by_index(i), "RELEASE")
+
+    runs = await measure(parse, repeat)
+    return {"parse": timing(runs, ws.args.sheets, "sheets")}
+
+
+async def bench_ingest(ws: Workspace, repeat: int) -> dict:
+    """
+    Runs the full ingest pipeline over the generated reports into an
+    empty database.
+    """
+    files = [str(f) for f in ws.reports]
+    db_path = ws.path("ingest.db")
+    rows = []
+
+    async def setup():
+        if db_path.exists():
+            os.remove(db_path)
+
+        async with ws.connect(db_path) as db:
+            await db.create_from_schema()
+
+    async def ingest():
+        pipeline = IngestPipeline(processor=Processor(), BUILD="RELEASE",
+                                  workers=ws.args.workers)
+        stats = await pipeline.run(files)
+        rows.append(sum(s["rows"] for s in stats))
+
+    with isolated(db_path, ws.path("metrics.jsonl")):
+        runs = await measure(ingest, repeat, setup=setup)
+
+    return {"ingest": timing(runs, rows[-1], "rows")}
+
+
+async def bench_query(ws: Workspace, repeat: int) -> dict:
+    """
+    The aggregate reports, stored summaries and comment search against
+    the seeded database.
+    """
+    queries = {
+        **{f"report {name}": (lambda db, name=name: run_report(name, db=db))
+           for name in sorted(REPORTS)},
+        "summaries": lambda db: read_summaries(db=db),
+        "search word": lambda db: search_comments("vacation", db=db),
+        "search prefix": lambda db: search_comments("tr", db=db),
+    }
+    results = {}
+
+    async with ws.connect(await ws.seeded()) as db:
+        for name, query in queries.items():
+            runs = await measure(lambda: query(db), repeat)
+            results[f"query {name}"] = timing(runs, 1, "queries")
+
+    return results
+
+
+async def bench_backup(ws: Workspace, repeat: int) -> dict:
+    """
+    Dumps the seeded database to a zip archive.
+    """
+    output_dir = ws.path("backups")
+
+    async with ws.connect(await ws.seeded()) as db:
+        runs = await measure(lambda: db.dump_db_and_zip(output_dir), repeat)
+
+    return {"backup": timing(runs, ws.seeded_rows, "rows")}
+
+
+async def bench_restore(ws: Workspace, repeat: int) -> dict:
+    """
+    Rebuilds a database, including the comment search index, from a
+    backup of the seeded one.
+    """
+    async with ws.connect(await ws.seeded()) as db:
+        archive = await db.dump_db_and_zip(ws.path("backups"))
+
+    target = ws.connect(ws.path("restored.db"))
+    runs = await measure(lambda: target.initialize_db_from_zip(archive),
+                         repeat)
+
+    return {"restore": timing(runs, ws.seeded_rows, "rows")}
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "ingest": bench_ingest,
+    "query": bench_query,
+    "backup": bench_backup,
+    "restore": bench_restore,
+}
+
+
+def git_commit() -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                cwd=project_root, capture_output=True,
+                                text=True)
+        return result.stdout.strip() or None
+
+    except OSError:
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="timesheet-bench-") as directory:
+        ws = Workspace(directory, args)
+
+        for case in args.only:
+            started = time.perf_counter()
+            results.update(await BENCHMARKS[case](ws, args.repeat))
+            print(f"{case}: done in {time.perf_counter() - started:.1f}s",
+                  file=sys.stderr)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "config": {key: getattr(args, key) for key in (
+            "files", "sheets", "employees", "pay_periods",
+            "comment_density", "workers", "repeat", "seed")},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[Comparison]:
+    """
+    Cases present in both results, by best time.
+    """
+    return [
+        Comparison(name, baseline["results"][name]["best"], result["best"])
+        for name, result in current["results"].items()
+        if name in baseline.get("results", {})
+    ]
+
+
+def print_results(results: dict):
+    header = f"{'case':<26} {'best s':>9} {'median s':>9}  per second"
+    print(header)
+    print("-" * len(header))
+
+    for name, r in results["results"].items():
+        print(f"{name:<26} {r['best']:>9.4f} {r['median']:>9.4f}  "
+              f"{r['per_second']:.1f} {r['unit']}")
+
+
+def print_comparison(comparisons: list[Comparison], threshold: float):
+    header = f"{'case':<26} {'baseline s':>10} {'current s':>10} {'change':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed(threshold) else ""
+        print(f"{c.name:<26} {c.baseline:>10.4f} {c.current:>10.4f} "
+              f"{c.change:>+8.1%}{flag}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Parse, ingest, query, backup and restore benchmarks.")
+    parser.add_argument("--only", nargs="+", choices=CASES, default=CASES,
+                        help="Cases to run (default: all).")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="Timed runs per case, after one warm-up.")
+    parser.add_argument("--files", type=int, default=4,
+                        help="Reports to ingest.")
+    parser.add_argument("--sheets", type=int, default=50,
+                        help="Sheets (employees) per report.")
+    parser.add_argument("-e", "--employees", type=int, default=200,
+                        help="Employees in the seeded database.")
+    parser.add_argument("-p", "--pay-periods", type=int, default=26,
+                        help="Pay periods per employee in the seeded database.")
+    parser.add_argument("--comment-density", type=float, default=0.3)
+    parser.add_argument("-w", "--workers", type=int, default=2,
+                        help="Ingest parser threads.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None,
+                        help="Results file (default: logs/benchmark_<time>.json).")
+    parser.add_argument("-b", "--baseline", default=None,
+                        help="Earlier results file to compare against.")
+    parser.add_argument("-t", "--threshold", type=float, default=THRESHOLD,
+                        help="Slowdown (0.20 = 20%%) that fails the run.")
+    args = parser.parse_args(argv)
+
+    if xlwt is None and {"parse", "ingest"}.intersection(args.only):
+        print("xlwt is required for the parse and ingest benchmarks",
+              file=sys.stderr)
+        return 2
+
+    results = asyncio.run(run(args))
+
+    output = Path(args.output or os.path.join(
+        LOG_DIRECTORY, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print_results(results)
+    print(f"\nSaved to {output}")
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as f:
+        comparisons = compare(results, json.load(f))
+
+    print()
+    print_comparison(comparisons, args.threshold)
+
+    return 1 if any(c.regressed(args.threshold) for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
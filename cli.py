@@ -0,0 +1,764 @@
+"""
+Headless entry point for batch ingestion.
+
+Runs the same Processor pipeline as the Qt app without importing
+PyQt6 or qasync, so it can run on machines without a display:
+
+    python cli.py ingest reports/ "archive/2025-*.xls" --workers 4
+    python cli.py watch /srv/timeclock/exports
+    python cli.py overtime --group Warehouse
+    python cli.py search holiday --column special_pay --from 2025-01-01
+    python cli.py --database /fast/disk/app.db ingest reports/ --in-memory
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from structs.exceptions import FailedIngest
+from structs.records import OvertimeRule, PeriodTotals
+from structs.result import Result
+from util.analytics import load_hours_matrix
+from util.async_db import AsyncDBInterface, PRAGMA_PROFILES
+from util.comment_search import COLUMNS as COMMENT_COLUMNS, search_comments
+from util.exporter import available_formats, export_work_entries
+from util.logger import get_logger
+from util.overtime_rules import (
+    DEFAULT_GROUP,
+    RuleSet,
+    load_rules,
+    parse_threshold,
+)
+from util.pipeline import IngestPipeline
+from util.processor import Processor
+from util import profiler
+from util.reports import REPORTS, run_report
+from util.summaries import (
+    read_summaries,
+    refresh_stale_summaries,
+    refresh_summaries,
+)
+from util.watcher import DirectoryWatcher
+
+load_dotenv()
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+
+def args_parser(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Timesheet Analyzer command line tools.")
+    parser.add_argument("-d", "--debug", action="store_true",
+                        help="Set build to DEBUG.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the command; write cProfile stats, "
+                             "sampled stacks and memory growth to logs/.")
+    parser.add_argument("--database", metavar="PATH",
+                        default=os.environ.get("DB"),
+                        help="SQLite database to use (default: DB from "
+                             ".env, else app.db).")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser(
+        "ingest", help="Ingest reports from files, globs or directories.")
+    ingest.add_argument("paths", nargs="+",
+                        help="Report files, glob patterns or directories.")
+    ingest.add_argument("-w", "--workers", type=int, default=2,
+                        help="Number of sheet parser threads.")
+    ingest.add_argument("-p", "--pragma-profile", default="default",
+                        choices=sorted(PRAGMA_PROFILES),
+                        help="SQLite PRAGMA profile to use while ingesting.")
+    ingest.add_argument("-n", "--dry-run", action="store_true",
+                        help="Parse and validate every sheet without "
+                             "touching the database.")
+    ingest.add_argument("--json", metavar="PATH", default=None,
+                        help="With --dry-run, also write the report as JSON.")
+    ingest.add_argument("--check-ledger", action="store_true",
+                        help="Report which files the ingest ledger would "
+                             "skip, without writing.")
+    ingest.add_argument("-f", "--force", action="store_true",
+                        help="Ignore the ingest ledger and re-ingest.")
+    ingest.add_argument("--round-to", type=float, default=None,
+                        help="Round hours to this increment, e.g. 0.25.")
+    ingest.add_argument("-R", "--reconcile", action="store_true",
+                        help="Update and delete stored work entries so "
+                             "they match corrected reports. Reads every "
+                             "sheet, even already ingested ones.")
+    ingest.add_argument("-m", "--in-memory", action="store_true",
+                        help="Ingest into an in-memory copy of the database "
+                             "and write it back to disk at the end.")
+
+    watch = commands.add_parser(
+        "watch", help="Ingest new reports as they appear in a directory.")
+    watch.add_argument("directory", help="Directory to watch.")
+    watch.add_argument("-i", "--interval", type=float, default=2.0,
+                       help="Seconds between directory scans.")
+    watch.add_argument("-s", "--settle", type=float, default=3.0,
+                       help="Seconds a file must stay unchanged before "
+                            "it is ingested.")
+    watch.add_argument("-w", "--workers", type=int, default=2,
+                       help="Number of files processed concurrently.")
+    watch.add_argument("-r", "--recursive", action="store_true",
+                       help="Also watch subdirectories.")
+    watch.add_argument("-p", "--pragma-profile", default="default",
+                       choices=sorted(PRAGMA_PROFILES),
+                       help="SQLite PRAGMA profile to use while ingesting.")
+    watch.add_argument("--round-to", type=float, default=None,
+                       help="Round hours to this increment, e.g. 0.25.")
+
+    overtime = commands.add_parser(
+        "overtime", help="Report hours and overtime per employee pay period.")
+    overtime.add_argument("-s", "--start-date", default=None,
+                          help="Only this pay period (YYYY-MM-DD).")
+    overtime.add_argument("-g", "--group", default=None,
+                          help="Only this employee group.")
+    overtime.add_argument("--from", dest="date_from", default=None,
+                          help="First work date to include (YYYY-MM-DD).")
+    overtime.add_argument("--to", dest="date_to", default=None,
+                          help="Last work date to include (YYYY-MM-DD).")
+    overtime.add_argument("-a", "--all", action="store_true",
+                          help="Include pay periods without overtime.")
+    overtime.add_argument("--json", metavar="PATH", default=None,
+                          help="Also write the report as JSON.")
+
+    report = commands.add_parser(
+        "report", help="Aggregate hours and overtime reports.")
+    report.add_argument("kind", choices=sorted(REPORTS),
+                        help="groups: per group and pay period; "
+                             "periods: company totals per pay period; "
+                             "top-overtime: most overtime per pay period; "
+                             "weekly: week-over-week hours per employee.")
+    report.add_argument("-s", "--start-date", default=None,
+                        help="Only this pay period (YYYY-MM-DD).")
+    report.add_argument("-g", "--group", default=None,
+                        help="Only this employee group.")
+    report.add_argument("--from", dest="date_from", default=None,
+                        help="First work date for the weekly report.")
+    report.add_argument("--to", dest="date_to", default=None,
+                        help="Last work date for the weekly report.")
+    report.add_argument("-n", "--limit", type=int, default=10,
+                        help="Employees per pay period for top-overtime.")
+    report.add_argument("--json", metavar="PATH", default=None,
+                        help="Also write the report as JSON.")
+
+    export = commands.add_parser(
+        "export", help="Export work entries for payroll.")
+    export.add_argument("output", help="Output file. The format's suffix "
+                                       "is added if it has none.")
+    export.add_argument("-f", "--format", default="csv",
+                        choices=available_formats(),
+                        help="csv, npz (NumPy), or parquet when pyarrow "
+                             "is installed.")
+    export.add_argument("--from", dest="date_from", default=None,
+                        help="First work date (YYYY-MM-DD).")
+    export.add_argument("--to", dest="date_to", default=None,
+                        help="Last work date (YYYY-MM-DD).")
+    export.add_argument("-g", "--group", action="append", default=[],
+                        help="Only this employee group. Repeatable.")
+    export.add_argument("-e", "--employee", action="append", default=[],
+                        help="Only this employee's full name. Repeatable.")
+    export.add_argument("--chunk-size", type=int, default=50_000,
+                        help="Rows read and written per chunk.")
+
+    search = commands.add_parser(
+        "search", help="Full-text search over punch and special-pay comments.")
+    search.add_argument("text", help='Words to match; "quoted phrases" '
+                                     'match as phrases.')
+    search.add_argument("-c", "--column", default=None,
+                        choices=sorted(COMMENT_COLUMNS),
+                        help="Only search this comment field.")
+    search.add_argument("--from", dest="date_from", default=None,
+                        help="First work date (YYYY-MM-DD).")
+    search.add_argument("--to", dest="date_to", default=None,
+                        help="Last work date (YYYY-MM-DD).")
+    search.add_argument("-g", "--group", default=None,
+                        help="Only this employee group.")
+    search.add_argument("-n", "--limit", type=int, default=100,
+                        help="Maximum number of comments.")
+
+    commands.add_parser(
+        "rebuild-summaries",
+        help="Recompute the stored totals of every pay period.")
+
+    rules = commands.add_parser(
+        "rules", help="List or change overtime rules.")
+    rule_commands = rules.add_subparsers(dest="rules_command")
+
+    rule_set = rule_commands.add_parser(
+        "set", help="Set the rule for an employee group ('*' for everyone).")
+    rule_set.add_argument("group", help="Employee group, or '*'.")
+    rule_set.add_argument("--daily", default=None,
+                          help="Daily threshold in hours ('none' disables).")
+    rule_set.add_argument("--weekly", default=None,
+                          help="Weekly threshold in hours ('none' disables).")
+    rule_set.add_argument("--period", default=None,
+                          help="Bi-weekly hours before any overtime counts "
+                               "('none' disables).")
+    rule_set.add_argument("--weekend", type=float, default=None,
+                          help="Overtime hours earned per weekend hour.")
+
+    rule_delete = rule_commands.add_parser(
+        "delete", help="Remove the rule for an employee group.")
+    rule_delete.add_argument("group", help="Employee group, or '*'.")
+
+    return parser.parse_args(argv)
+
+
+def resolve_inputs(paths: list[str]) -> list[str]:
+    """
+    Expands files, glob patterns and directories (searched recursively)
+    into a sorted, de-duplicated list of .xls files.
+    """
+    files = set()
+
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, "**", "*.xls"),
+                                recursive=True)
+        else:
+            matches = glob.glob(path) or [path]
+
+        for match in matches:
+            if match.lower().endswith(".xls") and os.path.isfile(match):
+                files.add(str(Path(match).resolve()))
+            else:
+                log.warning("Ignoring %s: not an .xls file", match)
+
+    return sorted(files)
+
+
+async def plan(files: list[str], workers: int) -> list[dict]:
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def run(file_path: str) -> dict:
+        async with semaphore:
+            try:
+                return await Processor().plan(file_path)
+
+            except Exception as e:
+                log.error("Failed to check %s: %s | %s",
+                          file_path, type(e).__name__, e.args)
+                return {"file": file_path, "status": "error", "sheets": 0,
+                        "sheets_ingested": 0, "rows": 0, "seconds": 0.0}
+
+    return await asyncio.gather(*(run(f) for f in files))
+
+
+async def dry_run(files: list[str], workers: int, BUILD: str,
+                  round_to: float = None) -> list[dict]:
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def run(file_path: str) -> list[dict]:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    Processor(round_to=round_to).dry_run, file_path, BUILD)
+
+            except Exception as e:
+                log.error("Failed to open %s: %s | %s",
+                          file_path, type(e).__name__, e.args)
+                return [{"file": file_path, "sheet": None, "employee": "",
+                         "group": "", "pay_period_start": "",
+                         "pay_period_end": "", "entries": 0,
+                         "total_hours": 0.0, "parse_seconds": 0.0,
+                         "anomalies": [f"failed to open: {e}"]}]
+
+    results = await asyncio.gather(*(run(f) for f in files))
+    return [report for reports in results for report in reports]
+
+
+def print_dry_run(reports: list[dict]):
+    header = f"{'sheet':>5} {'employee':<28} {'start':<10} {'entries':>7} " \
+             f"{'hours':>7} {'ms':>6}  file"
+    print(header)
+    print("-" * len(header))
+
+    for r in reports:
+        sheet = "-" if r["sheet"] is None else r["sheet"]
+        print(f"{sheet:>5} {r['employee'][:28]:<28} "
+              f"{r['pay_period_start']:<10} {r['entries']:>7} "
+              f"{r['total_hours']:>7.2f} {r['parse_seconds'] * 1000:>6.1f}  "
+              f"{r['file']}")
+
+        for anomaly in r["anomalies"]:
+            print(f"{'':>5} ! {anomaly}")
+
+    flagged = len([r for r in reports if r["anomalies"]])
+    print("-" * len(header))
+    print(f"{len(reports)} sheet(s), {flagged} with anomalies")
+
+
+def print_changes(stats: list[dict]):
+    print()
+    print(f"{'inserted':>8} {'updated':>8} {'deleted':>8} "
+          f"{'unchanged':>9}  file")
+
+    for s in stats:
+        changes = s.get("changes") or {}
+        print(f"{changes.get('inserted', 0):>8} "
+              f"{changes.get('updated', 0):>8} "
+              f"{changes.get('deleted', 0):>8} "
+              f"{changes.get('unchanged', 0):>9}  {s['file']}")
+
+
+def print_timings(timings: dict):
+    print()
+    print(f"{'stage':<10} {'items':>7} {'busy s':>8}")
+
+    for stage, timing in timings.items():
+        print(f"{stage:<10} {timing['items']:>7} {timing['seconds']:>8.3f}")
+
+
+def print_report(stats: list[dict]):
+    header = f"{'status':<9} {'sheets':>9} {'rows':>7} {'seconds':>8} " \
+             f"{'rows/s':>9}  file"
+    print(header)
+    print("-" * len(header))
+
+    total_rows = 0
+
+    for s in stats:
+        rate = s["rows"] / s["seconds"] if s["seconds"] else 0.0
+        sheets = f"{s['sheets_ingested']}/{s['sheets']}"
+        print(f"{s['status']:<9} {sheets:>9} {s['rows']:>7} "
+              f"{s['seconds']:>8.3f} {rate:>9.1f}  {s['file']}")
+
+        total_rows += s["rows"]
+
+    print("-" * len(header))
+    print(f"{len(stats)} file(s), {total_rows} row(s)")
+
+
+def print_overtime(totals: list[PeriodTotals]):
+    header = f"{'employee':<28} {'group':<14} {'start':<10} {'week 1':>7} " \
+             f"{'week 2':>7} {'total':>7} {'OT':>6}"
+    print(header)
+    print("-" * len(header))
+
+    for t in totals:
+        print(f"{t.employee[:28]:<28} {str(t.group)[:14]:<14} "
+              f"{t.start_date:<10} {t.week_1:>7.2f} {t.week_2:>7.2f} "
+              f"{t.total:>7.2f} {t.overtime:>6.2f}")
+
+    print("-" * len(header))
+    print(f"{len(totals)} pay period(s), "
+          f"{sum(t.overtime for t in totals):.2f} overtime hour(s)")
+
+
+def print_rules(rules: RuleSet):
+    header = f"{'group':<16} {'daily':>7} {'weekly':>7} {'period':>7} " \
+             f"{'weekend':>7}"
+    print(header)
+    print("-" * len(header))
+
+    def show(value) -> str:
+        return "-" if value is None else f"{value:g}"
+
+    for group, rule in [(DEFAULT_GROUP, rules.default),
+                        *sorted(rules.overrides.items())]:
+        print(f"{group[:16]:<16} {show(rule.daily_threshold):>7} "
+              f"{show(rule.weekly_threshold):>7} "
+              f"{show(rule.period_threshold):>7} "
+              f"{show(rule.weekend_multiplier):>7}")
+
+    print("-" * len(header))
+    print(f"version {rules.version}")
+
+
+async def initialize_database() -> bool:
+    """
+    Creates or migrates the database and refreshes any stale summaries
+    on the writer, so the read-only connections that follow find the
+    current schema. False, after logging, when that fails.
+    """
+    async with AsyncDBInterface.writer() as db:
+        if await db.initialize_db() == ERROR:
+            log.critical("Failed to initialize DB. Exiting.")
+            return False
+
+        await load_rules(db)
+        await refresh_stale_summaries(db)
+
+    return True
+
+
+async def run_rules(args: argparse.Namespace) -> int:
+    async with AsyncDBInterface.writer() as db:
+        if await db.initialize_db() == ERROR:
+            log.critical("Failed to initialize DB. Exiting.")
+            return 1
+
+        rules = await load_rules(db)
+
+        if args.rules_command == "set":
+            current = rules.rule_for(
+                None if args.group == DEFAULT_GROUP else args.group)
+            rule = OvertimeRule(
+                daily_threshold=current.daily_threshold
+                if args.daily is None else parse_threshold(args.daily),
+                weekly_threshold=current.weekly_threshold
+                if args.weekly is None else parse_threshold(args.weekly),
+                period_threshold=current.period_threshold
+                if args.period is None else parse_threshold(args.period),
+                weekend_multiplier=current.weekend_multiplier
+                if args.weekend is None else args.weekend,
+            )
+            result = await db.save_overtime_rule(args=(args.group, *rule))
+
+        elif args.rules_command == "delete":
+            result = await db.delete_overtime_rule(args=(args.group,))
+
+        else:
+            result = SUCCESS
+
+        if result == ERROR:
+            log.error("Failed to update overtime rule for %s", args.group)
+            return 1
+
+        rules = await load_rules(db)
+        print_rules(rules)
+
+        if args.rules_command is not None:
+            async with db.transaction():
+                count = await refresh_summaries(db, rules=rules)
+
+            print(f"Rebuilt {count} pay period summaries.")
+
+    return 0
+
+
+def print_table(columns: tuple[str, ...], rows: list[tuple]):
+    def cell(value) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+
+    cells = [[cell(value) for value in row] for row in rows]
+    widths = [
+        max([len(column), *(len(row[i]) for row in cells)])
+        for i, column in enumerate(columns)
+    ]
+
+    header = " ".join(f"{c:>{w}}" for c, w in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+
+    for row in cells:
+        print(" ".join(f"{v:>{w}}" for v, w in zip(row, widths)))
+
+    print("-" * len(header))
+    print(f"{len(rows)} row(s)")
+
+
+async def run_report_command(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+
+    try:
+        if not await initialize_database():
+            return 1
+
+        report = await run_report(
+            args.kind,
+            start_date=args.start_date,
+            group=args.group,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            limit=args.limit,
+        )
+
+    except Exception as e:
+        log.error("Failed to run report: %s | %s", type(e).__name__, e.args)
+        return 1
+
+    print_table(report.columns, report.rows)
+    print(f"\nWall time: {time.perf_counter() - started:.3f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([dict(zip(report.columns, row)) for row in report.rows],
+                      f, indent=2)
+
+    return 0
+
+
+async def run_export(args: argparse.Namespace) -> int:
+    try:
+        if not await initialize_database():
+            return 1
+
+        stats = await export_work_entries(
+            output=args.output,
+            fmt=args.format,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            groups=args.group,
+            employees=args.employee,
+            chunk_size=args.chunk_size,
+        )
+
+    except Exception as e:
+        log.error("Failed to export work entries: %s | %s",
+                  type(e).__name__, e.args)
+        return 1
+
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"Exported {stats['rows']} row(s) in {stats['chunks']} chunk(s) "
+          f"to {stats['path']} in {stats['seconds']:.3f}s ({rate:.0f} rows/s)")
+
+    return 0
+
+
+async def run_search(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+
+    try:
+        if not await initialize_database():
+            return 1
+
+        async with AsyncDBInterface(read_only=True) as db:
+            matches = await search_comments(
+                args.text,
+                column=args.column,
+                date_from=args.date_from,
+                date_to=args.date_to,
+                group=args.group,
+                limit=args.limit,
+                db=db,
+            )
+
+    except Exception as e:
+        log.error("Failed to search comments: %s | %s",
+                  type(e).__name__, e.args)
+        return 1
+
+    print_table(
+        ("Date", "Employee", "Group", "Punch In", "Punch Out", "Special Pay"),
+        [(m.work_date, m.employee, m.group, m.punch_in, m.punch_out,
+          m.special_pay) for m in matches],
+    )
+    print(f"\nWall time: {time.perf_counter() - started:.3f}s")
+
+    return 0
+
+
+async def run_rebuild_summaries() -> int:
+    started = time.perf_counter()
+
+    try:
+        async with AsyncDBInterface.writer() as db:
+            if await db.initialize_db() == ERROR:
+                log.critical("Failed to initialize DB. Exiting.")
+                return 1
+
+            rules = await load_rules(db)
+
+            async with db.transaction():
+                count = await refresh_summaries(db, rules=rules)
+
+    except Exception as e:
+        log.error("Failed to rebuild summaries: %s | %s",
+                  type(e).__name__, e.args)
+        return 1
+
+    print(f"Rebuilt {count} pay period summaries "
+          f"in {time.perf_counter() - started:.3f}s")
+
+    return 0
+
+
+async def run_overtime(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+
+    try:
+        if not await initialize_database():
+            return 1
+
+        # Whole pay periods come straight from the stored summaries;
+        # a work-date range needs the entries themselves.
+        if args.date_from is None and args.date_to is None:
+            totals = await read_summaries(
+                start_date=args.start_date, group=args.group)
+
+        else:
+            matrix = await load_hours_matrix(
+                start_date=args.start_date,
+                group=args.group,
+                date_from=args.date_from,
+                date_to=args.date_to,
+            )
+            totals = matrix.totals()
+
+    except Exception as e:
+        log.error("Failed to load work entries: %s | %s",
+                  type(e).__name__, e.args)
+        return 1
+
+    if not args.all:
+        totals = [t for t in totals if t.overtime > 0]
+
+    elapsed = time.perf_counter() - started
+
+    print_overtime(totals)
+    print(f"\nWall time: {elapsed:.3f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([t._asdict() for t in totals], f, indent=2)
+
+    return 0
+
+
+async def run_ingest(args: argparse.Namespace, BUILD: str) -> int:
+    files = resolve_inputs(args.paths)
+
+    if not files:
+        log.error("No .xls files found in: %s", " ".join(args.paths))
+        return 1
+
+    if args.dry_run:
+        reports = await dry_run(files, workers=args.workers, BUILD=BUILD,
+                                round_to=args.round_to)
+        print_dry_run(reports)
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(reports, f, indent=2)
+
+        return 1 if any(r["anomalies"] for r in reports) else 0
+
+    AsyncDBInterface.use_pragma_profile(args.pragma_profile)
+
+    if not await initialize_database():
+        return 1
+
+    if args.check_ledger:
+        print_report(await plan(files, workers=args.workers))
+        return 0
+
+    pipeline = IngestPipeline(
+        processor=Processor(round_to=args.round_to),
+        BUILD=BUILD,
+        force=args.force,
+        reconcile=args.reconcile,
+        workers=args.workers,
+    )
+
+    started = time.perf_counter()
+
+    if args.in_memory:
+        batch = AsyncDBInterface.in_memory()
+    else:
+        batch = contextlib.nullcontext()
+
+    with profiler.memory_traced("ingest"):
+        try:
+            async with batch:
+                stats = await pipeline.run(files)
+                failed = [s["file"] for s in stats if s["status"] == "error"]
+
+                # All or nothing: a failed file discards the whole batch.
+                if args.in_memory and failed:
+                    raise FailedIngest(failed)
+
+        except FailedIngest as e:
+            log.error("Not saving the in-memory database, %d file(s) "
+                      "failed: %s", len(e.details), ", ".join(e.details))
+
+    elapsed = time.perf_counter() - started
+
+    print_report(stats)
+
+    if args.reconcile:
+        print_changes(stats)
+
+    print_timings(pipeline.timings)
+    print(f"\nWall time: {elapsed:.3f}s")
+
+    return 1 if failed else 0
+
+
+async def run_watch(args: argparse.Namespace, BUILD: str) -> int:
+    if not os.path.isdir(args.directory):
+        log.error("Not a directory: %s", args.directory)
+        return 1
+
+    AsyncDBInterface.use_pragma_profile(args.pragma_profile)
+
+    if not await initialize_database():
+        return 1
+
+    watcher = DirectoryWatcher(
+        directory=args.directory,
+        interval=args.interval,
+        settle=args.settle,
+        workers=args.workers,
+        recursive=args.recursive,
+        round_to=args.round_to,
+        BUILD=BUILD,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, watcher.stop)
+
+    await watcher.run()
+    return 0
+
+
+def main(argv: list[str] = None) -> int:
+    args = args_parser(argv)
+    BUILD = "DEBUG" if args.debug else os.environ.get("BUILD", "RELEASE")
+
+    if args.profile:
+        profiler.enable()
+
+    if args.database:
+        AsyncDBInterface.configure(args.database)
+
+    with profiler.profiled(f"cli_{args.command}"):
+        return run_command(args, BUILD)
+
+
+def run_command(args: argparse.Namespace, BUILD: str) -> int:
+    if args.command == "ingest":
+        return asyncio.run(run_ingest(args, BUILD))
+
+    if args.command == "watch":
+        return asyncio.run(run_watch(args, BUILD))
+
+    if args.command == "overtime":
+        return asyncio.run(run_overtime(args))
+
+    if args.command == "rules":
+        return asyncio.run(run_rules(args))
+
+    if args.command == "report":
+        return asyncio.run(run_report_command(args))
+
+    if args.command == "export":
+        return asyncio.run(run_export(args))
+
+    if args.command == "search":
+        return asyncio.run(run_search(args))
+
+    if args.command == "rebuild-summaries":
+        return asyncio.run(run_rebuild_summaries())
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,6 +26,10 @@ CREATE TABLE IF NOT EXISTS WorkEntry(
 );
 
 
+CREATE INDEX IF NOT EXISTS WorkEntryWorkDate
+ON WorkEntry(WorkDate);
+
+
 CREATE TABLE IF NOT EXISTS PayPeriodComment (
 	CommentID INTEGER PRIMARY KEY AUTOINCREMENT,
 	PayPeriodID INTEGER NOT NULL,
@@ -39,11 +43,160 @@ CREATE TABLE IF NOT EXISTS PayPeriodComment (
 	UNIQUE(EmployeeID, WorkDate, PunchInComment, PunchOutComment, SpecialPayComment)
 );
 
+CREATE INDEX IF NOT EXISTS PayPeriodCommentWorkDate
+ON PayPeriodComment(WorkDate);
+
+
+-- Full-text index over the comment columns. It stores no text of its
+-- own (content=PayPeriodComment) and is kept in sync by the triggers.
+CREATE VIRTUAL TABLE IF NOT EXISTS CommentSearch USING fts5(
+	PunchInComment,
+	PunchOutComment,
+	SpecialPayComment,
+	content='PayPeriodComment',
+	content_rowid='CommentID',
+	tokenize='porter unicode61',
+	prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS CommentSearchInsert
+AFTER INSERT ON PayPeriodComment BEGIN
+	INSERT INTO CommentSearch (
+		rowid, PunchInComment, PunchOutComment, SpecialPayComment
+	)
+	VALUES (
+		new.CommentID, new.PunchInComment,
+		new.PunchOutComment, new.SpecialPayComment
+	);
+END;
+
+CREATE TRIGGER IF NOT EXISTS CommentSearchDelete
+AFTER DELETE ON PayPeriodComment BEGIN
+	INSERT INTO CommentSearch (
+		CommentSearch, rowid,
+		PunchInComment, PunchOutComment, SpecialPayComment
+	)
+	VALUES (
+		'delete', old.CommentID, old.PunchInComment,
+		old.PunchOutComment, old.SpecialPayComment
+	);
+END;
+
+CREATE TRIGGER IF NOT EXISTS CommentSearchUpdate
+AFTER UPDATE ON PayPeriodComment BEGIN
+	INSERT INTO CommentSearch (
+		CommentSearch, rowid,
+		PunchInComment, PunchOutComment, SpecialPayComment
+	)
+	VALUES (
+		'delete', old.CommentID, old.PunchInComment,
+		old.PunchOutComment, old.SpecialPayComment
+	);
+	INSERT INTO CommentSearch (
+		rowid, PunchInComment, PunchOutComment, SpecialPayComment
+	)
+	VALUES (
+		new.CommentID, new.PunchInComment,
+		new.PunchOutComment, new.SpecialPayComment
+	);
+END;
+
+-- Index the existing comments when the search table is first created
+-- (or was left out of a restored dump).
+INSERT INTO CommentSearch (CommentSearch)
+SELECT 'rebuild'
+WHERE NOT EXISTS (SELECT 1 FROM CommentSearch_docsize)
+AND EXISTS (SELECT 1 FROM PayPeriodComment);
+
+
+CREATE TABLE IF NOT EXISTS IngestLedger(
+	LedgerID INTEGER PRIMARY KEY AUTOINCREMENT,
+	FileHash TEXT NOT NULL UNIQUE,
+	FilePath TEXT NOT NULL,
+	FileSize INTEGER NOT NULL,
+	SheetCount INTEGER NOT NULL,
+	FirstStartDate TEXT,
+	LastStartDate TEXT,
+	RowCount INTEGER NOT NULL DEFAULT 0,
+	IngestedAt TEXT NOT NULL,
+	DurationSeconds REAL NOT NULL DEFAULT 0.0
+);
+
+CREATE TABLE IF NOT EXISTS IngestLedgerSheet(
+	SheetHash TEXT PRIMARY KEY,
+	LedgerID INTEGER NOT NULL,
+	SheetIndex INTEGER NOT NULL,
+	RowCount INTEGER NOT NULL DEFAULT 0,
+	FOREIGN KEY (LedgerID) REFERENCES IngestLedger(LedgerID) ON DELETE CASCADE
+);
+
+
+CREATE TABLE IF NOT EXISTS PayPeriodSummary(
+	PayPeriodID INTEGER PRIMARY KEY,
+	EmployeeID INTEGER NOT NULL,
+	StartDate TEXT NOT NULL,
+	Week1Hours REAL NOT NULL DEFAULT 0.0,
+	Week2Hours REAL NOT NULL DEFAULT 0.0,
+	TotalHours REAL NOT NULL DEFAULT 0.0,
+	Week1Overtime REAL NOT NULL DEFAULT 0.0,
+	Week2Overtime REAL NOT NULL DEFAULT 0.0,
+	Overtime REAL NOT NULL DEFAULT 0.0,
+	RuleVersion TEXT NOT NULL,
+	UpdatedAt TEXT NOT NULL,
+	FOREIGN KEY (PayPeriodID) REFERENCES PayPeriod(PayPeriodID) ON DELETE CASCADE,
+	FOREIGN KEY (EmployeeID) REFERENCES Employee(EmployeeID) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS PayPeriodSummaryStartDate
+ON PayPeriodSummary(StartDate, Overtime DESC);
+
+CREATE INDEX IF NOT EXISTS PayPeriodSummaryRuleVersion
+ON PayPeriodSummary(RuleVersion);
+
+-- Pay periods whose summary has to be rebuilt. New pay periods are
+-- marked by the trigger; refreshing a summary clears its mark, so
+-- finding stale summaries never scans WorkEntry.
+CREATE TABLE IF NOT EXISTS StalePayPeriodSummary(
+	PayPeriodID INTEGER PRIMARY KEY,
+	FOREIGN KEY (PayPeriodID) REFERENCES PayPeriod(PayPeriodID) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS StalePayPeriodSummaryInsert
+AFTER INSERT ON PayPeriod BEGIN
+	INSERT OR IGNORE INTO StalePayPeriodSummary (PayPeriodID)
+	VALUES (new.PayPeriodID);
+END;
+
+-- Marks the pay periods of databases created before the summaries.
+INSERT OR IGNORE INTO StalePayPeriodSummary (PayPeriodID)
+SELECT p.PayPeriodID
+FROM PayPeriod p
+WHERE NOT EXISTS (
+	SELECT 1 FROM PayPeriodSummary s WHERE s.PayPeriodID = p.PayPeriodID
+)
+AND EXISTS (
+	SELECT 1 FROM WorkEntry w WHERE w.PayPeriodID = p.PayPeriodID
+);
+
+
+CREATE TABLE IF NOT EXISTS OvertimeRule(
+	EmployeeGroup TEXT PRIMARY KEY,
+	DailyThreshold REAL,
+	WeeklyThreshold REAL,
+	PeriodThreshold REAL,
+	WeekendMultiplier REAL NOT NULL DEFAULT 0.0
+);
+
 
 CREATE TABLE IF NOT EXISTS Meta(
 	Key TEXT PRIMARY KEY,
 	Value TEXT
 );
 
+-- Replaced with a new random token by every write to WorkEntry, so
+-- caches can tell whether the hours changed since they read them.
+INSERT OR IGNORE INTO Meta (Key, Value)
+VALUES ('DataVersion', lower(hex(randomblob(8))));
+
 INSERT OR REPLACE INTO Meta (Key, Value)
-VALUES ('SchemaVersion', '1.0.0');
+VALUES ('SchemaVersion', '1.6.0');
@@ -2,15 +2,19 @@ from datetime import datetime
 
 from structs.result import Result
 from util.async_db import AsyncDBInterface
-from util.logger import CLogger
+from util.logger import get_logger
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
 
 class Comments:
+    __slots__ = ("comment_id", "pay_period_id", "employee_id", "date",
+                 "punch_in_comment", "punch_out_comment",
+                 "special_pay_comment")
+
     def __init__(
         self,
         comment_id: int,
@@ -37,37 +41,49 @@ class Comments:
                      punch_in_comment,
                      punch_out_comment,
                      special_pay_comment,
+                     db: AsyncDBInterface = None,
                      ):
 
-        async with AsyncDBInterface() as db:
-            args = (
-                pay_period_id,
-                employee_id,
-                str(date),
-                punch_in_comment,
-                punch_out_comment,
-                special_pay_comment,
-            )
+        if db is None:
+            async with AsyncDBInterface.writer() as db:
+                return await cls.create(
+                    pay_period_id=pay_period_id,
+                    employee_id=employee_id,
+                    date=date,
+                    punch_in_comment=punch_in_comment,
+                    punch_out_comment=punch_out_comment,
+                    special_pay_comment=special_pay_comment,
+                    db=db,
+                )
+
+        args = (
+            pay_period_id,
+            employee_id,
+            str(date),
+            punch_in_comment,
+            punch_out_comment,
+            special_pay_comment,
+        )
 
-            result = await db.save_comment(args=args)
+        result = await db.save_comment(args=args)
 
-            if result == ERROR or not result:
-                log.error(f"Failed to save comment: {args}")
-                raise Exception(f"Failed to save comment: {args}")
+        if result == ERROR or not result:
+            log.error("Failed to save comment: %s", args)
+            raise Exception(f"Failed to save comment: {args}")
 
-            args = (
-                pay_period_id,
-                employee_id,
-                str(date),
-            )
+        args = (
+            pay_period_id,
+            employee_id,
+            str(date),
+        )
 
-            id_result = await db._read_comment_id(args=args)
+        id_result = await db._read_comment_id(args=args)
 
-            if id_result == ERROR or not id_result:
-                log.error(f"Failed to fetch comment ID. args: {args}")
-                raise Exception(f"Failed to fetch comment ID. args: {args}")
+        if id_result == ERROR or not id_result:
+            log.error("Failed to fetch comment ID. args: %s", args)
+            raise Exception(f"Failed to fetch comment ID. args: {args}")
 
-            comment_id = int(id_result[0][0])
+        comment_id = int(id_result[0][0])
 
         return cls(
             comment_id=comment_id,
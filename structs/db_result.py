@@ -1,8 +1,8 @@
 from typing import Union
 from structs.result import Result
-from util.logger import CLogger
+from util.logger import get_logger
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -15,7 +15,7 @@ class DBResult:
 
     @classmethod
     def parse(cls, raw_result: list[tuple, ...]):
-        log.info("raw_result: %s", raw_result)
+        log.debug("raw_result: %s", raw_result)
 
         try:
             result, data = cls.create_dictionary(raw_result=raw_result)
@@ -1,14 +1,18 @@
+from structs.records import EmployeeName
 from structs.result import Result
 from util.async_db import AsyncDBInterface
-from util.logger import CLogger
+from util.logger import get_logger
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
 
 class Employee:
+    __slots__ = ("first_name", "middle_name", "last_name", "group",
+                 "employee_id")
+
     def __init__(self, first_name, middle_name, last_name, group, employee_id):
         self.first_name = first_name
         self.middle_name = middle_name
@@ -17,29 +21,26 @@ class Employee:
         self.employee_id = employee_id
 
     @classmethod
-    async def create(cls, name: dict, group: str):
-        first_name, middle_name, last_name = cls.__split_name(name)
+    async def create(cls, name: EmployeeName, group: str,
+                     db: AsyncDBInterface = None):
+        if db is None:
+            async with AsyncDBInterface.writer() as db:
+                return await cls.create(name=name, group=group, db=db)
+
+        first_name, middle_name, last_name = name
 
         args = (first_name, middle_name, last_name, group)
 
-        async with AsyncDBInterface() as db:
-            result = await db.save_employee(args=args)
+        result = await db.save_employee(args=args)
 
-            if result == ERROR:
-                raise Exception("Failed to save user.")
+        if result == ERROR:
+            raise Exception("Failed to save user.")
 
-            id_result = await db._read_employee_id(args=args[:3])
+        id_result = await db._read_employee_id(args=args[:3])
 
-            if id_result == ERROR or not id_result:
-                raise Exception("Failed to fetch user ID.")
+        if id_result == ERROR or not id_result:
+            raise Exception("Failed to fetch user ID.")
 
-            employee_id = int(id_result[0][0])
+        employee_id = int(id_result[0][0])
 
         return cls(first_name, middle_name, last_name, group, employee_id)
-
-    @staticmethod
-    def __split_name(name: dict):
-        first_name = name.get("First Name", "").strip()
-        middle_name = name.get("Middle Name", "").strip()
-        last_name = " ".join(name.get("Last Name", [])).strip()
-        return first_name, middle_name, last_name
@@ -16,3 +16,14 @@ class NoWorkEntries(BaseException):
     def __init__(self, details=None):
         super().__init__("No work entries were found")
         self.details = details
+
+
+class FailedIngest(BaseException):
+    """
+    Exception thrown inside an in-memory batch when a file failed, so
+    the batch is discarded instead of written back.
+    """
+
+    def __init__(self, details=None):
+        super().__init__("Some files failed to ingest")
+        self.details = details
@@ -0,0 +1,108 @@
+from datetime import date
+from typing import NamedTuple, Optional
+
+
+class EmployeeName(NamedTuple):
+    """
+    Employee name as stored in the Employee table.
+    """
+    first: str
+    middle: str
+    last: str
+
+    @property
+    def full_name(self) -> str:
+        return " ".join(" ".join(self).split())
+
+
+class ReportRow(NamedTuple):
+    """
+    One row of a sheet's DAILY column: the date label from the report
+    (e.g. "Mon 01/06") and the hours logged.
+    """
+    label: str
+    hours: float
+
+
+class CommentRecord(NamedTuple):
+    """
+    Punch and special-pay comments found at the bottom of a sheet.
+    """
+    work_date: str
+    punch_in: str
+    punch_out: str
+    special_pay: str
+
+
+class ParsedSheet(NamedTuple):
+    """
+    Everything extracted from one report sheet by `Processor.parse_sheet`.
+    """
+    start_date: date
+    name: EmployeeName
+    group: str
+    rows: tuple[ReportRow, ...]
+    comment: Optional[CommentRecord]
+    cells_scanned: int = 0
+
+
+class WorkEntryRecord(NamedTuple):
+    """
+    A WorkEntry row, in column order so it can be bound directly.
+    """
+    pay_period_id: int
+    work_date: str
+    hours: float
+
+
+class StoredWorkEntry(NamedTuple):
+    """
+    A WorkEntry row read back from the database.
+    """
+    work_entry_id: int
+    pay_period_id: int
+    work_date: str
+    hours: float
+
+
+class PeriodTotals(NamedTuple):
+    """
+    Hour and overtime totals for one employee's pay period.
+    """
+    employee_id: int
+    employee: str
+    group: str
+    pay_period_id: int
+    start_date: str
+    week_1: float
+    week_2: float
+    total: float
+    week_1_ot: float
+    week_2_ot: float
+    overtime: float
+
+
+class OvertimeRule(NamedTuple):
+    """
+    Overtime thresholds for one employee group. A threshold of None
+    disables that check.
+    """
+    daily_threshold: Optional[float] = 8.0
+    weekly_threshold: Optional[float] = None
+    period_threshold: Optional[float] = 80.0
+    weekend_multiplier: float = 0.0
+
+
+class CommentMatch(NamedTuple):
+    """
+    A PayPeriodComment row returned by a comment search. Lower ranks
+    are better matches.
+    """
+    comment_id: int
+    work_date: str
+    employee: str
+    group: str
+    punch_in: str
+    punch_out: str
+    special_pay: str
+    rank: float
@@ -2,15 +2,17 @@ from datetime import datetime
 
 from structs.result import Result
 from util.async_db import AsyncDBInterface
-from util.logger import CLogger
+from util.logger import get_logger
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
 
 class WorkEntry:
+    __slots__ = ("pay_period_id", "work_date", "hours", "work_entry_id")
+
     def __init__(self, pay_period_id: int, work_date: datetime, hours: float, work_entry_id: int):
 
         self.pay_period_id = pay_period_id
@@ -23,7 +25,7 @@ class WorkEntry:
                      ):
         args = (pay_period_id, work_date, hours)
 
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface.writer() as db:
             result = await db.save_work_entry(args)
 
             if result == ERROR:
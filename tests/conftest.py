@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+
+import util.metrics
+from benchmarks.seeder import seed_database
+from util.async_db import AsyncDBInterface
+
+
+@pytest.fixture(autouse=True)
+def metrics_file(tmp_path, monkeypatch):
+    """
+    Path the ingest metrics of the test are appended to, in place of
+    the real logs/metrics.jsonl.
+    """
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(util.metrics, "METRICS_FILE", str(path))
+    return path
+
+
+@pytest_asyncio.fixture
+async def memory_db(monkeypatch):
+    """
+    An open AsyncDBInterface on a fresh shared-cache in-memory database
+    with the full schema. Every other `AsyncDBInterface()` opened during
+    the test connects to the same database. It lasts as long as this
+    connection stays open.
+    """
+    uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    monkeypatch.setattr(AsyncDBInterface, "database", uri)
+
+    async with AsyncDBInterface() as db:
+        await db.create_from_schema()
+        yield db
+
+
+@pytest_asyncio.fixture
+async def file_db(tmp_path, monkeypatch):
+    """
+    Path of a fresh on-disk database with the full schema, in WAL mode,
+    that every `AsyncDBInterface()` opened during the test connects to.
+    Unlike `memory_db` it supports separate read-only connections.
+    """
+    path = tmp_path / "app.db"
+    monkeypatch.setattr(AsyncDBInterface, "database", str(path))
+
+    async with AsyncDBInterface() as db:
+        await db.create_from_schema()
+
+    return path
+
+
+@pytest_asyncio.fixture
+async def seeded_db(memory_db):
+    """
+    `memory_db` holding 40 employees x 6 pay periods from
+    `benchmarks.seeder`, starting 2025-01-06.
+    """
+    await seed_database(memory_db.db_path, employees=40, pay_periods=6,
+                        comment_density=0.5)
+    return memory_db
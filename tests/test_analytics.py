@@ -0,0 +1,48 @@
+import numpy as np
+
+from util.analytics import HoursMatrix
+from util.summaries import summary_rows
+
+
+def make_rows(pay_period_id: int, hours: list[float]) -> list[tuple]:
+    # 2024-01-01 is a Monday.
+    return [
+        (pay_period_id, "Jane", "", f"Doe{pay_period_id}", "Office",
+         pay_period_id, "2024-01-01", f"2024-01-{day:02d}", hrs)
+        for day, hrs in enumerate(hours, start=1)
+    ]
+
+
+def test_hours_matrix_totals_and_overtime():
+    rows = make_rows(1, [10.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [6.0, 0.0]) \
+        + make_rows(2, [9.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [0.0, 0.0])
+
+    matrix = HoursMatrix.from_rows(rows)
+
+    assert matrix.hours.shape == (2, 14)
+    assert matrix.weekly_totals.tolist() == [[50.0, 46.0], [45.0, 40.0]]
+    assert matrix.period_overtime.tolist() == [10.0, 5.0]
+    assert matrix.daily_overtime[0, 5] == 0.0
+    assert matrix.exceeding(90.0).tolist() == [0]
+
+    totals = matrix.totals()
+    assert [t.employee for t in totals] == ["Jane Doe1", "Jane Doe2"]
+    assert totals[0].week_1_ot == 10.0
+
+
+def test_no_overtime_under_eighty_hours():
+    matrix = HoursMatrix.from_work_entries(
+        "2024-01-01", [("2024-01-01", 12.0), ("2024-01-02", 12.0)])
+
+    assert matrix.period_totals.tolist() == [24.0]
+    assert not np.any(matrix.daily_overtime)
+
+
+def test_summary_rows_follow_matrix_totals():
+    matrix = HoursMatrix.from_rows(
+        make_rows(3, [10.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [0.0, 0.0]))
+
+    (row,) = summary_rows(matrix)
+
+    assert row[:9] == (3, 3, "2024-01-01", 50.0, 40.0, 90.0, 10.0, 0.0, 10.0)
+    assert row[9] == matrix.rules.version
@@ -0,0 +1,295 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from structs.result import Result
+from util.analytics import load_hours_matrix
+from util.async_db import AsyncDBInterface, is_busy
+from util.comment_search import search_comments
+from util.overtime_rules import get_rules
+from util.reports import REPORTS, run_report
+from util.summaries import (
+    read_summaries,
+    refresh_stale_summaries,
+    refresh_summaries,
+)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+pytestmark = pytest.mark.asyncio
+
+# Generous upper bounds, in seconds, for queries on the seeded database.
+# They catch accidental full scans and N+1 loops, not small slowdowns.
+BUDGETS = {
+    "report": 0.5,
+    "summaries": 0.5,
+    "search": 0.1,
+    "hours_matrix": 0.5,
+}
+
+
+async def add_pay_period(db, name=("Jane", "Q", "Doe"), group="Office",
+                         start="2025-01-06"):
+    assert await db.save_employee(args=(*name, group)) == SUCCESS
+    employee_id = (await db._read_employee_id(args=name))[0][0]
+
+    assert await db.save_pay_period(
+        args=(employee_id, start, "2025-01-20")) == SUCCESS
+    pay_period_id = (await db._read_pay_period_id(
+        args=(employee_id, start)))[0][0]
+
+    return employee_id, pay_period_id
+
+
+async def test_employee_round_trip(memory_db):
+    employee_id, _ = await add_pay_period(memory_db)
+
+    assert await memory_db._read_employee_name(args=(employee_id,)) == \
+        [("Jane", "Q", "Doe")]
+    assert await memory_db._read_employee_group(args=(employee_id,)) == \
+        [("Office",)]
+    assert await memory_db._read_employee_names() == \
+        [("Jane", "Q", "Doe", "Office")]
+
+
+async def test_work_entries_insert_update_delete(memory_db):
+    _, pp_id = await add_pay_period(memory_db)
+
+    rows = [(pp_id, "2025-01-06", 8.0), (pp_id, "2025-01-07", 7.5)]
+    assert await memory_db.save_work_entries(args=rows) == SUCCESS
+    # INSERT OR IGNORE keeps the stored hours.
+    assert await memory_db.save_work_entries(
+        args=[(pp_id, "2025-01-06", 9.0)]) == SUCCESS
+
+    entries = await memory_db._read_work_entries(args=(pp_id,))
+    assert sorted(entries) == [("2025-01-06", 8.0), ("2025-01-07", 7.5)]
+
+    entry_id = (await memory_db._read_work_entry_id(
+        args=(pp_id, "2025-01-07", 7.5)))[0][0]
+    assert await memory_db.update_work_entries(args=[(6.0, entry_id)]) == SUCCESS
+    assert await memory_db.delete_work_entries(
+        args=[(entry_id,)]) == SUCCESS
+
+    assert await memory_db._read_work_entries(args=(pp_id,)) == \
+        [("2025-01-06", 8.0)]
+
+
+async def test_transaction_rolls_back(memory_db):
+    _, pp_id = await add_pay_period(memory_db)
+
+    with pytest.raises(RuntimeError):
+        async with memory_db.transaction():
+            await memory_db.save_work_entry(args=(pp_id, "2025-01-06", 8.0))
+            raise RuntimeError("abort")
+
+    assert await memory_db._read_work_entries(args=(pp_id,)) == []
+
+
+async def test_failed_statement_returns_error(memory_db):
+    # OR IGNORE doesn't cover foreign keys; there is no pay period 999.
+    assert await memory_db.save_work_entry(
+        args=(999, "2025-01-06", 8.0)) == ERROR
+
+
+async def test_other_connections_share_the_database(memory_db):
+    await add_pay_period(memory_db)
+
+    async with AsyncDBInterface() as db:
+        assert await db.read_dates() == [("2025-01-06",)]
+
+
+async def test_comments_are_searchable(memory_db):
+    employee_id, pp_id = await add_pay_period(memory_db)
+
+    assert await memory_db.save_comment(args=(
+        pp_id, employee_id, "2025-01-08", "late", "", "jury duty")) == SUCCESS
+
+    matches = await search_comments("jury", db=memory_db)
+
+    assert [m.work_date for m in matches] == ["2025-01-08"]
+    assert await search_comments("vacation", db=memory_db) == []
+
+
+async def test_stale_summaries_are_tracked(memory_db):
+    version = get_rules().version
+    _, pp_id = await add_pay_period(memory_db)
+    assert await memory_db.save_work_entries(
+        args=[(pp_id, "2025-01-06", 8.0)]) == SUCCESS
+
+    # New pay periods are marked until their summary is built.
+    stale = memory_db._read_unsummarized_pay_periods
+    assert await stale(args=(version,)) == [(pp_id,)]
+
+    async with memory_db.transaction():
+        assert await refresh_summaries(memory_db, [pp_id]) == 1
+
+    assert await stale(args=(version,)) == []
+    assert await stale(args=("older rules",)) == [(pp_id,)]
+
+    # Databases from before the summaries are marked by the schema.
+    await memory_db.delete_all_pay_period_summaries()
+    assert await stale(args=(version,)) == []
+    assert await memory_db.create_from_schema() == SUCCESS
+    assert await stale(args=(version,)) == [(pp_id,)]
+
+
+async def test_seeded_summaries_match_work_entries(seeded_db):
+    summaries = await read_summaries(start_date="2025-01-06", db=seeded_db)
+    matrix = await load_hours_matrix(start_date="2025-01-06", db=seeded_db)
+
+    assert len(summaries) == 40
+    assert sum(s.total for s in summaries) == \
+        pytest.approx(sum(t.total for t in matrix.totals()))
+
+
+async def timed(coroutine) -> float:
+    started = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - started
+
+
+@pytest.mark.parametrize("name", sorted(REPORTS))
+async def test_report_within_budget(seeded_db, name):
+    assert await timed(run_report(name, db=seeded_db)) < BUDGETS["report"]
+
+
+async def test_queries_within_budget(seeded_db):
+    assert await timed(read_summaries(db=seeded_db)) < BUDGETS["summaries"]
+    assert await timed(search_comments("tr", db=seeded_db)) < \
+        BUDGETS["search"]
+    assert await timed(load_hours_matrix(db=seeded_db)) < \
+        BUDGETS["hours_matrix"]
+
+
+async def test_configure_sets_default_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(AsyncDBInterface, "database", None)
+    path = tmp_path / "configured.db"
+
+    AsyncDBInterface.configure(path)
+    assert AsyncDBInterface().db_path == str(path)
+    assert AsyncDBInterface("other.db").db_path == "other.db"
+
+    AsyncDBInterface.configure(None)
+    assert AsyncDBInterface().db_path.endswith("app.db")
+
+
+async def test_in_memory_batch_persists_on_success(tmp_path, monkeypatch):
+    path = tmp_path / "batch.db"
+    monkeypatch.setattr(AsyncDBInterface, "database", str(path))
+
+    async with AsyncDBInterface() as db:
+        await db.create_from_schema()
+        await add_pay_period(db)
+
+    async with AsyncDBInterface.in_memory() as memory:
+        assert AsyncDBInterface().is_uri
+        # Existing rows were loaded into memory.
+        assert await memory.read_dates() == [("2025-01-06",)]
+
+        async with AsyncDBInterface() as db:
+            await add_pay_period(db, name=("John", "", "Roe"),
+                                 start="2025-01-20")
+
+    assert AsyncDBInterface().db_path == str(path)
+
+    async with AsyncDBInterface() as db:
+        assert len(await db._read_employee_names()) == 2
+        assert await search_comments("anything", db=db) == []
+
+
+async def test_in_memory_batch_discarded_on_error(tmp_path, monkeypatch):
+    path = tmp_path / "batch.db"
+    monkeypatch.setattr(AsyncDBInterface, "database", str(path))
+
+    with pytest.raises(RuntimeError):
+        async with AsyncDBInterface.in_memory():
+            async with AsyncDBInterface() as db:
+                await add_pay_period(db)
+
+            raise RuntimeError("import failed")
+
+    assert not path.exists()
+
+
+async def test_reader_rejects_writes(file_db):
+    async with AsyncDBInterface(read_only=True) as db:
+        assert await db.read_dates() == []
+        assert await db.save_employee(
+            args=("Jane", "Q", "Doe", "Office")) == ERROR
+
+
+async def test_reader_does_not_wait_on_writer(file_db):
+    async with AsyncDBInterface.writer() as writer:
+        async with writer.transaction():
+            await add_pay_period(writer)
+
+            async with AsyncDBInterface(read_only=True) as reader:
+                started = time.perf_counter()
+                # The uncommitted pay period isn't visible yet.
+                assert await reader.read_dates() == []
+                assert time.perf_counter() - started < 0.5
+
+    async with AsyncDBInterface(read_only=True) as reader:
+        assert await reader.read_dates() == [("2025-01-06",)]
+
+
+async def test_writers_are_serialized(file_db):
+    order = []
+
+    async def write(name):
+        async with AsyncDBInterface.writer() as db:
+            order.append(f"{name} open")
+            await asyncio.sleep(0.01)
+            await add_pay_period(db, name=(name, "", "Doe"))
+            order.append(f"{name} close")
+
+    await asyncio.gather(write("A"), write("B"))
+
+    assert order == ["A open", "A close", "B open", "B close"]
+
+
+async def test_busy_statement_is_retried(file_db):
+    assert is_busy(sqlite3.OperationalError("database table is locked"))
+    assert not is_busy(sqlite3.OperationalError("no such table: Foo"))
+    assert not is_busy(ValueError("database is locked"))
+
+    async with AsyncDBInterface() as db:
+        execute = db.connection.execute
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        async def flaky(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return await execute(*args, **kwargs)
+
+        db.connection.execute = flaky
+        assert await db.save_employee(
+            args=("Jane", "Q", "Doe", "Office")) == SUCCESS
+        assert not failures
+
+
+async def test_readers_compute_stale_summaries_in_memory(file_db):
+    async with AsyncDBInterface() as db:
+        _, pay_period_id = await add_pay_period(db)
+        assert await db.save_work_entries(
+            args=[(pay_period_id, "2025-01-06", 8.0)]) == SUCCESS
+
+    async with AsyncDBInterface(read_only=True) as reader:
+        totals = await read_summaries(db=reader)
+        report = await run_report("periods", db=reader)
+
+        with pytest.raises(ValueError):
+            await refresh_stale_summaries(reader)
+
+    assert [t.total for t in totals] == [8.0]
+    assert [row[2] for row in report.rows] == [8.0]
+
+    async with AsyncDBInterface() as db:
+        # Reading computed the summary without storing it.
+        assert await db._read_pay_period_summary(
+            args=(pay_period_id, '{"stale": [], "rows": []}')) == []
+        assert await refresh_stale_summaries(db) == 1
+        assert await refresh_stale_summaries(db) == 0
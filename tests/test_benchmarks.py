@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from benchmarks.generator import employee_name, write_report, xlwt
+from benchmarks.seeder import hours_value, seed_rows
+from benchmarks.suite import Comparison, compare, timing
+from util.processor import Processor
+
+
+@pytest.mark.skipif(xlwt is None, reason="xlwt is not installed")
+def test_generated_report_parses(tmp_path):
+    import xlrd
+
+    path = write_report(tmp_path / "report.xls", start=date(2025, 1, 6),
+                        sheets=3, comment_density=1.0)
+    workbook = xlrd.open_workbook(str(path))
+    parsed = Processor().parse_sheet(workbook.sheet_by_index(2), "TEST")
+
+    first, middle, last = employee_name(2)
+
+    assert workbook.nsheets == 3
+    assert parsed.start_date == date(2025, 1, 6)
+    assert (parsed.name.first, parsed.name.last) == (first, last)
+    assert parsed.group == "Drivers"
+    assert parsed.rows and parsed.comment is not None
+
+
+def test_employee_names_are_unique():
+    names = {employee_name(i) for i in range(20_000)}
+    assert len(names) == 20_000
+
+
+def test_seed_rows():
+    rows = seed_rows(employees=5, pay_periods=3, start=date(2025, 1, 6),
+                     comment_density=0.5, seed=1)
+
+    assert len(rows["employees"]) == 5
+    assert len(rows["pay_periods"]) == 15
+    assert {r[0] for r in rows["entries"]} <= set(range(1, 16))
+    assert hours_value("8:15") == 8.25
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"parse": timing([1.0, 1.2], 10, "sheets"),
+                            "backup": timing([2.0], 1, "rows")}}
+    current = {"results": {"parse": timing([1.3, 1.4], 10, "sheets"),
+                           "ingest": timing([1.0], 5, "rows")}}
+
+    comparisons = compare(current, baseline)
+
+    assert comparisons == [Comparison("parse", 1.0, 1.3)]
+    assert comparisons[0].regressed(0.2)
+    assert not comparisons[0].regressed(0.5)
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("qasync")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from structs.records import CommentMatch  # noqa: E402
+from ui.components.bottom_component import (  # noqa: E402
+    COMMENT_HEADERS, SEARCH_HEADERS, BottomComponent,
+)
+from util.task_manager import TaskManager  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def headers(table) -> list[str]:
+    return [table.horizontalHeaderItem(i).text()
+            for i in range(table.columnCount())]
+
+
+def test_comment_view_restored_after_search(app):
+    bottom = BottomComponent(TaskManager())
+    match = CommentMatch(*[""] * len(CommentMatch._fields))
+
+    bottom.populate_comment_matches([match, match])
+    assert headers(bottom.comment_table) == SEARCH_HEADERS
+    assert bottom.comment_table.rowCount() == 2
+
+    bottom.show_comment_view()
+    assert headers(bottom.comment_table) == COMMENT_HEADERS
+    assert bottom.comment_table.rowCount() == 14
@@ -0,0 +1,228 @@
+import json
+import random
+import sqlite3
+from datetime import date
+
+import pytest
+
+import cli
+from benchmarks.generator import (
+    HEADER_ROW, HOURS_COLUMN, write_reports, write_sheet, xlwt
+)
+from util.async_db import AsyncDBInterface
+
+needs_xlwt = pytest.mark.skipif(xlwt is None, reason="xlwt is not installed")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """
+    Path of the database `cli.main` is pointed at with --database. The
+    configured path is restored after the test.
+    """
+    monkeypatch.setattr(AsyncDBInterface, "database", None)
+    return tmp_path / "cli.db"
+
+
+@pytest.fixture
+def reports(tmp_path):
+    return write_reports(tmp_path / "reports", files=2, sheets=4,
+                         comment_density=1.0)
+
+
+def count(path, table: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_ingest_arguments():
+    args = cli.args_parser(["--database", "x.db", "ingest", "a.xls", "dir",
+                            "-w", "4", "-p", "bulk", "-R", "-m"])
+
+    assert args.command == "ingest"
+    assert args.database == "x.db"
+    assert args.paths == ["a.xls", "dir"]
+    assert args.workers == 4
+    assert args.pragma_profile == "bulk"
+    assert args.reconcile and args.in_memory
+    assert not args.dry_run and not args.force
+
+
+def test_command_arguments():
+    args = cli.args_parser(["report", "top-overtime", "--limit", "5"])
+    assert (args.command, args.kind, args.limit) == \
+        ("report", "top-overtime", 5)
+
+    args = cli.args_parser(["rules", "set", "Warehouse", "--weekly", "40"])
+    assert (args.rules_command, args.group, args.weekly) == \
+        ("set", "Warehouse", "40")
+
+    args = cli.args_parser(["search", "holiday", "--column", "special_pay"])
+    assert (args.text, args.column) == ("holiday", "special_pay")
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["ingest"],
+    ["ingest", "a.xls", "--pragma-profile", "fast"],
+    ["report", "everything"],
+])
+def test_invalid_arguments(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.args_parser(argv)
+
+    assert exit_info.value.code == 2
+
+
+def test_resolve_inputs(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.xls", "sub/b.xls", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    found = cli.resolve_inputs([str(tmp_path), str(tmp_path / "*.xls")])
+
+    assert found == sorted([str(tmp_path / "a.xls"),
+                            str(tmp_path / "sub" / "b.xls")])
+
+
+def test_ingest_without_reports(database, tmp_path):
+    assert cli.main(["--database", str(database), "ingest",
+                     str(tmp_path / "missing")]) == 1
+
+
+@needs_xlwt
+def test_ingest_then_report(database, reports, tmp_path, capsys):
+    directory = str(reports[0].parent)
+
+    assert cli.main(["--database", str(database), "ingest", directory]) == 0
+    assert count(database, "PayPeriod") == 8
+    assert count(database, "IngestLedger") == 2
+
+    # A second run skips both files.
+    assert cli.main(["--database", str(database), "ingest", directory]) == 0
+    assert capsys.readouterr().out.count("skipped") == 2
+
+    output = tmp_path / "groups.json"
+    assert cli.main(["--database", str(database), "report", "groups",
+                     "--json", str(output)]) == 0
+
+    groups = json.loads(output.read_text())
+    assert {row["Group"] for row in groups} == {
+        "Warehouse", "Office", "Drivers", "Maintenance"}
+    assert sum(row["Employees"] for row in groups) == 8
+
+    assert cli.main(["--database", str(database), "overtime", "--all"]) == 0
+    assert cli.main(["--database", str(database), "search", "late"]) == 0
+    assert cli.main(["--database", str(database), "export",
+                     str(tmp_path / "export")]) == 0
+    assert (tmp_path / "export.csv").exists()
+
+
+@needs_xlwt
+def test_read_commands_migrate_older_databases(database, reports, tmp_path):
+    assert cli.main(["--database", str(database), "ingest",
+                     str(reports[0].parent)]) == 0
+
+    # As left by 1.4.0, before stored summaries.
+    with sqlite3.connect(database) as conn:
+        conn.executescript("""
+            DROP TABLE StalePayPeriodSummary;
+            DROP TABLE PayPeriodSummary;
+            UPDATE Meta SET Value = '1.4.0' WHERE Key = 'SchemaVersion';
+        """)
+
+    output = tmp_path / "periods.json"
+    assert cli.main(["--database", str(database), "report", "periods",
+                     "--json", str(output)]) == 0
+    assert cli.main(["--database", str(database), "overtime", "--all"]) == 0
+    assert cli.main(["--database", str(database), "export",
+                     str(tmp_path / "export")]) == 0
+
+    assert sum(row["Employees"] for row in json.loads(output.read_text())) \
+        == 8
+    assert count(database, "PayPeriodSummary") == 8
+
+
+@needs_xlwt
+def test_in_memory_ingest(database, reports):
+    assert cli.main(["--database", str(database), "ingest", "--in-memory",
+                     str(reports[0].parent)]) == 0
+
+    assert count(database, "PayPeriod") == 8
+    assert AsyncDBInterface.database == str(database)
+
+
+def write_bad_report(path, hours: str = "25:00"):
+    """
+    One clean sheet and one with `hours` on its first day.
+    """
+    workbook = xlwt.Workbook()
+    start = date(2025, 1, 6)
+
+    for employee in range(2):
+        sheet = workbook.add_sheet(f"Employee {employee}",
+                                   cell_overwrite_ok=True)
+        write_sheet(sheet, random.Random(employee), employee, start, 0.0)
+
+    sheet.write(HEADER_ROW + 1, HOURS_COLUMN, hours)
+    workbook.save(str(path))
+    return path
+
+
+@needs_xlwt
+def test_failed_in_memory_ingest_saves_nothing(database, reports):
+    directory = reports[0].parent
+    write_bad_report(directory / "negative.xls", hours="-1:30")
+
+    assert cli.main(["--database", str(database), "ingest", "--in-memory",
+                     str(directory)]) == 1
+
+    assert count(database, "PayPeriod") == 0
+    assert count(database, "IngestLedger") == 0
+
+
+@needs_xlwt
+def test_dry_run_reports_anomalies(database, tmp_path, capsys):
+    report = write_bad_report(tmp_path / "bad.xls")
+    output = tmp_path / "dry_run.json"
+
+    assert cli.main(["--database", str(database), "ingest", "--dry-run",
+                     "--json", str(output), str(report)]) == 1
+
+    sheets = json.loads(output.read_text())
+    assert [s["anomalies"] for s in sheets] == [[], ["2025-01-06 has 25.0 hours"]]
+    assert "1 with anomalies" in capsys.readouterr().out
+    assert not database.exists()
+
+
+@needs_xlwt
+def test_dry_run_leaves_database_untouched(database, reports, tmp_path):
+    assert cli.main(["--database", str(database), "ingest",
+                     str(reports[0])]) == 0
+    before = {table: count(database, table) for table in (
+        "Employee", "PayPeriod", "WorkEntry", "IngestLedger")}
+
+    assert cli.main(["--database", str(database), "ingest", "--dry-run",
+                     str(reports[1]),
+                     str(write_bad_report(tmp_path / "bad.xls"))]) == 1
+
+    assert {table: count(database, table) for table in before} == before
+
+
+@needs_xlwt
+def test_negative_hours_fail_before_writing(database, tmp_path):
+    report = write_bad_report(tmp_path / "negative.xls", hours="-1:30")
+    output = tmp_path / "dry_run.json"
+
+    assert cli.main(["--database", str(database), "ingest", "--dry-run",
+                     "--json", str(output), str(report)]) == 1
+    clean, bad = json.loads(output.read_text())
+    assert bad["anomalies"] == [
+        "failed to parse: ValueError: negative hours on 2025-01-06 (-1.5)"]
+
+    # Only the bad sheet fails; the clean one is still written.
+    assert cli.main(["--database", str(database), "ingest",
+                     str(report)]) == 1
+    assert count(database, "PayPeriod") == 1
+    assert count(database, "WorkEntry") == clean["entries"]
+    assert count(database, "IngestLedger") == 0
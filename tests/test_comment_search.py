@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from util.async_db import SEARCH_INDEX_DUMP, db_schema
+from util.comment_search import fts_query
+
+MATCHES = """
+SELECT rowid FROM CommentSearch WHERE CommentSearch MATCH ? ORDER BY rowid;
+"""
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.executescript(db_schema.read_text())
+    conn.execute("INSERT INTO Employee (FirstName, LastName) VALUES ('Jane', 'Doe');")
+    conn.execute("""
+        INSERT INTO PayPeriod (EmployeeID, StartDate, EndDate)
+        VALUES (1, '2024-01-01', '2024-01-14');
+    """)
+    yield conn
+    conn.close()
+
+
+def add_comment(conn, work_date, punch_in="", special_pay=""):
+    conn.execute("""
+        INSERT INTO PayPeriodComment (
+            PayPeriodID, EmployeeID, WorkDate, PunchInComment, SpecialPayComment
+        )
+        VALUES (1, 1, ?, ?, ?);
+    """, (work_date, punch_in, special_pay))
+
+
+def test_fts_query_quotes_words_and_keeps_phrases():
+    assert fts_query("holiday") == '"holiday"*'
+    assert fts_query('"jury duty" AND late', prefix=False) == \
+        '"jury duty" "AND" "late"'
+    assert fts_query("holiday", column="special_pay") == \
+        'SpecialPayComment : ("holiday"*)'
+    assert fts_query(" -- ") == ""
+
+    with pytest.raises(ValueError):
+        fts_query("holiday", column="notes")
+
+
+def test_triggers_keep_index_in_sync(conn):
+    add_comment(conn, "2024-01-01", special_pay="Holiday pay")
+    add_comment(conn, "2024-01-02", punch_in="forgot to punch, holidays")
+
+    query = fts_query("holiday", prefix=False)
+    assert conn.execute(MATCHES, (query,)).fetchall() == [(1,), (2,)]
+
+    special = fts_query("holiday", column="special_pay", prefix=False)
+    assert conn.execute(MATCHES, (special,)).fetchall() == [(1,)]
+
+    conn.execute("UPDATE PayPeriodComment SET SpecialPayComment = 'sick' WHERE CommentID = 1;")
+    assert conn.execute(MATCHES, (query,)).fetchall() == [(2,)]
+
+    conn.execute("DELETE FROM PayPeriod;")
+    assert conn.execute(MATCHES, (query,)).fetchall() == []
+
+
+def test_index_is_rebuilt_from_dump(conn):
+    add_comment(conn, "2024-01-01", special_pay="Holiday pay")
+
+    dump = "\n".join(
+        line for line in conn.iterdump() if not SEARCH_INDEX_DUMP.match(line))
+    assert "CommentSearch" not in dump
+
+    restored = sqlite3.connect(":memory:")
+    restored.executescript(dump)
+    restored.executescript(db_schema.read_text())
+
+    assert restored.execute(MATCHES, ('"holiday"',)).fetchall() == [(1,)]
@@ -0,0 +1,23 @@
+from util.exporter import NpzWriter, load_npz
+
+ROWS = [
+    (1, "Jane Doe", "Office", "2024-01-01", "2024-01-01", 8.0),
+    (2, "John Q Roe", None, "2024-01-01", "2024-01-02", 9.5),
+    (1, "Jane Doe", "Office", "2024-01-01", "2024-01-03", 7.25),
+]
+
+
+def test_npz_export_round_trip(tmp_path):
+    path = tmp_path / "entries.npz"
+
+    writer = NpzWriter(path)
+    writer.write(ROWS[:2])
+    writer.write(ROWS[2:])
+    writer.close()
+
+    columns = load_npz(str(path))
+
+    assert columns["employee_id"].tolist() == [1, 2, 1]
+    assert columns["group"].tolist() == ["Office", "", "Office"]
+    assert str(columns["work_date"][2]) == "2024-01-03"
+    assert columns["hours"].sum() == 24.75
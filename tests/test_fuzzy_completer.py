@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QComboBox  # noqa: E402
+
+from ui.components.fuzzy_completer import make_combo_searchable  # noqa: E402
+from util.name_index import NameIndex  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def make_combo(items) -> QComboBox:
+    combo = QComboBox()
+    combo.setEditable(True)
+    combo.addItems(items)
+    return combo
+
+
+def test_refill_reuses_completer(app):
+    combo = make_combo(["Jane Doe", "John Roe"])
+    completer = make_combo_searchable(combo)
+
+    for group in ("Office", "Drivers", None):
+        combo.clear()
+        combo.addItems(["Maria Gonzalez"])
+        assert make_combo_searchable(combo, group=group) is completer
+
+    assert combo.completer() is completer
+    assert completer.group is None
+
+
+def test_item_index_follows_combo(app):
+    combo = make_combo(["Jane Doe"])
+    completer = make_combo_searchable(combo)
+
+    completer.update_matches("jane")
+    assert completer.matches.stringList() == ["Jane Doe"]
+    first = completer.item_index
+
+    # Unchanged items aren't indexed again.
+    completer.update_matches("doe")
+    assert completer.item_index is first
+
+    combo.clear()
+    combo.addItems(["Maria Gonzalez"])
+    completer.update_matches("maria")
+
+    assert completer.item_index is not first
+    assert completer.matches.stringList() == ["Maria Gonzalez"]
+
+
+def test_shared_index_and_group(app):
+    index = NameIndex()
+    index.add("Jane Doe", "Office")
+    index.add("John Doe", "Drivers")
+
+    combo = make_combo([])
+    completer = make_combo_searchable(combo, index=index, group="Drivers")
+    completer.update_matches("doe")
+
+    assert completer.matches.stringList() == ["John Doe"]
+    assert completer.item_index is None
@@ -0,0 +1,135 @@
+from datetime import date
+
+import pytest
+
+from benchmarks.generator import write_report, write_reports, xlwt
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.overtime_rules import read_data_version
+from util.processor import Processor
+from util.summaries import read_summaries
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(xlwt is None, reason="xlwt is not installed"),
+]
+
+
+async def count(db: AsyncDBInterface, table: str) -> int:
+    async with db.connection.execute(f"SELECT COUNT(*) FROM {table}") as cur:
+        return (await cur.fetchone())[0]
+
+
+async def test_extract_data_writes_every_sheet(memory_db, tmp_path):
+    path = write_report(tmp_path / "report.xls", start=date(2025, 1, 6),
+                        sheets=6, comment_density=1.0)
+    processor = Processor()
+
+    assert await processor.extract_data(str(path), BUILD="TEST") == SUCCESS
+
+    assert processor.stats["status"] == "ingested"
+    assert processor.stats["sheets_ingested"] == 6
+    assert await count(memory_db, "Employee") == 6
+    assert await count(memory_db, "PayPeriod") == 6
+    assert await count(memory_db, "WorkEntry") == processor.stats["rows"]
+    assert await count(memory_db, "PayPeriodComment") == 6
+    assert len(await read_summaries(db=memory_db)) == 6
+
+
+async def test_ingested_file_is_skipped(memory_db, tmp_path):
+    path = str(write_report(tmp_path / "report.xls", sheets=3))
+
+    assert await Processor().extract_data(path, BUILD="TEST") == SUCCESS
+    rows = await count(memory_db, "WorkEntry")
+
+    processor = Processor()
+    assert await processor.extract_data(path, BUILD="TEST") == SUCCESS
+
+    assert processor.stats["status"] == "skipped"
+    assert await count(memory_db, "WorkEntry") == rows
+
+
+async def test_writes_change_the_data_version(memory_db, tmp_path):
+    path = str(write_report(tmp_path / "report.xls", sheets=3))
+    initial = await read_data_version(memory_db)
+
+    assert await Processor().extract_data(path, BUILD="TEST") == SUCCESS
+    ingested = await read_data_version(memory_db)
+
+    # A skipped file writes nothing, so cached overtime stays valid.
+    assert await Processor().extract_data(path, BUILD="TEST") == SUCCESS
+
+    assert initial is not None and ingested != initial
+    assert await read_data_version(memory_db) == ingested
+
+
+async def test_consecutive_reports_add_pay_periods(memory_db, tmp_path):
+    paths = write_reports(tmp_path, files=3, sheets=4)
+
+    for path in paths:
+        assert await Processor().extract_data(str(path), BUILD="TEST") == \
+            SUCCESS
+
+    assert await count(memory_db, "Employee") == 4
+    assert await count(memory_db, "PayPeriod") == 12
+    assert await memory_db.read_dates() == [
+        ("2025-01-06",), ("2025-01-20",), ("2025-02-03",)]
+
+
+async def total_hours(db: AsyncDBInterface) -> float:
+    async with db.connection.execute("SELECT SUM(Hours) FROM WorkEntry") as cur:
+        return round((await cur.fetchone())[0], 6)
+
+
+def report_hours(path) -> float:
+    return round(sum(r["total_hours"] for r in Processor().dry_run(str(path))),
+                 6)
+
+
+async def test_corrected_report_needs_reconcile(memory_db, tmp_path):
+    original = write_report(tmp_path / "original.xls", sheets=4, seed=0,
+                            comment_density=0.0)
+    corrected = write_report(tmp_path / "corrected.xls", sheets=4, seed=1,
+                             comment_density=1.0)
+    assert report_hours(original) != report_hours(corrected)
+
+    assert await Processor().extract_data(str(original), BUILD="TEST") == \
+        SUCCESS
+    assert await total_hours(memory_db) == report_hours(original)
+
+    # A plain ingest keeps the stored hours, writes nothing else from
+    # the conflicting sheets and doesn't record the file.
+    processor = Processor()
+    assert await processor.extract_data(str(corrected), BUILD="TEST") == \
+        SUCCESS
+    assert processor.stats["status"] == "conflict"
+    assert await total_hours(memory_db) == report_hours(original)
+    assert await count(memory_db, "PayPeriodComment") == 0
+    assert await count(memory_db, "IngestLedger") == 1
+
+    processor = Processor()
+    assert await processor.extract_data(
+        str(corrected), BUILD="TEST", reconcile=True) == SUCCESS
+
+    assert processor.stats["status"] == "ingested"
+    assert processor.stats["changes"]["updated"] > 0
+    assert await total_hours(memory_db) == report_hours(corrected)
+    assert await count(memory_db, "PayPeriodComment") == 4
+    assert await count(memory_db, "IngestLedger") == 2
+
+
+async def test_reconcile_ignores_ledger(memory_db, tmp_path):
+    path = str(write_report(tmp_path / "report.xls", sheets=3))
+
+    assert await Processor().extract_data(path, BUILD="TEST") == SUCCESS
+
+    processor = Processor()
+    assert await processor.extract_data(path, BUILD="TEST",
+                                        reconcile=True) == SUCCESS
+
+    assert processor.stats["status"] == "ingested"
+    assert processor.stats["sheets_ingested"] == 3
+    assert processor.stats["changes"]["unchanged"] == processor.stats["rows"]
@@ -0,0 +1,72 @@
+import pytest
+import pytest_asyncio
+
+import util.async_db
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.ingest_ledger import IngestLedger, file_digest, sheet_digest
+
+SUCCESS = Result.SUCCESS
+
+
+class Sheet:
+    """
+    The parts of an xlrd sheet that `sheet_digest` reads.
+    """
+
+    def __init__(self, rows: list[list]):
+        self.rows = rows
+        self.nrows = len(rows)
+        self.ncols = max(len(row) for row in rows)
+
+    def row_values(self, row: int) -> list:
+        return self.rows[row]
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(util.async_db, "default_db", tmp_path / "app.db")
+
+    async with AsyncDBInterface() as db:
+        await db.create_from_schema()
+
+
+def test_file_digest_follows_contents(tmp_path):
+    first, copy = tmp_path / "first.xls", tmp_path / "copy.xls"
+    first.write_bytes(b"report")
+    copy.write_bytes(b"report")
+
+    assert file_digest(first) == file_digest(copy)
+
+    copy.write_bytes(b"report, corrected")
+    assert file_digest(first) != file_digest(copy)
+
+
+def test_sheet_digest_hashes_cell_values():
+    rows = [["Name", "Jane Doe"], ["Mon 01/06", "8:00"]]
+
+    assert sheet_digest(Sheet(rows)) == sheet_digest(Sheet([*rows]))
+    assert sheet_digest(Sheet(rows)) != \
+        sheet_digest(Sheet([rows[0], ["Mon 01/06", "8:30"]]))
+
+
+@pytest.mark.asyncio
+async def test_recorded_file_is_skipped(database, tmp_path):
+    path = tmp_path / "report.xls"
+    path.write_bytes(b"report")
+    ledger = IngestLedger(path)
+
+    assert not await ledger.is_ingested()
+
+    ledger.add_sheet(index=0, sheet_hash="a" * 64, row_count=14,
+                     start_date="2025-01-06")
+    ledger.add_sheet(index=1, sheet_hash="b" * 64, row_count=12,
+                     start_date="2025-01-20")
+    assert await ledger.record(sheet_count=2, duration=0.5) == SUCCESS
+
+    assert await IngestLedger(path).is_ingested()
+    assert await ledger.known_sheets(["a" * 64, "c" * 64]) == {"a" * 64}
+
+    # Any change to the file makes it new to the ledger.
+    path.write_bytes(b"report, corrected")
+    assert not await IngestLedger(path).is_ingested()
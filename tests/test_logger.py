@@ -0,0 +1,65 @@
+import json
+import logging
+import logging.handlers
+
+import util.logger as logger_module
+from util.logger import (
+    CLogger,
+    JsonFormatter,
+    configure,
+    get_logger,
+    level_for,
+    parse_module_levels,
+)
+
+
+def test_module_loggers_share_root_handlers():
+    configure()
+    handlers = list(logging.getLogger().handlers)
+
+    first = get_logger("util.example")
+    second = CLogger().get_logger()
+
+    assert second.name == __name__
+    assert not first.handlers and not second.handlers
+    assert first.propagate and second.propagate
+
+    configure()
+    assert logging.getLogger().handlers == handlers
+
+
+def test_get_logger_is_cached_by_name():
+    assert get_logger("util.example") is get_logger("util.example")
+    assert get_logger("util.example").level == logging.INFO
+
+
+def test_root_logs_through_a_queue():
+    configure()
+    handlers = [
+        h for h in logging.getLogger().handlers
+        if getattr(h, "timesheet_handler", False)
+    ]
+
+    assert len(handlers) == 1
+    assert isinstance(handlers[0], logging.handlers.QueueHandler)
+
+
+def test_module_levels(monkeypatch):
+    levels = parse_module_levels("util.async_db=DEBUG, ui = warning,bad")
+    assert levels == {"util.async_db": logging.DEBUG, "ui": logging.WARNING}
+
+    monkeypatch.setattr(logger_module, "_module_levels", levels)
+    assert level_for("util.async_db") == logging.DEBUG
+    assert level_for("ui.components.mid_component") == logging.WARNING
+    assert level_for("util.pipeline") == logger_module._level
+
+
+def test_json_formatter():
+    record = logging.LogRecord(
+        "util.example", logging.INFO, "example.py", 12,
+        "%d rows", (3,), None)
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "3 rows"
+    assert entry["logger"] == "util.example"
+    assert entry["line"] == 12
@@ -0,0 +1,43 @@
+import json
+
+from util.metrics import FileMetrics, cells_scanned, save_metrics
+from util.parser import Parser
+
+
+class FakeSheet:
+    def cell_value(self, row, col):
+        return "8:00" if col == 1 else ""
+
+
+def test_xls_parser_counts_cells():
+    first = cells_scanned.value
+
+    Parser.xls_parser(FakeSheet(), 0, 0, 3, 10, "[0-9]*:[0-9]*",
+                      None, None, "TEST")
+
+    assert cells_scanned.value - first == 30
+
+
+def test_file_metrics_round_trip(tmp_path):
+    metrics = FileMetrics("reports/a.xls")
+    sheet = metrics.sheet(0)
+    sheet.cells_scanned = 120
+    sheet.rows_written = 14
+    sheet.seconds["parse"] = 0.5
+    metrics.add("parse", 0.5)
+    metrics.commits = 2
+    metrics.finish("ingested")
+
+    path = tmp_path / "metrics.jsonl"
+    save_metrics(metrics, str(path))
+    save_metrics(metrics, str(path))
+
+    lines = path.read_text().splitlines()
+    entry = json.loads(lines[-1])
+
+    assert len(lines) == 2
+    assert entry["stages"]["parse"] == 0.5
+    assert entry["rows_written"] == 14
+    assert entry["cells_scanned"] == 120
+    assert entry["sheets"][0]["seconds"]["parse"] == 0.5
+    assert "14 row(s)" in metrics.summary()
@@ -0,0 +1,48 @@
+from util.name_index import NameIndex
+
+NAMES = [
+    ("John Michael Doe", "Drivers"),
+    ("Jane Doe", "Office"),
+    ("Johnny Appleseed", "Drivers"),
+    ("Maria Gonzalez", "Office"),
+    ("Mario Gonzales", "Drivers"),
+]
+
+
+def make_index() -> NameIndex:
+    index = NameIndex()
+
+    for name, group in NAMES:
+        index.add(name, group)
+
+    return index
+
+
+def test_typo_and_word_order():
+    index = make_index()
+
+    assert index.search("Gonzalez Maria")[0] == "Maria Gonzalez"
+    assert index.search("johm doe")[0] == "John Michael Doe"
+
+
+def test_prefix_and_initials():
+    index = make_index()
+
+    assert index.search("appl") == ["Johnny Appleseed"]
+    assert index.search("doe j m")[0] == "John Michael Doe"
+
+
+def test_group_filter_and_empty_query():
+    index = make_index()
+
+    assert index.search("gonz", group="Drivers") == ["Mario Gonzales"]
+    assert index.search("", limit=2, group="Office") == [
+        "Jane Doe", "Maria Gonzalez"]
+
+
+def test_add_is_idempotent():
+    index = make_index()
+
+    assert not index.add("  Jane   Doe ", "Drivers")
+    assert len(index) == len(NAMES)
+    assert index.search("jane", group="Drivers") == ["Jane Doe"]
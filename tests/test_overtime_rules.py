@@ -0,0 +1,84 @@
+import numpy as np
+
+from structs.records import OvertimeRule
+from util.analytics import weekday_mask
+from util.overtime_rules import OvertimeCache, RuleSet
+
+# Two weeks starting on Monday 2024-01-01.
+WEEKDAY = weekday_mask(np.array(["2024-01-01"], dtype="datetime64[D]"))[0]
+
+
+def test_default_rule_matches_daily_overtime():
+    hours = np.array([10.0] * 5 + [4.0, 0.0] + [8.0] * 5 + [0.0, 0.0])
+
+    overtime = RuleSet().apply(hours, WEEKDAY, hours > 0)
+
+    assert overtime.tolist() == [2.0] * 5 + [0.0] * 9
+
+
+def test_group_override_weekly_and_weekend():
+    hours = np.array([[9.0] * 5 + [4.0, 0.0] + [8.0] * 7] * 2)
+    rules = RuleSet(overrides={
+        "Warehouse": OvertimeRule(daily_threshold=None, weekly_threshold=50.0,
+                                  period_threshold=None,
+                                  weekend_multiplier=0.5),
+    })
+
+    overtime = rules.apply(hours, WEEKDAY, hours > 0, ["Office", "Warehouse"])
+
+    # Office keeps the default: 1h over 8 on each weekday, no weekends.
+    assert overtime[0].sum() == 5.0
+    # Warehouse: week 1 stays under 50h, so only Saturday's 4h earn
+    # 0.5 each. Week 2 crosses 50h on Sunday: 6h weekly overtime plus
+    # 0.5 for each remaining weekend hour.
+    assert overtime[1, :7].tolist() == [0, 0, 0, 0, 0, 2.0, 0]
+    assert overtime[1, 7:].tolist() == [0, 0, 0, 0, 0, 4.0, 7.0]
+
+
+def test_cache_is_keyed_by_rule_version():
+    hours = np.array([[10.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [0.0, 0.0]])
+    logged = hours > 0
+    weekday = WEEKDAY[None, :]
+    cache = OvertimeCache()
+
+    first = cache.compute(RuleSet(), "v1", [7], hours, weekday, logged, [""])
+    strict = RuleSet(OvertimeRule(daily_threshold=9.0))
+    second = cache.compute(strict, "v1", [7], hours, weekday, logged, [""])
+
+    assert first.sum() == 10.0 and second.sum() == 5.0
+    assert len(cache.rows) == 2
+
+    cache.invalidate([7])
+    assert not cache.rows
+
+
+def test_cache_follows_data_version():
+    hours = np.array([[10.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [0.0, 0.0]] * 2)
+    weekday = np.repeat(WEEKDAY[None, :], 2, axis=0)
+    cache = OvertimeCache()
+    rules = RuleSet()
+
+    cache.compute(rules, "v1", [7, 8], hours, weekday, hours > 0, ["", ""])
+    cached = cache.rows[(rules.version, 8)]
+
+    # Another process corrected pay period 7: the new token drops
+    # every row, since which ones changed is unknown here.
+    corrected = hours.copy()
+    corrected[0, 0] = 12.0
+    overtime = cache.compute(rules, "v2", [7, 8], corrected, weekday,
+                             corrected > 0, ["", ""])
+    assert overtime.sum(axis=1).tolist() == [12.0, 10.0]
+    assert cache.rows[(rules.version, 8)] is not cached
+
+    # A writer in this process only drops what it changed.
+    cached = cache.rows[(rules.version, 8)]
+    cache.invalidate([7], previous="v2", data_version="v3")
+    assert list(cache.rows) == [(rules.version, 8)]
+
+    cache.compute(rules, "v3", [7, 8], corrected, weekday, corrected > 0,
+                  ["", ""])
+    assert cache.rows[(rules.version, 8)] is cached
+
+    # ...unless the cache had missed a change made elsewhere.
+    cache.invalidate([7], previous="v4", data_version="v5")
+    assert not cache.rows and cache.data_version == "v5"
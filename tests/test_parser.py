@@ -0,0 +1,24 @@
+import numpy as np
+
+from util.parser import Parser
+
+
+def test_hrs_to_array_minutes():
+    result = Parser.hrs_to_array(["8:00", "8:10", "9:15", "7:45", "0:30"])
+    expected = [8.0, 8 + 10 / 60, 9.25, 7.75, 0.5]
+    assert np.allclose(result, expected)
+
+
+def test_hrs_to_array_empty_cells():
+    result = Parser.hrs_to_array(["", "8:30", " "])
+    assert np.allclose(result, [0.0, 8.5, 0.0])
+
+
+def test_hrs_to_array_empty_column():
+    result = Parser.hrs_to_array([])
+    assert result.shape == (0,)
+
+
+def test_hrs_to_array_quarter_rounding():
+    result = Parser.hrs_to_array(["8:10", "8:05", "8:53"], round_to=0.25)
+    assert np.allclose(result, [8.25, 8.0, 9.0])
@@ -0,0 +1,32 @@
+from datetime import date
+
+from structs.records import ReportRow
+from util.work_entry_worker import WorkEntryWorker
+
+
+def make_worker(hours: list[float]) -> WorkEntryWorker:
+    # 2024-01-01 is a Monday.
+    report = tuple(
+        ReportRow(f"Day 01/{day:02d}", hrs)
+        for day, hrs in enumerate(hours, start=1)
+    )
+    return WorkEntryWorker(None, report, date(2024, 1, 1), "TEST")
+
+
+def test_weekly_and_weekday_totals():
+    worker = make_worker([8.0] * 5 + [4.0, 0.0] + [8.0] * 5 + [0.0, 0.0])
+    analytics = worker.analytics
+
+    assert analytics.weekly_totals == (44.0, 40.0)
+    assert len(worker.extract_weekday_hrs()) == 10
+    assert worker.extract_weekend_hrs()[date(2024, 1, 6)] == 4.0
+    assert worker.extract_ot_logged() == {}
+
+
+def test_overtime_only_past_eighty_hours():
+    worker = make_worker([10.0] * 5 + [0.0, 0.0] + [8.0] * 5 + [6.0, 0.0])
+
+    assert worker.extract_ot_logged() == {
+        date(2024, 1, day): 2.0 for day in range(1, 6)
+    }
+    assert worker.analytics is worker.analytics
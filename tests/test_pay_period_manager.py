@@ -0,0 +1,45 @@
+import pytest
+
+from util.pay_period_manager import PayPeriodManager
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_pay_period_dates(seeded_db):
+    dates = await PayPeriodManager().get_pay_period_dates()
+
+    assert dates[0] == "2025-01-06"
+    assert len(dates) == 6
+
+
+async def test_employee_names_by_date(seeded_db):
+    names = await PayPeriodManager().get_employee_names_by_date("2025-01-06")
+
+    assert len(names) == 40
+    assert "James A Smith" in names
+    assert await PayPeriodManager().get_employee_names_by_date(
+        "1999-01-01") == []
+
+
+async def test_work_entries_for_employee(seeded_db):
+    manager = PayPeriodManager()
+
+    employee_id = await manager.get_employee_id(("James", "A", "Smith"))
+    pp_id = await manager.get_pay_period_id(employee_id, "2025-01-06")
+    entries = await manager.get_work_entries(pp_id)
+
+    assert entries
+    assert all("2025-01-06" <= day < "2025-01-20" for day, _ in entries)
+
+
+async def test_defaults(seeded_db):
+    manager = PayPeriodManager()
+
+    assert await manager.get_default_date() == "2025-01-06"
+    assert tuple(await manager.get_default_employee()) == \
+        ("James", "A", "Smith")
+
+
+async def test_unknown_employee_raises(memory_db):
+    with pytest.raises(RuntimeError):
+        await PayPeriodManager().get_employee_id(("No", "", "One"))
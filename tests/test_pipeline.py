@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+import util.pipeline
+from benchmarks.generator import write_report, write_reports, xlwt
+from util.pipeline import FileJob, IngestPipeline
+from util.processor import Processor
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(xlwt is None, reason="xlwt is not installed"),
+]
+
+
+class FailingProcessor(Processor):
+    """
+    Fails to write the sheet of one employee.
+    """
+
+    def __init__(self, bad_employee: str):
+        super().__init__()
+        self.bad_employee = bad_employee
+
+    async def write_sheet(self, db, parsed, worker, save_entries=True):
+        if parsed.name.full_name == self.bad_employee:
+            raise ValueError(f"bad sheet for {self.bad_employee}")
+
+        return await super().write_sheet(db, parsed, worker, save_entries)
+
+
+async def count(db, table: str) -> int:
+    async with db.connection.execute(f"SELECT COUNT(*) FROM {table}") as cur:
+        return (await cur.fetchone())[0]
+
+
+@pytest.fixture
+def slow_writer(monkeypatch):
+    """
+    Delays the writer's start so every sheet is queued by the time it
+    takes its first batch.
+    """
+    load_rules = util.pipeline.load_rules
+
+    async def slow_load_rules(db):
+        await asyncio.sleep(0.2)
+        return await load_rules(db)
+
+    monkeypatch.setattr(util.pipeline, "load_rules", slow_load_rules)
+
+
+async def test_bad_sheet_fails_alone(memory_db, tmp_path, slow_writer):
+    # Same three employees in two pay periods, all in one batch.
+    paths = [str(p) for p in write_reports(tmp_path, files=2, sheets=3)]
+    pipeline = IngestPipeline(FailingProcessor("Mary A Smith"),
+                              BUILD="TEST", queue_size=32, batch_size=16)
+
+    stats = await pipeline.run(paths)
+
+    assert [s["status"] for s in stats] == ["error", "error"]
+    assert [s["sheets_ingested"] for s in stats] == [2, 2]
+    assert await count(memory_db, "PayPeriod") == 4
+    assert pipeline.timings["write"]["items"] == 6
+
+    errors = [sheet.error for m in pipeline.metrics for sheet in m.sheets]
+    assert sum(e is not None for e in errors) == 2
+
+
+async def test_other_files_unaffected(memory_db, tmp_path, slow_writer,
+                                      metrics_file):
+    good = write_report(tmp_path / "good.xls", sheets=3)
+    bad = write_report(tmp_path / "bad.xls", sheets=2, first_employee=3)
+    pipeline = IngestPipeline(FailingProcessor("John A Smith"),
+                              BUILD="TEST", queue_size=32, batch_size=16)
+
+    stats = await pipeline.run([str(good), str(bad)])
+
+    assert [s["status"] for s in stats] == ["ingested", "error"]
+    assert [s["sheets_ingested"] for s in stats] == [3, 1]
+    assert await count(memory_db, "Employee") == 4
+    assert await count(memory_db, "IngestLedger") == 1
+    assert len(metrics_file.read_text().splitlines()) == 2
+
+
+async def test_backpressure_with_small_queues(memory_db, tmp_path):
+    paths = [str(p) for p in write_reports(tmp_path, files=3, sheets=5)]
+    pipeline = IngestPipeline(Processor(), BUILD="TEST", workers=2,
+                              queue_size=1, batch_size=2)
+
+    stats = await asyncio.wait_for(pipeline.run(paths), timeout=30)
+
+    assert [s["status"] for s in stats] == ["ingested"] * 3
+    assert await count(memory_db, "PayPeriod") == 15
+
+
+async def test_stopped_writer_drains_queues(memory_db, tmp_path, monkeypatch):
+    async def broken_load_rules(db):
+        raise RuntimeError("writer failed to start")
+
+    monkeypatch.setattr(util.pipeline, "load_rules", broken_load_rules)
+    paths = [str(p) for p in write_reports(tmp_path, files=3, sheets=5)]
+    pipeline = IngestPipeline(Processor(), BUILD="TEST", queue_size=1,
+                              batch_size=2)
+
+    # Upstream stages must not block on the full queues.
+    stats = await asyncio.wait_for(pipeline.run(paths), timeout=30)
+
+    assert [s["status"] for s in stats] == ["error"] * 3
+    assert await count(memory_db, "WorkEntry") == 0
+
+
+async def test_metrics_saved_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    monkeypatch.setattr(util.pipeline, "save_metrics",
+                        lambda metrics: threads.append(threading.get_ident()))
+
+    job = FileJob(tmp_path / "report.xls")
+    await job.finish("skipped")
+
+    assert job.status == "skipped" and job.stats["status"] == "skipped"
+    assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,78 @@
+import asyncio
+import pstats
+import threading
+
+import pytest
+
+from util import profiler
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    profiler.enable(directory=str(tmp_path), interval=0.001)
+
+    try:
+        yield tmp_path
+
+    finally:
+        profiler.disable()
+
+
+def busy(seconds: float):
+    event = threading.Event()
+    event.wait(seconds)
+    return sum(i * i for i in range(20_000))
+
+
+def test_disabled_writes_nothing(tmp_path):
+    assert not profiler.is_enabled()
+
+    with profiler.profiled("noop"), profiler.memory_traced("noop"):
+        busy(0.01)
+
+    assert not any(tmp_path.iterdir())
+
+
+def test_profiled_writes_stats_and_stacks(profiles):
+    with profiler.profiled("cli ingest"):
+        worker = threading.Thread(target=busy, args=(0.05,), name="parser")
+        worker.start()
+        busy(0.02)
+        worker.join()
+
+    stats_files = list(profiles.glob("cli_ingest_*.pstats"))
+    stack_files = list(profiles.glob("cli_ingest_*.collapsed"))
+
+    assert len(stats_files) == 1 and len(stack_files) == 1
+    assert stack_files[0].stem == stats_files[0].stem
+
+    functions = {f[2] for f in pstats.Stats(str(stats_files[0])).stats}
+    assert "busy" in functions
+
+    lines = stack_files[0].read_text().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any(line.startswith("parser;") for line in lines)
+
+
+def test_nested_blocks_share_one_profile(profiles):
+    @profiler.profile_coroutine
+    async def query():
+        with profiler.profiled("inner"):
+            return busy(0)
+
+    asyncio.run(query())
+
+    assert len(list(profiles.glob("*.pstats"))) == 1
+    assert not list(profiles.glob("inner_*"))
+
+
+def test_memory_traced_reports_growth(profiles):
+    with profiler.memory_traced("extract_data_report.xls"):
+        kept = [bytearray(1024) for _ in range(200)]
+
+    report = next(profiles.glob("extract_data_report.xls_*.memory.txt"))
+    text = report.read_text()
+
+    assert len(kept) == 200
+    assert "test_profiler.py" in text
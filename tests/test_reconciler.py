@@ -0,0 +1,31 @@
+from util.reconciler import diff_work_entries
+
+
+def test_diff_work_entries():
+    stored = [
+        (1, 10, "2024-01-01", 8.0),
+        (2, 10, "2024-01-02", 8.0),
+        (3, 10, "2024-01-03", 8.0),
+    ]
+    parsed = [
+        (10, "2024-01-01", 8.0),
+        (10, "2024-01-02", 9.5),
+        (10, "2024-01-04", 4.0),
+    ]
+
+    diff = diff_work_entries(stored, parsed)
+
+    assert diff["inserts"] == [(10, "2024-01-04", 4.0)]
+    assert diff["updates"] == [(9.5, 2)]
+    assert diff["deletes"] == [(3,)]
+    assert diff["unchanged"] == 1
+
+
+def test_diff_work_entries_no_changes():
+    stored = [(1, 10, "2024-01-01", 8.0)]
+    parsed = [(10, "2024-01-01", 8.0)]
+
+    diff = diff_work_entries(stored, parsed)
+
+    assert not diff["inserts"] and not diff["updates"] and not diff["deletes"]
+    assert diff["unchanged"] == 1
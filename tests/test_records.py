@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+
+import util.async_db
+from structs.comments import Comments
+from structs.employee import Employee
+from structs.pay_period import PayPeriod
+from structs.records import EmployeeName, ReportRow, WorkEntryRecord
+from structs.result import Result
+from structs.work_entry import WorkEntry
+from util.async_db import AsyncDBInterface
+from util.work_entry_worker import WorkEntryWorker
+
+SUCCESS = Result.SUCCESS
+
+REPORT = (
+    ReportRow("Mon 01/06", 8.0),
+    ReportRow("Tue 01/07", 7.5),
+    ReportRow("Total", 15.5),
+)
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(util.async_db, "default_db", tmp_path / "app.db")
+
+    async with AsyncDBInterface() as db:
+        await db.create_from_schema()
+        yield db
+
+
+@pytest.mark.parametrize("struct", [
+    Employee("Jane", "Q", "Doe", "Office", 1),
+    PayPeriod(1, date(2025, 1, 6), date(2025, 1, 20), 1),
+    WorkEntry(1, date(2025, 1, 6), 8.0, 1),
+    Comments(1, 1, 1, date(2025, 1, 6), "late", "", ""),
+])
+def test_structs_reject_unknown_attributes(struct):
+    assert not hasattr(struct, "__dict__")
+
+    with pytest.raises(AttributeError):
+        struct.employee_name = "Jane Doe"
+
+
+def test_records_are_immutable():
+    name = EmployeeName("Jane", "", "Doe")
+
+    with pytest.raises(AttributeError):
+        name.first = "John"
+
+    assert name.full_name == "Jane Doe"
+
+
+def test_worker_builds_work_entry_records():
+    worker = WorkEntryWorker(3, REPORT, datetime(2025, 1, 6), "TEST")
+
+    assert worker.work_entry_rows() == [
+        WorkEntryRecord(3, "2025-01-06", 8.0),
+        WorkEntryRecord(3, "2025-01-07", 7.5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_work_entry_records_bind_into_work_entry(database):
+    employee = await Employee.create(
+        EmployeeName("Jane", "Q", "Doe"), "Office", db=database)
+    pay_period = await PayPeriod.create(
+        employee.employee_id, datetime(2025, 1, 6), db=database)
+    worker = WorkEntryWorker(pay_period.pay_period_id, REPORT,
+                             datetime(2025, 1, 6), "TEST")
+
+    assert await worker.save_work_entries(database) == SUCCESS
+
+    assert await database._read_work_entries(
+        args=(pay_period.pay_period_id,)) == [
+        ("2025-01-06", 8.0), ("2025-01-07", 7.5)]
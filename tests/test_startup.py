@@ -0,0 +1,29 @@
+import pytest
+
+from util.import_profile import import_times
+from util.lazy import LazyModule, lazy_import
+
+
+def test_processor_does_not_import_heavy_modules():
+    imported = {t.module.split(".")[0] for t in import_times("util.processor")}
+
+    assert "util" in imported
+    assert not imported & {"numpy", "xlrd"}
+
+
+def test_cli_does_not_import_heavy_modules():
+    imported = {t.module.split(".")[0] for t in import_times("cli")}
+
+    assert "util" in imported
+    assert not imported & {"numpy", "xlrd", "pyarrow"}
+
+
+def test_lazy_import():
+    json = lazy_import("json")
+
+    assert isinstance(json, LazyModule)
+    assert json.loads("[1]") == [1]
+    assert lazy_import("no_such_module_here", optional=True) is None
+
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("no_such_module_here")
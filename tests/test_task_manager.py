@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from util.task_manager import TaskManager  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+def capture(signal) -> list:
+    received = []
+    signal.connect(received.append)
+    return received
+
+
+async def test_work_entry_query_emits_entries(seeded_db):
+    manager = TaskManager()
+    entries = capture(manager.db_work_entry)
+    errors = capture(manager.error)
+
+    await manager.work_entry_query(("James", "A", "Smith"), "2025-01-06")
+
+    assert errors == []
+    work_entries, start_date, group, summary = entries[0]
+    assert work_entries and start_date == "2025-01-06"
+    assert group == "Warehouse"
+    assert summary is not None
+
+
+async def test_combo_box_query_emits_dates_and_groups(seeded_db):
+    manager = TaskManager()
+    dates = capture(manager.db_dates)
+    groups = capture(manager.db_groups)
+
+    await manager.combo_box_query_db()
+
+    assert ("2025-01-06",) in dates[0]
+    assert {g[0] for g in groups[0]} == {
+        "Warehouse", "Office", "Drivers", "Maintenance"}
+
+
+async def test_unknown_employee_reports_error(seeded_db):
+    manager = TaskManager()
+    errors = capture(manager.error)
+
+    await manager.work_entry_query(("No", "", "One"), "2025-01-06")
+
+    assert errors
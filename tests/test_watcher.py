@@ -0,0 +1,159 @@
+import asyncio
+import os
+import types
+
+import pytest
+
+import util.watcher
+from structs.result import Result
+from util.watcher import DirectoryWatcher
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeProcessor:
+    """
+    Stands in for Processor; records every file handed to it.
+    """
+    calls = []
+    result = SUCCESS
+
+    def __init__(self, round_to=None):
+        self.stats = {"status": "ingested", "sheets_ingested": 1,
+                      "sheets": 1, "rows": 14, "seconds": 0.0}
+
+    async def extract_data(self, file_path, BUILD):
+        self.calls.append(file_path)
+        return self.result
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(FakeProcessor, "calls", [])
+    monkeypatch.setattr(FakeProcessor, "result", SUCCESS)
+    monkeypatch.setattr(util.watcher, "Processor", FakeProcessor)
+    return FakeProcessor
+
+
+def write(path, content=b"report"):
+    path.write_bytes(content)
+    return str(path)
+
+
+async def scan(watcher):
+    watcher.scan()
+
+    if watcher.tasks:
+        await asyncio.gather(*watcher.tasks)
+
+
+async def test_waits_for_file_to_settle(tmp_path, processor):
+    watcher = DirectoryWatcher(str(tmp_path), settle=60)
+    path = write(tmp_path / "a.xls")
+
+    await scan(watcher)
+    await scan(watcher)
+
+    assert processor.calls == []
+    assert path in watcher.pending
+
+
+async def test_ingests_once_until_changed(tmp_path, processor):
+    watcher = DirectoryWatcher(str(tmp_path), settle=0)
+    path = write(tmp_path / "a.xls")
+    write(tmp_path / "notes.txt")
+
+    for _ in range(3):
+        await scan(watcher)
+
+    assert processor.calls == [path]
+
+    write(tmp_path / "a.xls", b"changed report")
+    os.utime(path, (1, 1))
+
+    for _ in range(3):
+        await scan(watcher)
+
+    assert processor.calls == [path, path]
+
+
+async def test_failed_file_retried_only_after_change(tmp_path, processor):
+    processor.result = ERROR
+    watcher = DirectoryWatcher(str(tmp_path), settle=0)
+    path = write(tmp_path / "bad.xls", b"garbage")
+
+    for _ in range(5):
+        await scan(watcher)
+
+    assert processor.calls == [path]
+
+    write(tmp_path / "bad.xls", b"fixed report")
+    os.utime(path, (1, 1))
+
+    for _ in range(3):
+        await scan(watcher)
+
+    assert processor.calls == [path, path]
+
+
+async def test_recursive_scan(tmp_path, processor):
+    (tmp_path / "sub").mkdir()
+    nested = write(tmp_path / "sub" / "b.xls")
+
+    flat = DirectoryWatcher(str(tmp_path), settle=0)
+    await scan(flat)
+    await scan(flat)
+    assert processor.calls == []
+
+    deep = DirectoryWatcher(str(tmp_path), settle=0, recursive=True)
+    await scan(deep)
+    await scan(deep)
+    assert processor.calls == [nested]
+
+
+class FakeINotify:
+    def __init__(self):
+        self.watches = []
+
+    def add_watch(self, path, mask):
+        self.watches.append(path)
+
+    def read(self, timeout=None):
+        return []
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def inotify(monkeypatch):
+    fake = types.SimpleNamespace(
+        INotify=FakeINotify,
+        flags=types.SimpleNamespace(CLOSE_WRITE=8, MOVED_TO=128, CREATE=256))
+    monkeypatch.setattr(util.watcher, "inotify_simple", fake)
+    return fake
+
+
+async def test_inotify_watches_subdirectories(tmp_path, processor, inotify):
+    (tmp_path / "a").mkdir()
+    watcher = DirectoryWatcher(str(tmp_path), interval=0, recursive=True)
+    notifier = watcher._DirectoryWatcher__make_notifier()
+
+    assert sorted(notifier.watches) == [str(tmp_path), str(tmp_path / "a")]
+
+    # Directories created while watching are picked up after a wake-up.
+    (tmp_path / "b").mkdir()
+    await watcher._DirectoryWatcher__wait(notifier)
+
+    assert str(tmp_path / "b") in notifier.watches
+
+
+async def test_inotify_top_directory_only(tmp_path, processor, inotify):
+    (tmp_path / "a").mkdir()
+    watcher = DirectoryWatcher(str(tmp_path))
+    notifier = watcher._DirectoryWatcher__make_notifier()
+
+    assert notifier.watches == [str(tmp_path)]
@@ -1,5 +1,3 @@
-from datetime import datetime, timedelta
-
 from qasync import asyncSlot
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
@@ -11,22 +9,30 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from structs.exceptions import NoWorkEntries
+from structs.records import CommentMatch
 from structs.result import Result
-from util.logger import CLogger
+from util.analytics import HoursMatrix
+from util.logger import get_logger
+from util.metrics import FileMetrics
+from util.overtime_rules import get_rules
 from util.task_manager import TaskManager
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
+COMMENT_HEADERS = ["Date", "Punch In", "Punch Out", "Special Pay"]
+SEARCH_HEADERS = ["Date", "Employee", "Punch In", "Punch Out", "Special Pay"]
+
 
 class BottomComponent(QWidget):
     def __init__(self, manager: TaskManager):
         super().__init__()
 
         self.manager = manager
+        self.matrix = HoursMatrix.empty()
+        self.summary = None
 
         # Bi-Weekly Totals
         self.bi_weekly_title = QLabel("Bi-Weekly", self)
@@ -102,9 +108,15 @@ class BottomComponent(QWidget):
         self.week_break_downs.addLayout(self.week_1)
         self.week_break_downs.addLayout(self.week_2)
 
+        # Timing breakdown of the last imported file
+        self.ingest_metrics = QLabel("")
+        self.ingest_metrics.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.ingest_metrics.setStyleSheet("color: gray;")
+
         self.summaries = QVBoxLayout()
         self.summaries.addLayout(self.bi_weekly_container)
         self.summaries.addLayout(self.week_break_downs)
+        self.summaries.addWidget(self.ingest_metrics)
 
         self.entry_table = QTableWidget()
         self.entry_table.setColumnCount(3)
@@ -116,10 +128,7 @@ class BottomComponent(QWidget):
             QTableWidget.EditTrigger.NoEditTriggers)
 
         self.comment_table = QTableWidget()
-        self.comment_table.setColumnCount(4)
-        self.comment_table.setRowCount(14)
-        self.comment_table.setHorizontalHeaderLabels(
-            ["Date", "Punch In", "Punch Out", "Special Pay"])
+        self.show_comment_view()
         self.comment_table.setStyleSheet("border: 1px solid gray;")
         self.comment_table.setEditTriggers(
             QTableWidget.EditTrigger.NoEditTriggers)
@@ -137,153 +146,114 @@ class BottomComponent(QWidget):
         self.manager.db_work_entry.connect(
             lambda data: self.populate_table(data))
         self.manager.init_summary.connect(self.populate_summaries)
+        self.manager.db_comment_search.connect(self.populate_comment_matches)
+        self.manager.ingest_metrics.connect(self.show_ingest_metrics)
 
     @asyncSlot()
-    async def populate_table(self, data: list[list[tuple, ...], str]):
-        work_entries = data[0]
+    async def populate_table(self, data: list[list[tuple, ...], str, str, tuple]):
         self.entry_table.clearContents()
-
-        for row in range(len(work_entries)):
-            self.__add_cell_value(
-                row=row,
-                col=0,
-                value=work_entries[row][0],
-                table=self.entry_table
-            )
-
-            self.__add_cell_value(
-                row=row,
-                col=1,
-                value=work_entries[row][1],
-                table=self.entry_table
-            )
+        # A new employee replaces any comment search results.
+        self.show_comment_view()
+        self.summary = data[3]
 
         try:
-            date_obj = datetime.strptime(data[1], "%Y-%m-%d").date()
+            self.matrix = HoursMatrix.from_work_entries(
+                start_date=data[1], work_entries=data[0], group=data[2])
 
-            dates = {}
-
-            if not work_entries:
-                raise NoWorkEntries()
-
-            # Fill in Dates in Pay Period
-
-            for i in range(14):
-                curr_date = date_obj + timedelta(i)
+            dates = self.matrix.dates[0].tolist()
+            hours = self.matrix.hours[0].tolist()
+            overtime = self.matrix.daily_overtime[0].tolist()
 
+            for row in range(len(dates)):
                 self.__add_cell_value(
-                    row=i,
+                    row=row,
                     col=0,
-                    value=curr_date,
+                    value=dates[row],
                     table=self.entry_table
                 )
 
-                dates.update({i: str(curr_date)})
-
-            # Fill Work Entries and Overtime Earned
-
-            for entry in work_entries:
-                if entry[0] in dates.values():
-                    date_key = self.__get_key_from_value(
-                        dictionary=dates, value=entry[0])[0]
-
-                    self.__add_cell_value(
-                        row=date_key,
-                        col=1,
-                        value=float(entry[1]),
-                        table=self.entry_table
-                    )
-
-                    self.__add_cell_value(
-                        row=date_key,
-                        col=2,
-                        value=entry[1]-8,
-                        table=self.entry_table
-                    )
-
-                del dates[date_key]
-
-            # Fill Empty Work Entries
-
-            for key, value in dates.items():
                 self.__add_cell_value(
-                    row=key,
+                    row=row,
                     col=1,
-                    value=0.0,
+                    value=hours[row],
                     table=self.entry_table
                 )
 
                 self.__add_cell_value(
-                    row=key,
+                    row=row,
                     col=2,
-                    value=0.0,
-                    table=self.entry_table
-                )
-
-        except NoWorkEntries:
-            for i in range(14):
-                curr_date = date_obj + timedelta(i)
-                self.__add_cell_value(
-                    row=i,
-                    col=0,
-                    value=curr_date,
-                    table=self.entry_table)
-
-                self.__add_cell_value(
-                    row=i,
-                    col=1,
-                    value=0.0,
-                    table=self.entry_table
-                )
-
-                self.__add_cell_value(
-                    row=i,
-                    col=2,
-                    value=0.0,
+                    value=overtime[row],
                     table=self.entry_table
                 )
 
         except Exception as e:
+            self.matrix = HoursMatrix.empty()
             log.error("Failed to populate table: %s", str(e))
 
-        except KeyError as e:
-            log.error("KeyError: %s", str(e))
-
         finally:
             self.manager.start_init_summary()
 
     def populate_summaries(self):
-        rows = self.entry_table.rowCount()
-
-        total_1 = 0
-        total_ot_1 = 0
-        total_2 = 0
-        total_ot_2 = 0
-
-        for row in range(rows):
-            if row <= 6:
-                item = self.entry_table.item(row, 1)
-                if item:
-                    total_1 += float(item.text())
-
-                item = self.entry_table.item(row, 2)
-                if item:
-                    total_ot_1 += float(item.text())
-            else:
-                item = self.entry_table.item(row, 1)
-                if item:
-                    total_2 += float(item.text())
-
-                item = self.entry_table.item(row, 2)
-                if item:
-                    total_ot_2 += float(item.text())
+        # Stored totals are only valid for the rules they were built with.
+        if self.summary and self.summary[6] == get_rules().version:
+            labels = (self.value_1, self.value_3, self.bi_total,
+                      self.value_2, self.value_4, self.bi_ot)
+
+            for label, value in zip(labels, self.summary[:6]):
+                label.setText(str(float(value)))
+            return
+
+        if not len(self.matrix):
+            for label in (self.value_1, self.value_2, self.value_3,
+                          self.value_4, self.bi_total, self.bi_ot):
+                label.setText("")
+            return
+
+        total_1, total_2 = self.matrix.weekly_totals[0].tolist()
+        total_ot_1, total_ot_2 = self.matrix.weekly_overtime[0].tolist()
 
         self.value_1.setText(str(total_1))
         self.value_2.setText(str(total_ot_1))
         self.value_3.setText(str(total_2))
         self.value_4.setText(str(total_ot_2))
-        self.bi_total.setText(str(total_1 + total_2))
-        self.bi_ot.setText(str(total_ot_1 + total_ot_2))
+        self.bi_total.setText(str(float(self.matrix.period_totals[0])))
+        self.bi_ot.setText(str(float(self.matrix.period_overtime[0])))
+
+    def show_ingest_metrics(self, metrics: FileMetrics):
+        self.ingest_metrics.setText(metrics.summary())
+        self.ingest_metrics.setToolTip("\n".join(
+            f"Sheet {s.index} {s.employee}: "
+            + ", ".join(f"{k} {v:.3f}s" for k, v in s.seconds.items())
+            + f", {s.cells_scanned} cells, {s.rows_written} rows"
+            for s in metrics.sheets
+        ))
+
+    def show_comment_view(self):
+        """
+        Puts the comment table back in its per-employee layout.
+        """
+        self.comment_table.clearContents()
+        self.comment_table.setColumnCount(len(COMMENT_HEADERS))
+        self.comment_table.setRowCount(14)
+        self.comment_table.setHorizontalHeaderLabels(COMMENT_HEADERS)
+
+    def populate_comment_matches(self, matches: list[CommentMatch]):
+        self.comment_table.clearContents()
+        self.comment_table.setColumnCount(len(SEARCH_HEADERS))
+        self.comment_table.setRowCount(len(matches))
+        self.comment_table.setHorizontalHeaderLabels(SEARCH_HEADERS)
+
+        for row, match in enumerate(matches):
+            values = (match.work_date, match.employee, match.punch_in,
+                      match.punch_out, match.special_pay)
+
+            for col, value in enumerate(values):
+                self.__add_cell_value(
+                    row=row,
+                    col=col,
+                    value=value,
+                    table=self.comment_table
+                )
 
     def refresh_table(self):
         self.entry_table.update()
@@ -297,7 +267,3 @@ class BottomComponent(QWidget):
 
         except Exception as e:
             log.error("Failed to set cell (%d, %d): %s", row, col, str(e))
-
-    @staticmethod
-    def __get_key_from_value(dictionary: dict, value: any):
-        return [key for key, val in dictionary.items() if val == value]
@@ -0,0 +1,79 @@
+from PyQt6.QtCore import QStringListModel
+from PyQt6.QtWidgets import QComboBox, QCompleter
+
+from util.logger import get_logger
+from util.name_index import NameIndex
+
+log = get_logger(__name__)
+
+
+class FuzzyCompleter(QCompleter):
+    """
+    Completer that asks a NameIndex for ranked fuzzy matches on every
+    keystroke instead of substring-filtering a copy of the combo items.
+
+    Without an `index`, the combo's own items are indexed. That index
+    is only rebuilt on the first keystroke after the items change, not
+    on every refill.
+    """
+
+    def __init__(self, combo: QComboBox, index: NameIndex = None,
+                 group: str = None, limit: int = 20):
+        self.matches = QStringListModel(combo)
+        super().__init__(self.matches, combo)
+
+        self.combo = combo
+        self.index = index
+        self.group = group
+        self.limit = limit
+        self.item_index = None
+
+        self.setCompletionMode(
+            QCompleter.CompletionMode.UnfilteredPopupCompletion)
+
+        model = combo.model()
+        model.rowsInserted.connect(self.items_changed)
+        model.rowsRemoved.connect(self.items_changed)
+        model.modelReset.connect(self.items_changed)
+
+        combo.lineEdit().textEdited.connect(self.update_matches)
+
+    def items_changed(self, *args):
+        self.item_index = None
+
+    def search_index(self) -> NameIndex:
+        if self.index is not None:
+            return self.index
+
+        if self.item_index is None:
+            self.item_index = NameIndex(
+                self.combo.itemText(i) for i in range(self.combo.count()))
+
+        return self.item_index
+
+    def update_matches(self, text: str):
+        self.matches.setStringList(self.search_index().search(
+            text, limit=self.limit, group=self.group))
+        self.complete()
+
+
+def make_combo_searchable(combo: QComboBox, index: NameIndex = None,
+                          group: str = None) -> FuzzyCompleter:
+    """
+    Attaches a FuzzyCompleter to an editable combo box. Without an
+    `index`, the combo's current items are searched.
+
+    Safe to call on every refill: a combo keeps its first completer,
+    which only takes the new `index` and `group`.
+    """
+    completer = combo.completer()
+
+    if isinstance(completer, FuzzyCompleter):
+        completer.index = index
+        completer.group = group
+        return completer
+
+    completer = FuzzyCompleter(combo, index, group=group)
+    combo.setCompleter(completer)
+
+    return completer
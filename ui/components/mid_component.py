@@ -2,22 +2,23 @@ import re
 import asyncio
 
 from qasync import asyncSlot
-from PyQt6.QtCore import QSortFilterProxyModel, QStringListModel, Qt
 from PyQt6.QtWidgets import (
     QComboBox,
-    QCompleter,
     QHBoxLayout,
+    QLineEdit,
     QPushButton,
     QVBoxLayout,
     QWidget,
 )
 
 from structs.result import Result
-from util.logger import CLogger
+from ui.components.fuzzy_completer import make_combo_searchable
+from util.logger import get_logger
+from util.name_index import NameIndex, employee_index
 from util.task_manager import TaskManager
 from util.pay_period_manager import PayPeriodManager
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -53,8 +54,13 @@ class MidComponent(QWidget):
         self.mid_widgets.addWidget(self.search)
         self.mid_widgets.addWidget(self.refresh)
 
+        self.comment_search = QLineEdit()
+        self.comment_search.setPlaceholderText("Search comments...")
+        self.comment_search.returnPressed.connect(self.send_comment_search)
+
         self.mid_layout = QVBoxLayout()
         self.mid_layout.addLayout(self.mid_widgets)
+        self.mid_layout.addWidget(self.comment_search)
 
         self.setLayout(self.mid_layout)
 
@@ -77,20 +83,20 @@ class MidComponent(QWidget):
 
         await self.manager.start_work_entry_query(name, selected_date)
 
+    @asyncSlot()
+    async def send_comment_search(self):
+        text = self.comment_search.text().strip()
+
+        if text:
+            await self.manager.start_comment_search(text)
+
     @asyncSlot()
     async def refresh_ui(self):
         self.manager.refresh_call()
 
-    def make_combo_searchable(self, combo: QComboBox):
-        model = QStringListModel([combo.itemText(i)
-                                 for i in range(combo.count())])
-        proxy_model = QSortFilterProxyModel(combo)
-        proxy_model.setSourceModel(model)
-
-        completer = QCompleter(proxy_model, combo)
-        completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        combo.setCompleter(completer)
+    def make_combo_searchable(self, combo: QComboBox, index: NameIndex = None,
+                              group: str = None):
+        make_combo_searchable(combo, index=index, group=group)
 
     @asyncSlot()
     async def combo_box_filler(self):
@@ -109,6 +115,8 @@ class MidComponent(QWidget):
             for date in dates:
                 self.ppd_combo_box.addItem(str(date[0]))
 
+            self.make_combo_searchable(self.ppd_combo_box)
+
         except Exception as e:
             log.error(
                 "Error during dump and compression: %s | %s",
@@ -121,6 +129,8 @@ class MidComponent(QWidget):
             for group in groups:
                 self.group_combo_box.addItem(str(group[0]))
 
+            self.make_combo_searchable(self.group_combo_box)
+
         except Exception as e:
             log.error(
                 "Error during dump and compression: %s | %s",
@@ -136,6 +146,12 @@ class MidComponent(QWidget):
                     ' '.join(' '.join(name).split())
                 )
 
+            self.make_combo_searchable(
+                self.employee_combo_box,
+                index=employee_index,
+                group=self.group_combo_box.currentText().strip() or None,
+            )
+
         except Exception as e:
             log.error(
                 "Error during employee_filler: %s | %s",
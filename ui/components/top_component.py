@@ -8,10 +8,10 @@ from PyQt6.QtWidgets import (
 )
 
 from structs.result import Result
-from util.logger import CLogger
+from util.logger import get_logger
 from util.task_manager import TaskManager
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -9,13 +9,14 @@ from PyQt6.QtWidgets import (
 )
 
 from structs.result import Result
-from util.logger import CLogger
+from util.logger import get_logger
 from util.task_manager import TaskManager
 from ui.components.top_component import TopComponent
 from ui.components.mid_component import MidComponent
 from ui.components.bottom_component import BottomComponent
+from ui.components.fuzzy_completer import make_combo_searchable
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -100,9 +101,7 @@ class MainComponent(QWidget):
             )
 
     def make_combo_searchable(self, combo: QComboBox):
-        # TODO:
-        # Make this a fuzz search
-        log.info("clicked")
+        make_combo_searchable(combo)
 
     @asyncSlot()
     async def refresh_choice(self):
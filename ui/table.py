@@ -1,12 +1,10 @@
 import os
 import re
-from datetime import datetime, timedelta
 
 from qasync import asyncSlot
-from PyQt6.QtCore import QSortFilterProxyModel, QStringListModel, Qt
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QComboBox,
-    QCompleter,
     QFileDialog,
     QHBoxLayout,
     QLabel,
@@ -17,13 +15,14 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from structs.exceptions import NoWorkEntries
 from structs.result import Result
+from ui.components.fuzzy_completer import make_combo_searchable
+from util.analytics import HoursMatrix
 from util.async_db import AsyncDBInterface
-from util.logger import CLogger
+from util.logger import get_logger
 from util.pay_period_manager import PayPeriodManager
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -97,7 +96,7 @@ class TableWidget(QWidget):
             )
 
             if file_path:
-                async with AsyncDBInterface() as db:
+                async with AsyncDBInterface.writer() as db:
                     result = await db.dump_db_and_zip(output_dir=file_path)
 
                 if result == ERROR:
@@ -128,8 +127,8 @@ class TableWidget(QWidget):
             )
 
             if file_path:
-                async with AsyncDBInterface() as db:
-                    result = await db.initialize_db_from_zip(output_dir=file_path[0])
+                async with AsyncDBInterface.writer() as db:
+                    result = await db.initialize_db_from_zip(file_path[0])
 
                 if result == SUCCESS:
                     self.status_label.setText("File Successfully Imported")
@@ -148,15 +147,7 @@ class TableWidget(QWidget):
             )
 
     def make_combo_searchable(self, combo: QComboBox):
-        model = QStringListModel([combo.itemText(i)
-                                 for i in range(combo.count())])
-        proxy_model = QSortFilterProxyModel(combo)
-        proxy_model.setSourceModel(model)
-
-        completer = QCompleter(proxy_model, combo)
-        completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        combo.setCompleter(completer)
+        make_combo_searchable(combo)
 
     @asyncSlot()
     async def refresh_choice(self):
@@ -192,7 +183,7 @@ class TableWidget(QWidget):
     @asyncSlot()
     async def employee_filler(self, date: str):
         if date == "" or date is None:
-            date = self.pp_manager.get_default_date()
+            date = await self.pp_manager.get_default_date()
 
         try:
             names = await self.pp_manager.get_employee_names_by_date(date)
@@ -225,7 +216,7 @@ class TableWidget(QWidget):
     @asyncSlot()
     async def populate_main(self, employee: tuple, selected_date: str):
         if not selected_date:
-            selected_date = self.pp_manager.get_default_date()
+            selected_date = await self.pp_manager.get_default_date()
 
         try:
             emp_id = await self.pp_manager.get_employee_id(employee)
@@ -234,68 +225,22 @@ class TableWidget(QWidget):
 
             self.main_table.clearContents()
 
-            date_obj = datetime.strptime(selected_date, "%Y-%m-%d").date()
-
-            dates = {}
-
-            if not work_entries:
-                raise NoWorkEntries()
-
-            # Fill in Dates in Pay Period
-
-            for i in range(14):
-                curr_date = date_obj + timedelta(i)
-
-                self.__add_cell_value(i, 0, curr_date)
-
-                dates.update({i: str(curr_date)})
-
-            # Fill Work Entries and Overtime Earned
-
-            for entry in work_entries:
-                if entry[0] in dates.values():
-                    date_key = TableWidget.__get_key_from_value(
-                        dictionary=dates, value=entry[0])[0]
-
-                    self.__add_cell_value(
-                        row=date_key,
-                        col=1,
-                        value=float(entry[1]),
-                    )
+            matrix = HoursMatrix.from_work_entries(
+                start_date=selected_date, work_entries=work_entries)
 
-                    self.__add_cell_value(
-                        row=date_key,
-                        col=2,
-                        value=entry[1]-8,
-                    )
+            dates = matrix.dates[0].tolist()
+            hours = matrix.hours[0].tolist()
+            overtime = matrix.daily_overtime[0].tolist()
 
-                del dates[date_key]
-
-            # Fill Empty Work Entries
-
-            for key, value in dates.items():
-                self.__add_cell_value(
-                    row=key, col=1, value=0.0)
-
-                self.__add_cell_value(
-                    row=key, col=2, value=0.0)
-
-        except NoWorkEntries:
-            for i in range(14):
-                curr_date = date_obj + timedelta(i)
-                self.__add_cell_value(i, 0, curr_date)
-
-                self.__add_cell_value(row=i, col=1, value=0.0)
-
-                self.__add_cell_value(row=i, col=2, value=0.0)
+            for row in range(len(dates)):
+                self.__add_cell_value(row, 0, dates[row])
+                self.__add_cell_value(row=row, col=1, value=hours[row])
+                self.__add_cell_value(row=row, col=2, value=overtime[row])
 
         except Exception as e:
             log.error("Failed to populate table: %s", str(e))
             self.status_label.setText("Error populating timesheet data.")
 
-        except KeyError as e:
-            log.error("KeyError: %s", str(e))
-
     def __add_cell_value(self, row: int, col: int, value):
         try:
             item = QTableWidgetItem(str(value))
@@ -304,10 +249,6 @@ class TableWidget(QWidget):
         except Exception as e:
             log.error("Failed to set cell (%d, %d): %s", row, col, str(e))
 
-    @staticmethod
-    def __get_key_from_value(dictionary: dict, value: any):
-        return [key for key, val in dictionary.items() if val == value]
-
     @staticmethod
     def __sanitize_name_for_db(employee: str):
         name = employee.split(" ")
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from functools import cached_property
+
+from structs.records import PeriodTotals
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.lazy import lazy_import
+from util.logger import get_logger
+from util.overtime_rules import (
+    RuleSet, get_rules, overtime_cache, read_data_version
+)
+
+np = lazy_import("numpy")
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+PAY_PERIOD_DAYS = 14
+
+
+def daily_overtime(hours: np.ndarray,
+                   weekday: np.ndarray,
+                   logged: np.ndarray,
+                   groups: list[str] = None,
+                   rules: RuleSet = None) -> np.ndarray:
+    """
+    Overtime per day for one or more pay periods laid out on the last
+    axis, under `rules` or the active rule set.
+    """
+    return (rules or get_rules()).apply(hours, weekday, logged, groups)
+
+
+def weekday_mask(start_dates: np.ndarray) -> np.ndarray:
+    """
+    Monday-Friday flags for the 14 days following each start date.
+    """
+    # 1970-01-01 was a Thursday, so day number + 3 is Monday-based.
+    days = start_dates.astype("datetime64[D]").astype(np.int64)
+    offsets = days[:, None] + np.arange(PAY_PERIOD_DAYS) + 3
+    return offsets % 7 < 5
+
+
+class HoursMatrix:
+    """
+    Work entries laid out as a (pay periods x 14 days) matrix.
+
+    Each row is one employee's pay period and each column a day offset
+    from its start date, so daily overtime, weekly and bi-weekly totals
+    are plain array operations over every selected employee at once.
+
+    Overtime follows `rules` (the active rule set by default). When the
+    rows hold complete pay periods read under a known `data_version`,
+    it is also cached per (rule-set version, pay period) in
+    `overtime_cache`.
+    """
+
+    def __init__(self, keys: list[tuple], start_dates: np.ndarray,
+                 hours: np.ndarray, logged: np.ndarray,
+                 rules: RuleSet = None, data_version: str = None):
+        self.keys = keys
+        self.start_dates = start_dates
+        self.hours = hours
+        self.logged = logged
+        self.rules = rules or get_rules()
+        self.data_version = data_version
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple], rules: RuleSet = None,
+                  data_version: str = None) -> "HoursMatrix":
+        """
+        Builds the matrix from `AsyncDBInterface._read_period_hours` rows.
+        Pass the `data_version` read before the rows only if they hold
+        every entry of their pay periods, i.e. they were not filtered
+        by work date.
+        """
+        if not rows:
+            return cls.empty(rules)
+
+        columns = list(zip(*rows))
+        pay_period_ids = np.array(columns[5], dtype=np.int64)
+        work_dates = np.array(columns[7], dtype="datetime64[D]")
+        hours = np.array(columns[8], dtype=float)
+
+        ids, first, row_index = np.unique(
+            pay_period_ids, return_index=True, return_inverse=True)
+
+        start_dates = np.array(
+            [columns[6][i] for i in first], dtype="datetime64[D]")
+        offsets = (work_dates - start_dates[row_index]).astype(np.int64)
+        in_period = (offsets >= 0) & (offsets < PAY_PERIOD_DAYS)
+
+        keys = [
+            (rows[i][0], " ".join(filter(None, rows[i][1:4])),
+             rows[i][4], int(ids[n]), rows[i][6])
+            for n, i in enumerate(first)
+        ]
+
+        matrix = cls.__build(keys, start_dates, row_index[in_period],
+                             offsets[in_period], hours[in_period], rules)
+        matrix.data_version = data_version
+        return matrix
+
+    @classmethod
+    def from_work_entries(cls, start_date: str, work_entries: list[tuple],
+                          group: str = None) -> "HoursMatrix":
+        """
+        Single-row matrix from `_read_work_entries` (WorkDate, Hours) rows.
+        """
+        start_dates = np.array([start_date], dtype="datetime64[D]")
+
+        if work_entries:
+            work_dates = np.array(
+                [entry[0] for entry in work_entries], dtype="datetime64[D]")
+            hours = np.array([entry[1] for entry in work_entries], dtype=float)
+        else:
+            work_dates = np.array([], dtype="datetime64[D]")
+            hours = np.array([], dtype=float)
+
+        offsets = (work_dates - start_dates[0]).astype(np.int64)
+        in_period = (offsets >= 0) & (offsets < PAY_PERIOD_DAYS)
+        row_index = np.zeros(len(offsets), dtype=np.int64)
+
+        keys = [(None, "", group or "", None, str(start_date))]
+
+        return cls.__build(keys, start_dates, row_index[in_period],
+                           offsets[in_period], hours[in_period])
+
+    @classmethod
+    def empty(cls, rules: RuleSet = None) -> "HoursMatrix":
+        return cls(
+            keys=[],
+            start_dates=np.array([], dtype="datetime64[D]"),
+            hours=np.zeros((0, PAY_PERIOD_DAYS)),
+            logged=np.zeros((0, PAY_PERIOD_DAYS), dtype=bool),
+            rules=rules,
+        )
+
+    @classmethod
+    def __build(cls, keys, start_dates, rows, cols, values,
+                rules=None) -> "HoursMatrix":
+        hours = np.zeros((len(keys), PAY_PERIOD_DAYS))
+        logged = np.zeros((len(keys), PAY_PERIOD_DAYS), dtype=bool)
+
+        hours[rows, cols] = values
+        logged[rows, cols] = True
+
+        return cls(keys, start_dates, hours, logged, rules)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def with_rules(self, rules: RuleSet) -> "HoursMatrix":
+        """
+        The same hours under another rule set.
+        """
+        return HoursMatrix(self.keys, self.start_dates, self.hours,
+                           self.logged, rules=rules,
+                           data_version=self.data_version)
+
+    @cached_property
+    def groups(self) -> list[str]:
+        return [key[2] for key in self.keys]
+
+    @cached_property
+    def dates(self) -> np.ndarray:
+        """
+        Calendar date of every cell.
+        """
+        return self.start_dates[:, None] + np.arange(PAY_PERIOD_DAYS)
+
+    @cached_property
+    def weekday(self) -> np.ndarray:
+        return weekday_mask(self.start_dates)
+
+    @cached_property
+    def daily_overtime(self) -> np.ndarray:
+        if self.data_version is None:
+            return self.rules.apply(
+                self.hours, self.weekday, self.logged, self.groups)
+
+        return overtime_cache.compute(
+            rules=self.rules,
+            data_version=self.data_version,
+            pay_period_ids=[key[3] for key in self.keys],
+            hours=self.hours,
+            weekday=self.weekday,
+            logged=self.logged,
+            groups=self.groups,
+        )
+
+    @cached_property
+    def weekly_totals(self) -> np.ndarray:
+        return self.hours.reshape(-1, 2, 7).sum(axis=2)
+
+    @cached_property
+    def weekly_overtime(self) -> np.ndarray:
+        return self.daily_overtime.reshape(-1, 2, 7).sum(axis=2)
+
+    @cached_property
+    def period_totals(self) -> np.ndarray:
+        return self.hours.sum(axis=1)
+
+    @cached_property
+    def period_overtime(self) -> np.ndarray:
+        return self.daily_overtime.sum(axis=1)
+
+    def exceeding(self, threshold: float = None) -> np.ndarray:
+        """
+        Row indices whose bi-weekly total reaches `threshold`, by
+        default the rule set's period threshold.
+        """
+        if threshold is None:
+            threshold = self.rules.default.period_threshold or 0.0
+
+        return np.flatnonzero(self.period_totals >= threshold)
+
+    def totals(self, rows: np.ndarray = None) -> list[PeriodTotals]:
+        """
+        Per-row totals, largest overtime first.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+
+        rows = rows[np.argsort(-self.period_overtime[rows], kind="stable")]
+
+        weeks = self.weekly_totals[rows].tolist()
+        weeks_ot = self.weekly_overtime[rows].tolist()
+        totals = self.period_totals[rows].tolist()
+        overtime = self.period_overtime[rows].tolist()
+
+        return [
+            PeriodTotals(*self.keys[row], *weeks[i], totals[i],
+                         *weeks_ot[i], overtime[i])
+            for i, row in enumerate(rows.tolist())
+        ]
+
+
+async def load_hours_matrix(start_date: str = None,
+                            group: str = None,
+                            date_from: str = None,
+                            date_to: str = None,
+                            rules: RuleSet = None,
+                            db: AsyncDBInterface = None) -> HoursMatrix:
+    """
+    Loads every work entry matching the selection into an HoursMatrix.
+    Leaving a filter as None selects the whole database.
+    """
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await load_hours_matrix(
+                start_date, group, date_from, date_to, rules, db=db)
+
+    args = tuple(
+        None if value is None else str(value)
+        for value in (start_date, group, date_from, date_to)
+    )
+
+    # Read before the rows: a write in between only makes the cached
+    # rows look older than they are.
+    data_version = None
+    if date_from is None and date_to is None:
+        data_version = await read_data_version(db)
+
+    rows = await db._read_period_hours(args=args)
+
+    if rows == ERROR:
+        raise RuntimeError(f"Failed to read work entries for {args}")
+
+    return HoursMatrix.from_rows(rows, rules=rules, data_version=data_version)
+
@@ -1,20 +1,26 @@
 import aiosqlite
+import asyncio
+import re
 import shutil
+import sqlite3
 import tempfile
 import os
+import weakref
 import zipfile
 import glob
+from contextlib import asynccontextmanager, closing
 from datetime import date
 from pathlib import Path
 from typing import Union
+from uuid import uuid4
 
 from structs.result import Result
-from util.logger import CLogger
+from util.logger import get_logger
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 project_root = Path(__file__).resolve().parent.parent
 default_db = project_root / "app.db"
@@ -22,15 +28,239 @@ backups_dir = project_root / "backups"
 db_schema = project_root / "schema.sql"
 today = date.today().isoformat()
 
+# Connection-level PRAGMAs applied on every connect.
+# WAL lets read-only connections keep reading while an import writes.
+# "bulk" trades crash durability for write speed during large imports.
+PRAGMA_PROFILES = {
+    "default": {
+        "journal_mode": "WAL",
+    },
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "temp_store": "MEMORY",
+        "cache_size": "-65536",
+    },
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+    },
+}
+
+# How long a connection waits on another connection's lock before
+# SQLite reports it busy, and how often a busy statement is then retried.
+BUSY_TIMEOUT_MS = 5000
+BUSY_RETRIES = 4
+BUSY_BACKOFF = 0.05  # seconds, doubled on every retry
+
+# Dump statements for the CommentSearch full-text index. Its shadow
+# tables can't be restored from SQL, so dumps leave the index out and
+# the schema script rebuilds it from PayPeriodComment.
+SEARCH_INDEX_DUMP = re.compile(
+    r"^(INSERT INTO sqlite_master\(.*VALUES\('table','CommentSearch'"
+    r'|INSERT INTO "CommentSearch'
+    r"|CREATE TABLE 'CommentSearch_"
+    r"|CREATE TRIGGER CommentSearch)"
+)
+
+# PayPeriodSummary as readers see it: the stored rows, with those of
+# the "stale" pay periods in the JSON parameter `{pending}` replaced by
+# its "rows", computed in memory (see util.summaries.pending_summaries).
+SUMMARIES_CTE = """
+Summaries AS (
+    SELECT PayPeriodID, EmployeeID, StartDate,
+           Week1Hours, Week2Hours, TotalHours,
+           Week1Overtime, Week2Overtime, Overtime, RuleVersion
+    FROM PayPeriodSummary
+    WHERE PayPeriodID NOT IN (
+        SELECT value FROM json_each({pending}, '$.stale')
+    )
+    UNION ALL
+    SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+           json_extract(value, '$[2]'), json_extract(value, '$[3]'),
+           json_extract(value, '$[4]'), json_extract(value, '$[5]'),
+           json_extract(value, '$[6]'), json_extract(value, '$[7]'),
+           json_extract(value, '$[8]'), json_extract(value, '$[9]')
+    FROM json_each({pending}, '$.rows')
+)
+"""
+
+
+def is_uri(path: Union[str, Path]) -> bool:
+    """
+    True for "file:" URIs, such as the shared-cache in-memory databases
+    used by `in_memory` and the tests ("file:x?mode=memory&cache=shared").
+    """
+    return str(path).startswith("file:")
+
+
+def is_busy(error: Exception) -> bool:
+    """
+    SQLITE_BUSY (another connection holds the lock) or SQLITE_LOCKED
+    (a shared-cache table lock); both clear once the other side is done.
+    """
+    message = str(error).lower()
+
+    return isinstance(error, sqlite3.OperationalError) \
+        and ("locked" in message or "busy" in message)
+
+
+def read_only_uri(path: Union[str, Path]) -> str:
+    """
+    URI that opens a database file without write access.
+    """
+    if is_uri(path):
+        return str(path)
+
+    return f"{Path(path).absolute().as_uri()}?mode=ro"
+
+
+def backup_database(source: Union[str, Path], target: Union[str, Path]):
+    """
+    Copies `source` over `target` page by page with SQLite's online
+    backup API. Blocking; run it in a thread from async code.
+    """
+    with closing(sqlite3.connect(str(source), uri=is_uri(source))) as src, \
+            closing(sqlite3.connect(str(target), uri=is_uri(target))) as dst:
+        src.backup(dst)
+
+
+# One asyncio.Lock per event loop and database path; see `writer`.
+_write_locks = weakref.WeakKeyDictionary()
+
 
 class AsyncDBInterface:
-    def __init__(self):
-        self.db_path = str(default_db)
+    """
+    Connection to the application database.
+
+    Queries that only read should open it with `read_only`: those
+    connections can't write (query_only) and, in WAL mode, never wait
+    on an import. Writes go through `writer`, which hands out one write
+    connection per database at a time. Statements that still find the
+    database busy are retried with exponential backoff.
+    """
+
+    pragma_profile = "default"
+    # Set by `configure`; None means `default_db`.
+    database = None
+
+    def __init__(self, db_path: Union[str, Path] = None,
+                 read_only: bool = False):
+        self.db_path = str(db_path or self.database_path())
+        self.read_only = read_only
         self.connection = None
+        self.in_transaction = False
+
+    @classmethod
+    def use_pragma_profile(cls, name: str):
+        if name not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown pragma profile: {name}")
+
+        cls.pragma_profile = name
+
+    @classmethod
+    def configure(cls, path: Union[str, Path, None]):
+        """
+        Sets the database every `AsyncDBInterface()` opens from now on,
+        e.g. the DB value from .env or --database. None restores the
+        default, app.db in the project root.
+        """
+        cls.database = None if path is None else str(path)
+        log.info("Using database: %s", cls.database_path())
+
+    @classmethod
+    def database_path(cls) -> str:
+        return cls.database or str(default_db)
+
+    @classmethod
+    @asynccontextmanager
+    async def in_memory(cls, target: Union[str, Path] = None):
+        """
+        Batch mode for large imports. Loads `target` (the configured
+        database by default) into memory, points every
+        `AsyncDBInterface()` at the in-memory copy and yields it. When
+        the block exits cleanly, the copy is written back to `target`
+        with the backup API. If the block raises, `target` is left
+        unchanged; `ingest --in-memory` raises FailedIngest when any
+        file fails, so a batch is saved whole or not at all.
+
+        The copy is a shared-cache "file:...?mode=memory" database
+        rather than ":memory:", so the pipeline's connections all see
+        the same data. It lives as long as the yielded connection.
+        """
+        target = str(target or cls.database_path())
+        previous = cls.database
+        uri = f"file:batch_{uuid4().hex}?mode=memory&cache=shared"
+
+        async with cls(uri) as db:
+            if Path(target).exists():
+                await asyncio.to_thread(backup_database, target, uri)
+
+            if await db.create_from_schema() == ERROR:
+                raise RuntimeError("Failed to prepare in-memory database.")
+
+            cls.configure(uri)
+
+            try:
+                yield db
+
+            finally:
+                cls.configure(previous)
+
+            async with cls.write_lock(target):
+                await asyncio.to_thread(backup_database, uri, target)
+
+            log.info("Saved in-memory database to %s", target)
+
+    @staticmethod
+    def write_lock(path: Union[str, Path]) -> asyncio.Lock:
+        """
+        The lock serializing writers to `path` on the running loop.
+        """
+        locks = _write_locks.setdefault(asyncio.get_running_loop(), {})
+        return locks.setdefault(str(path), asyncio.Lock())
+
+    @classmethod
+    @asynccontextmanager
+    async def writer(cls, db_path: Union[str, Path] = None):
+        """
+        Opens the write connection once no other writer to the same
+        database is open in this process. Ingest, backup and restore
+        write through it, so they queue behind each other instead of
+        failing on SQLITE_BUSY. Don't open a writer from inside another
+        one for the same database; pass the open one down instead.
+        """
+        db = cls(db_path)
+
+        async with cls.write_lock(db.db_path):
+            async with db:
+                yield db
+
+    @property
+    def is_uri(self) -> bool:
+        return is_uri(self.db_path)
 
     async def __aenter__(self):
-        self.connection = await aiosqlite.connect(self.db_path)
-        await self.connection.execute("PRAGMA foreign_keys = ON;")
+        # A missing file is opened normally (and created, as before) so
+        # readers of a fresh install get empty results, not an error.
+        if self.read_only and (self.is_uri or os.path.exists(self.db_path)):
+            self.connection = await aiosqlite.connect(
+                read_only_uri(self.db_path), uri=True)
+        else:
+            self.connection = await aiosqlite.connect(
+                self.db_path, uri=self.is_uri)
+
+        pragmas = {"foreign_keys": "ON", "busy_timeout": BUSY_TIMEOUT_MS,
+                   **PRAGMA_PROFILES[self.pragma_profile]}
+
+        if self.read_only:
+            # The journal mode belongs to the file; readers can't set it.
+            pragmas.pop("journal_mode", None)
+            pragmas["query_only"] = "ON"
+
+        for pragma, value in pragmas.items():
+            await self.__retry(lambda: self.__pragma(pragma, value))
+
         self.connection.row_factory = aiosqlite.Row
         return self
 
@@ -38,10 +268,65 @@ class AsyncDBInterface:
         if self.connection:
             await self.connection.close()
 
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Groups writes into a single commit. Statements run through the
+        save_* methods inside this block are only committed on a clean
+        exit and rolled back if anything raises.
+        """
+        # Take the write lock up front, so statements inside the block
+        # never fail halfway through on a lock upgrade.
+        if not self.connection.in_transaction:
+            await self.__retry(
+                lambda: self.connection.execute("BEGIN IMMEDIATE;"))
+
+        self.in_transaction = True
+
+        try:
+            yield self
+            await self.connection.commit()
+
+        except BaseException:
+            await self.connection.rollback()
+            raise
+
+        finally:
+            self.in_transaction = False
+
+    async def __retry(self, operation):
+        """
+        Awaits `operation()`, calling it again with exponential backoff
+        while the database is busy or locked.
+        """
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                return await operation()
+
+            except sqlite3.OperationalError as e:
+                if not is_busy(e) or attempt == BUSY_RETRIES:
+                    raise
+
+                delay = BUSY_BACKOFF * 2 ** attempt
+                log.warning("Database busy (%s); retrying in %.2fs", e, delay)
+                await asyncio.sleep(delay)
+
+    async def __pragma(self, pragma: str, value):
+        # journal_mode returns a row; closing the cursor finalizes the
+        # statement so it doesn't keep the file locked.
+        async with self.connection.execute(f"PRAGMA {pragma} = {value};"):
+            pass
+
+    async def __commit(self):
+        if not self.in_transaction:
+            await self.__retry(self.connection.commit)
+
     async def __run_sql(self, sql: str, args: tuple = ()) -> Result:
         try:
-            async with self.connection.execute(sql, args):
-                await self.connection.commit()
+            cursor = await self.__retry(
+                lambda: self.connection.execute(sql, args))
+            await cursor.close()
+            await self.__commit()
 
             return SUCCESS
 
@@ -49,18 +334,48 @@ class AsyncDBInterface:
             log.error("__run_sql error: %s | %s", sql, e)
             return ERROR
 
-    async def __run_sql_read(self, sql: str, args: tuple = ()) -> Union[dict, Result]:
+    async def __run_sql_many(self, sql: str, args: list[tuple]) -> Result:
         try:
+            cursor = await self.__retry(
+                lambda: self.connection.executemany(sql, args))
+            await cursor.close()
+            await self.__commit()
+
+            return SUCCESS
+
+        except Exception as e:
+            log.error("__run_sql_many error: %s | %s", sql, e)
+            return ERROR
+
+    async def __run_sql_read(self, sql: str, args: tuple = ()) -> Union[dict, Result]:
+        async def read():
             async with self.connection.execute(sql, args) as cursor:
-                rows = await cursor.fetchall()
-                result = [tuple(row) for row in rows]
+                return await cursor.fetchall()
 
-            return result
+        try:
+            return [tuple(row) for row in await self.__retry(read)]
 
         except Exception as e:
             log.error("__run_sql_read error: %s | %s", sql, e)
             return ERROR
 
+    async def __run_sql_chunks(self, sql: str, args: tuple = (),
+                               chunk_size: int = 10_000):
+        """
+        Yields the result rows in lists of up to `chunk_size` tuples,
+        so large reads never hold the full result in memory.
+        """
+        try:
+            async with self.connection.execute(sql, args) as cursor:
+                cursor.arraysize = chunk_size
+
+                while rows := await cursor.fetchmany(chunk_size):
+                    yield [tuple(row) for row in rows]
+
+        except Exception as e:
+            log.error("__run_sql_chunks error: %s | %s", sql, e)
+            raise
+
     async def close(self):
         try:
             if self.connection:
@@ -80,7 +395,6 @@ class AsyncDBInterface:
             return False
 
         try:
-            import sqlite3
             with sqlite3.connect(path) as conn:
                 cursor = conn.execute(
                     "SELECT name FROM sqlite_master WHERE type='table';")
@@ -93,6 +407,10 @@ class AsyncDBInterface:
             return False
 
     async def initialize_db(self) -> Result:
+        if self.is_uri:
+            # Nothing on disk to validate or restore over.
+            return await self.create_from_schema()
+
         if not self.db_file_exists_and_valid(self.db_path):
             log.warning("Invalid or missing DB. Attempting recovery...")
 
@@ -109,24 +427,28 @@ class AsyncDBInterface:
 
             return result
 
-        return SUCCESS
+        return await self.create_from_schema()
 
     async def create_from_schema(self) -> Result:
+        """
+        Runs the schema script against the open connection.
+        Every statement is idempotent, so this doubles as the
+        migration step for databases created by older versions.
+        """
 
         try:
             with open(str(db_schema), "r") as f:
                 script = f.read()
-                log.info("Running DB schema script:\n%s", script)
+                log.debug("Running DB schema script:\n%s", script)
 
-            if self.connection:
-                await self.connection.close()
-                self.connection = None
+            if self.connection is None:
+                raise ValueError("No open connection to apply schema to.")
 
-                await self.connection.executescript(script)
-                await self.connection.commit()
+            await self.connection.executescript(script)
+            await self.connection.commit()
 
-                log.info("Database schema initialized successfully.")
-                return SUCCESS
+            log.info("Database schema initialized successfully.")
+            return SUCCESS
 
         except Exception as e:
             log.error("Failed to initialize DB from schema: %s", e)
@@ -195,6 +517,10 @@ class AsyncDBInterface:
 
             async with aiosqlite.connect(tmp_db_path) as tmp_conn:
                 await tmp_conn.executescript(sql)
+
+                with open(str(db_schema), "r") as f:
+                    await tmp_conn.executescript(f.read())
+
                 await tmp_conn.commit()
 
                 cursor = await tmp_conn.execute(
@@ -206,8 +532,12 @@ class AsyncDBInterface:
                 if not tables:
                     raise ValueError("Initialized DB contains no tables.")
 
-            if Path(self.db_path).exists():
-                os.remove(self.db_path)
+            # A WAL log left next to the old file would be replayed
+            # into the restored one.
+            for path in (self.db_path, f"{self.db_path}-wal",
+                         f"{self.db_path}-shm"):
+                if Path(path).exists():
+                    os.remove(path)
 
             shutil.move(tmp_db_path, self.db_path)
 
@@ -240,7 +570,8 @@ class AsyncDBInterface:
 
         try:
             async for line in self.connection.iterdump():
-                dump += f"{line}\n"
+                if not SEARCH_INDEX_DUMP.match(line):
+                    dump += f"{line}\n"
 
         except Exception as e:
             log.error("dump_db_and_zip error: %s | %s",
@@ -278,6 +609,29 @@ class AsyncDBInterface:
         """
         return await self.__run_sql(sql=sql, args=args)
 
+    async def save_work_entries(self, args: list[tuple]) -> Result:
+        sql = """
+        INSERT OR IGNORE INTO WorkEntry
+        (PayPeriodID, WorkDate, Hours)
+        VALUES (?, ?, ?);
+        """
+        return await self.__run_sql_many(sql=sql, args=args)
+
+    async def update_work_entries(self, args: list[tuple]) -> Result:
+        sql = """
+        UPDATE WorkEntry
+        SET Hours=?
+        WHERE WorkEntryID=?;
+        """
+        return await self.__run_sql_many(sql=sql, args=args)
+
+    async def delete_work_entries(self, args: list[tuple]) -> Result:
+        sql = """
+        DELETE FROM WorkEntry
+        WHERE WorkEntryID=?;
+        """
+        return await self.__run_sql_many(sql=sql, args=args)
+
     async def save_comment(self, args: tuple) -> Result:
         """
         This saves an entry even if it already exists.
@@ -294,6 +648,89 @@ class AsyncDBInterface:
 
         return await self.__run_sql(sql=sql, args=args)
 
+    async def save_ingest_ledger(self, args: tuple) -> Result:
+        sql = """
+        INSERT OR REPLACE INTO IngestLedger (
+            FileHash, FilePath, FileSize, SheetCount,
+            FirstStartDate, LastStartDate, RowCount,
+            IngestedAt, DurationSeconds
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def save_ingest_ledger_sheet(self, args: tuple) -> Result:
+        sql = """
+        INSERT OR IGNORE INTO IngestLedgerSheet
+        (SheetHash, LedgerID, SheetIndex, RowCount)
+        VALUES (?, ?, ?, ?);
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def save_pay_period_summaries(self, args: list[tuple]) -> Result:
+        sql = """
+        INSERT OR REPLACE INTO PayPeriodSummary (
+            PayPeriodID, EmployeeID, StartDate,
+            Week1Hours, Week2Hours, TotalHours,
+            Week1Overtime, Week2Overtime, Overtime,
+            RuleVersion, UpdatedAt
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """
+        return await self.__run_sql_many(sql=sql, args=args)
+
+    async def delete_pay_period_summaries(self, args: tuple) -> Result:
+        placeholders = ", ".join("?" for _ in args)
+        sql = f"""
+        DELETE FROM PayPeriodSummary
+        WHERE PayPeriodID IN ({placeholders});
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def delete_all_pay_period_summaries(self) -> Result:
+        sql = """
+        DELETE FROM PayPeriodSummary;
+        """
+        return await self.__run_sql(sql=sql, args=())
+
+    async def delete_stale_pay_period_summaries(self, args: tuple) -> Result:
+        placeholders = ", ".join("?" for _ in args)
+        sql = f"""
+        DELETE FROM StalePayPeriodSummary
+        WHERE PayPeriodID IN ({placeholders});
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def delete_all_stale_pay_period_summaries(self) -> Result:
+        sql = """
+        DELETE FROM StalePayPeriodSummary;
+        """
+        return await self.__run_sql(sql=sql, args=())
+
+    async def save_data_version(self, args: tuple) -> Result:
+        sql = """
+        INSERT OR REPLACE INTO Meta (Key, Value)
+        VALUES ('DataVersion', ?);
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def save_overtime_rule(self, args: tuple) -> Result:
+        sql = """
+        INSERT OR REPLACE INTO OvertimeRule (
+            EmployeeGroup, DailyThreshold, WeeklyThreshold,
+            PeriodThreshold, WeekendMultiplier
+        )
+        VALUES (?, ?, ?, ?, ?);
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
+    async def delete_overtime_rule(self, args: tuple) -> Result:
+        sql = """
+        DELETE FROM OvertimeRule
+        WHERE EmployeeGroup=?;
+        """
+        return await self.__run_sql(sql=sql, args=args)
+
     async def delete_employee(self, args: tuple) -> Result:
         sql = """
         DELETE FROM Employee
@@ -332,6 +769,16 @@ class AsyncDBInterface:
         """
         return await self.__run_sql_read(sql=sql, args=args)
 
+    async def _read_employee_group(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        sql = """
+        SELECT EmployeeGroup
+        FROM Employee
+        WHERE EmployeeID=?;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
     async def _read_pay_period_id(
         self, args: tuple
     ) -> Union[dict, Result]:
@@ -342,6 +789,29 @@ class AsyncDBInterface:
             """
         return await self.__run_sql_read(sql=sql, args=args)
 
+    async def _read_pay_period_dates(self) -> Union[dict, Result]:
+        sql = """
+        SELECT DISTINCT StartDate
+        FROM PayPeriod
+        ORDER BY StartDate;
+        """
+        return await self.__run_sql_read(sql=sql, args=())
+
+    async def _read_employee_names_by_date(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Names of every employee with a pay period starting on `args[0]`.
+        """
+        sql = """
+        SELECT e.FirstName, e.MiddleName, e.LastName
+        FROM PayPeriod p
+        JOIN Employee e ON e.EmployeeID = p.EmployeeID
+        WHERE p.StartDate=?
+        ORDER BY e.LastName, e.FirstName, e.MiddleName;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
     async def _read_pay_period_id_by_date(
         self, args: tuple
     ) -> Union[dict, Result]:
@@ -402,6 +872,372 @@ class AsyncDBInterface:
         """
         return await self.__run_sql_read(sql=sql, args=args)
 
+    async def _read_ingest_ledger(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        sql = """
+        SELECT LedgerID, FileSize, SheetCount, RowCount, IngestedAt
+        FROM IngestLedger
+        WHERE FileHash=?;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_ingested_sheets(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        placeholders = ", ".join("?" for _ in args)
+        sql = f"""
+        SELECT SheetHash
+        FROM IngestLedgerSheet
+        WHERE SheetHash IN ({placeholders});
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_work_entries_by_pay_periods(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        placeholders = ", ".join("?" for _ in args)
+        sql = f"""
+        SELECT WorkEntryID, PayPeriodID, WorkDate, Hours
+        FROM WorkEntry
+        WHERE PayPeriodID IN ({placeholders});
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_work_entries_by_names(
+        self, args: list[tuple]
+    ) -> Union[dict, Result]:
+        """
+        Stored work entries for (FirstName, MiddleName, LastName,
+        StartDate) keys, each row followed by its key. Keys without a
+        pay period yet return nothing.
+        """
+        values = ", ".join("(?, ?, ?, ?)" for _ in args)
+        sql = f"""
+        SELECT w.WorkEntryID, w.PayPeriodID, w.WorkDate, w.Hours,
+               e.FirstName, e.MiddleName, e.LastName, p.StartDate
+        FROM Employee e
+        JOIN PayPeriod p ON p.EmployeeID = e.EmployeeID
+        JOIN WorkEntry w ON w.PayPeriodID = p.PayPeriodID
+        WHERE (e.FirstName, e.MiddleName, e.LastName, p.StartDate)
+        IN (VALUES {values});
+        """
+        return await self.__run_sql_read(
+            sql=sql, args=tuple(value for key in args for value in key))
+
+    async def _read_period_hours(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Every work entry with its pay period and employee, filtered by
+        (StartDate, EmployeeGroup, first WorkDate, last WorkDate).
+        A None filter matches everything.
+        """
+        sql = """
+        SELECT e.EmployeeID, e.FirstName, e.MiddleName, e.LastName,
+               e.EmployeeGroup, p.PayPeriodID, p.StartDate,
+               w.WorkDate, w.Hours
+        FROM WorkEntry w
+        JOIN PayPeriod p ON p.PayPeriodID = w.PayPeriodID
+        JOIN Employee e ON e.EmployeeID = p.EmployeeID
+        WHERE (?1 IS NULL OR p.StartDate = ?1)
+        AND (?2 IS NULL OR e.EmployeeGroup = ?2)
+        AND (?3 IS NULL OR w.WorkDate >= ?3)
+        AND (?4 IS NULL OR w.WorkDate <= ?4)
+        ORDER BY p.PayPeriodID;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_period_hours_by_pay_periods(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        placeholders = ", ".join("?" for _ in args)
+        sql = f"""
+        SELECT e.EmployeeID, e.FirstName, e.MiddleName, e.LastName,
+               e.EmployeeGroup, p.PayPeriodID, p.StartDate,
+               w.WorkDate, w.Hours
+        FROM WorkEntry w
+        JOIN PayPeriod p ON p.PayPeriodID = w.PayPeriodID
+        JOIN Employee e ON e.EmployeeID = p.EmployeeID
+        WHERE p.PayPeriodID IN ({placeholders})
+        ORDER BY p.PayPeriodID;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_pay_period_summaries(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Summaries filtered by (StartDate, EmployeeGroup), most overtime
+        first, with the pending summaries in `args[2]`. A None filter
+        matches everything.
+        """
+        sql = f"""
+        WITH {SUMMARIES_CTE.format(pending="?3")}
+        SELECT e.EmployeeID, e.FirstName, e.MiddleName, e.LastName,
+               e.EmployeeGroup, s.PayPeriodID, s.StartDate,
+               s.Week1Hours, s.Week2Hours, s.TotalHours,
+               s.Week1Overtime, s.Week2Overtime, s.Overtime,
+               s.RuleVersion
+        FROM Summaries s
+        JOIN Employee e ON e.EmployeeID = s.EmployeeID
+        WHERE (?1 IS NULL OR s.StartDate = ?1)
+        AND (?2 IS NULL OR e.EmployeeGroup = ?2)
+        ORDER BY s.Overtime DESC, s.PayPeriodID;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_pay_period_summary(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        sql = f"""
+        WITH {SUMMARIES_CTE.format(pending="?2")}
+        SELECT Week1Hours, Week2Hours, TotalHours,
+               Week1Overtime, Week2Overtime, Overtime, RuleVersion
+        FROM Summaries
+        WHERE PayPeriodID=?1;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_unsummarized_pay_periods(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Pay periods marked in StalePayPeriodSummary, plus those whose
+        summary was built under a rule-set version other than `args[0]`.
+        Both come from indexes, so this stays cheap on every read.
+        """
+        sql = """
+        SELECT PayPeriodID
+        FROM PayPeriodSummary
+        WHERE RuleVersion < ?1 OR RuleVersion > ?1
+        UNION
+        SELECT PayPeriodID
+        FROM StalePayPeriodSummary;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_group_totals(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Employees, hours and overtime per (EmployeeGroup, StartDate),
+        filtered by (StartDate, EmployeeGroup), with the pending
+        summaries in `args[2]`. Each group's change in hours since its
+        previous pay period comes from LAG().
+        """
+        sql = f"""
+        WITH {SUMMARIES_CTE.format(pending="?3")},
+        PeriodHours AS (
+            SELECT p.PayPeriodID, p.EmployeeID, p.StartDate,
+                   SUM(w.Hours) AS Hours
+            FROM PayPeriod p
+            JOIN WorkEntry w ON w.PayPeriodID = p.PayPeriodID
+            GROUP BY p.PayPeriodID
+        ),
+        GroupTotals AS (
+            SELECT e.EmployeeGroup, h.StartDate,
+                   COUNT(*) AS Employees,
+                   SUM(h.Hours) AS Hours,
+                   COALESCE(SUM(s.Overtime), 0.0) AS Overtime
+            FROM PeriodHours h
+            JOIN Employee e ON e.EmployeeID = h.EmployeeID
+            LEFT JOIN Summaries s ON s.PayPeriodID = h.PayPeriodID
+            GROUP BY e.EmployeeGroup, h.StartDate
+        )
+        SELECT EmployeeGroup, StartDate, Employees, Hours, Overtime,
+               Hours - LAG(Hours) OVER (
+                   PARTITION BY EmployeeGroup ORDER BY StartDate
+               ) AS HoursChange
+        FROM GroupTotals
+        WHERE (?1 IS NULL OR StartDate = ?1)
+        AND (?2 IS NULL OR EmployeeGroup = ?2)
+        ORDER BY StartDate, EmployeeGroup;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_period_totals(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Company-wide employees, hours and overtime per StartDate for
+        one EmployeeGroup, or every group when `args[0]` is None, with
+        the change since the previous pay period. `args[1]` holds the
+        pending summaries.
+        """
+        sql = f"""
+        WITH {SUMMARIES_CTE.format(pending="?2")},
+        PeriodTotals AS (
+            SELECT p.StartDate,
+                   COUNT(DISTINCT p.EmployeeID) AS Employees,
+                   SUM(w.Hours) AS Hours
+            FROM PayPeriod p
+            JOIN WorkEntry w ON w.PayPeriodID = p.PayPeriodID
+            JOIN Employee e ON e.EmployeeID = p.EmployeeID
+            WHERE (?1 IS NULL OR e.EmployeeGroup = ?1)
+            GROUP BY p.StartDate
+        ),
+        PeriodOvertime AS (
+            SELECT s.StartDate, SUM(s.Overtime) AS Overtime
+            FROM Summaries s
+            JOIN Employee e ON e.EmployeeID = s.EmployeeID
+            WHERE (?1 IS NULL OR e.EmployeeGroup = ?1)
+            GROUP BY s.StartDate
+        )
+        SELECT t.StartDate, t.Employees, t.Hours,
+               COALESCE(o.Overtime, 0.0) AS Overtime,
+               t.Hours - LAG(t.Hours) OVER (ORDER BY t.StartDate),
+               COALESCE(o.Overtime, 0.0)
+                   - LAG(COALESCE(o.Overtime, 0.0)) OVER (ORDER BY t.StartDate)
+        FROM PeriodTotals t
+        LEFT JOIN PeriodOvertime o ON o.StartDate = t.StartDate
+        ORDER BY t.StartDate;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_top_overtime(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        The `args[2]` employees with the most overtime in each pay
+        period, filtered by (StartDate, EmployeeGroup), with the pending
+        summaries in `args[3]`.
+        """
+        sql = f"""
+        WITH {SUMMARIES_CTE.format(pending="?4")}
+        SELECT StartDate, Rank, FirstName, MiddleName, LastName,
+               EmployeeGroup, TotalHours, Overtime
+        FROM (
+            SELECT s.StartDate, e.FirstName, e.MiddleName, e.LastName,
+                   e.EmployeeGroup, s.TotalHours, s.Overtime,
+                   RANK() OVER (
+                       PARTITION BY s.StartDate ORDER BY s.Overtime DESC
+                   ) AS Rank
+            FROM Summaries s
+            JOIN Employee e ON e.EmployeeID = s.EmployeeID
+            WHERE (?1 IS NULL OR s.StartDate = ?1)
+            AND (?2 IS NULL OR e.EmployeeGroup = ?2)
+            AND s.Overtime > 0
+        )
+        WHERE Rank <= ?3
+        ORDER BY StartDate, Rank;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_comment_matches(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Comments matching the FTS5 query `args[0]`, best match (lowest
+        bm25) first, filtered by (WorkDate from, WorkDate to,
+        EmployeeGroup) and limited to `args[4]` rows.
+        """
+        sql = """
+        SELECT c.CommentID, c.WorkDate,
+               e.FirstName, e.MiddleName, e.LastName, e.EmployeeGroup,
+               c.PunchInComment, c.PunchOutComment, c.SpecialPayComment,
+               m.Rank
+        FROM (
+            SELECT rowid, bm25(CommentSearch) AS Rank
+            FROM CommentSearch
+            WHERE CommentSearch MATCH ?1
+        ) m
+        JOIN PayPeriodComment c ON c.CommentID = m.rowid
+        JOIN Employee e ON e.EmployeeID = c.EmployeeID
+        WHERE (?2 IS NULL OR c.WorkDate >= ?2)
+        AND (?3 IS NULL OR c.WorkDate <= ?3)
+        AND (?4 IS NULL OR e.EmployeeGroup = ?4)
+        ORDER BY m.Rank
+        LIMIT ?5;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    async def _read_weekly_deltas(
+        self, args: tuple
+    ) -> Union[dict, Result]:
+        """
+        Hours per employee per Monday-based week with the change from
+        the employee's previous week, filtered by (first WorkDate,
+        last WorkDate, EmployeeGroup).
+        """
+        sql = """
+        WITH WeeklyHours AS (
+            SELECT p.EmployeeID,
+                   date(w.WorkDate,
+                        '-' || ((CAST(strftime('%w', w.WorkDate) AS INTEGER)
+                                 + 6) % 7) || ' days') AS WeekStart,
+                   SUM(w.Hours) AS Hours
+            FROM WorkEntry w
+            JOIN PayPeriod p ON p.PayPeriodID = w.PayPeriodID
+            WHERE (?1 IS NULL OR w.WorkDate >= ?1)
+            AND (?2 IS NULL OR w.WorkDate <= ?2)
+            GROUP BY p.EmployeeID, WeekStart
+        )
+        SELECT h.WeekStart, e.FirstName, e.MiddleName, e.LastName,
+               e.EmployeeGroup, h.Hours,
+               h.Hours - LAG(h.Hours) OVER (
+                   PARTITION BY h.EmployeeID ORDER BY h.WeekStart
+               ) AS HoursChange
+        FROM WeeklyHours h
+        JOIN Employee e ON e.EmployeeID = h.EmployeeID
+        WHERE (?3 IS NULL OR e.EmployeeGroup = ?3)
+        ORDER BY h.WeekStart, e.LastName, e.FirstName;
+        """
+        return await self.__run_sql_read(sql=sql, args=args)
+
+    def _stream_work_entries(self, args: tuple, groups: tuple = (),
+                             employees: tuple = (), chunk_size: int = 10_000):
+        """
+        Streams (EmployeeID, Employee, EmployeeGroup, StartDate,
+        WorkDate, Hours) in chunks, filtered by (first WorkDate, last
+        WorkDate) and optionally by groups and full employee names.
+        """
+        filters = ""
+
+        if groups:
+            placeholders = ", ".join("?" for _ in groups)
+            filters += f"AND e.EmployeeGroup IN ({placeholders})\n"
+
+        if employees:
+            placeholders = ", ".join("?" for _ in employees)
+            filters += f"AND Employee IN ({placeholders})\n"
+
+        sql = f"""
+        SELECT e.EmployeeID,
+               e.FirstName || ' '
+                   || COALESCE(NULLIF(e.MiddleName, '') || ' ', '')
+                   || e.LastName AS Employee,
+               e.EmployeeGroup, p.StartDate, w.WorkDate, w.Hours
+        FROM WorkEntry w
+        JOIN PayPeriod p ON p.PayPeriodID = w.PayPeriodID
+        JOIN Employee e ON e.EmployeeID = p.EmployeeID
+        WHERE (? IS NULL OR w.WorkDate >= ?)
+        AND (? IS NULL OR w.WorkDate <= ?)
+        {filters}
+        ORDER BY w.WorkDate, e.EmployeeID;
+        """
+        date_from, date_to = args
+        args = (date_from, date_from, date_to, date_to, *groups, *employees)
+
+        return self.__run_sql_chunks(sql=sql, args=args, chunk_size=chunk_size)
+
+    async def _read_data_version(self) -> Union[dict, Result]:
+        sql = """
+        SELECT Value
+        FROM Meta
+        WHERE Key='DataVersion';
+        """
+        return await self.__run_sql_read(sql=sql, args=())
+
+    async def _read_overtime_rules(self) -> Union[dict, Result]:
+        sql = """
+        SELECT EmployeeGroup, DailyThreshold, WeeklyThreshold,
+               PeriodThreshold, WeekendMultiplier
+        FROM OvertimeRule
+        ORDER BY EmployeeGroup;
+        """
+        return await self.__run_sql_read(sql=sql, args=())
+
     async def read_dates(self) -> Union[dict, Result]:
         sql = """
         SELECT DISTINCT StartDate
@@ -433,6 +1269,14 @@ class AsyncDBInterface:
 
         return await self.__run_sql_read(sql=sql, args=args)
 
+    async def _read_employee_names(self) -> Union[dict, Result]:
+        sql = """
+        SELECT FirstName, MiddleName, LastName, EmployeeGroup
+        FROM Employee
+        ORDER BY LastName, FirstName;
+        """
+        return await self.__run_sql_read(sql=sql, args=())
+
     async def _default_employee(self) -> Union[dict, Result]:
         sql = """
         SELECT FirstName, MiddleName, LastName
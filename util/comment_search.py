@@ -0,0 +1,91 @@
+import re
+
+from structs.records import CommentMatch
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+# Search field name -> CommentSearch column.
+COLUMNS = {
+    "punch_in": "PunchInComment",
+    "punch_out": "PunchOutComment",
+    "special_pay": "SpecialPayComment",
+}
+
+TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_query(text: str, column: str = None, prefix: bool = True) -> str:
+    """
+    Turns free text into an FTS5 query matching every word. Words are
+    quoted so punctuation in the text is never read as query syntax;
+    "quoted phrases" are matched as phrases. With `prefix`, the last
+    word also matches as a prefix, for search-as-you-type.
+
+    `column` restricts the match to one of `COLUMNS`. Returns an empty
+    string when the text has no words.
+    """
+    if column is not None and column not in COLUMNS:
+        raise ValueError(f"Unknown comment field: {column}")
+
+    terms = []
+
+    for phrase, word in TERM.findall(str(text)):
+        words = re.findall(r"\w+", phrase or word)
+
+        if words:
+            terms.append((" ".join(words), bool(phrase)))
+
+    if not terms:
+        return ""
+
+    query = [f'"{words}"' for words, _ in terms]
+
+    if prefix and not terms[-1][1]:
+        query[-1] += "*"
+
+    query = " ".join(query)
+
+    if column is not None:
+        query = f"{COLUMNS[column]} : ({query})"
+
+    return query
+
+
+async def search_comments(text: str,
+                          column: str = None,
+                          date_from: str = None,
+                          date_to: str = None,
+                          group: str = None,
+                          limit: int = 100,
+                          db: AsyncDBInterface = None) -> list[CommentMatch]:
+    """
+    Punch and special-pay comments matching `text`, ranked by bm25.
+    Filters: `column` (see `COLUMNS`), WorkDate range and group.
+    """
+    query = fts_query(text, column)
+
+    if not query:
+        return []
+
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await search_comments(
+                text, column, date_from, date_to, group, limit, db=db)
+
+    args = (query, date_from, date_to, group, limit)
+    rows = await db._read_comment_matches(args=args)
+
+    if rows == ERROR:
+        raise RuntimeError(f"Failed to search comments for {args}")
+
+    return [
+        CommentMatch(row[0], row[1], " ".join(filter(None, row[2:5])),
+                     *row[5:10])
+        for row in rows
+    ]
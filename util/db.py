@@ -8,12 +8,12 @@ from pathlib import Path
 from typing import Union
 
 from structs.result import Result
-from util.logger import CLogger
+from util.logger import get_logger
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 project_root = Path(__file__).resolve().parent.parent
 default_db = str(project_root / "app.db")
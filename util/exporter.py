@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import csv
+import time
+import zipfile
+from pathlib import Path
+
+from util.async_db import AsyncDBInterface
+from util.lazy import lazy_import
+from util.logger import get_logger
+
+np = lazy_import("numpy")
+pyarrow = lazy_import("pyarrow", optional=True)
+
+log = get_logger(__name__)
+
+COLUMNS = ("employee_id", "employee", "group", "pay_period_start",
+           "work_date", "hours")
+
+CHUNK_SIZE = 50_000
+
+
+def chunk_arrays(rows: list[tuple]) -> dict[str, np.ndarray]:
+    """
+    Turns one chunk of `_stream_work_entries` rows into typed columns.
+    """
+    employee_id, employee, group, start, work_date, hours = zip(*rows)
+
+    return {
+        "employee_id": np.array(employee_id, dtype=np.int64),
+        "employee": np.array(employee, dtype=str),
+        "group": np.array([g or "" for g in group], dtype=str),
+        "pay_period_start": np.array(start, dtype="datetime64[D]"),
+        "work_date": np.array(work_date, dtype="datetime64[D]"),
+        "hours": np.array(hours, dtype=np.float64),
+    }
+
+
+class CsvWriter:
+    suffix = ".csv"
+
+    def __init__(self, path: Path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, rows: list[tuple]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class NpzWriter:
+    """
+    Writes every chunk as its own set of .npy members, named
+    "<column>/<chunk>.npy", so memory use is bounded by the chunk size.
+    `load_npz` concatenates them back into one array per column.
+    """
+    suffix = ".npz"
+
+    def __init__(self, path: Path):
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        self.chunks = 0
+
+    def write(self, rows: list[tuple]):
+        for column, values in chunk_arrays(rows).items():
+            name = f"{column}/{self.chunks:06d}.npy"
+
+            with self.archive.open(name, "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, values, allow_pickle=False)
+
+        self.chunks += 1
+
+    def close(self):
+        self.archive.close()
+
+
+class ParquetWriter:
+    suffix = ".parquet"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.writer = None
+
+    def write(self, rows: list[tuple]):
+        table = pyarrow.table(chunk_arrays(rows))
+
+        if self.writer is None:
+            from pyarrow import parquet
+
+            self.writer = parquet.ParquetWriter(
+                str(self.path), table.schema)
+
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+WRITERS = {
+    "csv": CsvWriter,
+    "npz": NpzWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def available_formats() -> list[str]:
+    return [f for f in WRITERS if f != "parquet" or pyarrow is not None]
+
+
+def load_npz(path: str) -> dict[str, np.ndarray]:
+    """
+    Reads an NpzWriter export back into one array per column.
+    """
+    with np.load(path) as archive:
+        return {
+            column: np.concatenate([
+                archive[name] for name in sorted(archive.files)
+                if name.startswith(f"{column}/")
+            ] or [np.array([])])
+            for column in COLUMNS
+        }
+
+
+async def export_work_entries(output: str,
+                              fmt: str = "csv",
+                              date_from: str = None,
+                              date_to: str = None,
+                              groups: list[str] = (),
+                              employees: list[str] = (),
+                              chunk_size: int = CHUNK_SIZE,
+                              db: AsyncDBInterface = None) -> dict:
+    """
+    Streams the selected work entries from the database into `output`
+    one chunk at a time. Returns {"path", "format", "rows", "chunks",
+    "seconds"}.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await export_work_entries(
+                output, fmt, date_from, date_to, groups, employees,
+                chunk_size, db=db)
+
+    writer_class = WRITERS[fmt]
+    path = Path(output)
+
+    if not path.suffix:
+        path = path.with_suffix(writer_class.suffix)
+
+    started = time.perf_counter()
+    rows = 0
+    chunks = 0
+
+    writer = writer_class(path)
+
+    try:
+        stream = db._stream_work_entries(
+            args=(date_from, date_to),
+            groups=tuple(groups or ()),
+            employees=tuple(employees or ()),
+            chunk_size=chunk_size,
+        )
+
+        async for chunk in stream:
+            writer.write(chunk)
+            rows += len(chunk)
+            chunks += 1
+
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - started
+    log.info("Exported %d work entries to %s in %.3fs", rows, path, seconds)
+
+    return {
+        "path": str(path),
+        "format": fmt,
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": seconds,
+    }
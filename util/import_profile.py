@@ -0,0 +1,129 @@
+"""
+Import-time profile of the application's start-up modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter
+and reports the slowest imports. With `--forbid` or `--budget-ms` it
+exits non-zero, so it can guard against start-up regressions:
+
+    python -m util.import_profile app --top 15
+    python -m util.import_profile util.processor --forbid numpy xlrd
+    python -m util.import_profile app --budget-ms 400 --repeat 5
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+project_root = Path(__file__).resolve().parent.parent
+
+IMPORT_TIME = re.compile(
+    r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_times(module: str) -> list[ImportTime]:
+    """
+    Every module imported by `import <module>` in a fresh interpreter,
+    in import order, with its own and cumulative import time.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+
+    times = []
+
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+
+        if match:
+            own, cumulative, indent, name = match.groups()
+            times.append(ImportTime(
+                name, int(own), int(cumulative), (len(indent) - 1) // 2))
+
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1:]
+        raise ImportError(f"import {module} failed: {' '.join(error)}")
+
+    return times
+
+
+def total_ms(times: list[ImportTime]) -> float:
+    return sum(t.cumulative_us for t in times if t.depth == 0) / 1000
+
+
+def profile(module: str, repeat: int = 1) -> list[ImportTime]:
+    """
+    The fastest of `repeat` runs, to keep disk cache and scheduler
+    noise out of the numbers.
+    """
+    return min((import_times(module) for _ in range(repeat)), key=total_ms)
+
+
+def print_profile(module: str, times: list[ImportTime], top: int):
+    print(f"import {module}: {total_ms(times):.1f}ms, "
+          f"{len(times)} modules")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+
+    for t in sorted(times, key=lambda t: t.self_us, reverse=True)[:top]:
+        print(f"{t.self_us / 1000:>9.1f} {t.cumulative_us / 1000:>9.1f}  "
+              f"{t.module}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m util.import_profile",
+        description="Import-time profile of start-up modules.")
+    parser.add_argument("modules", nargs="*", default=["app"],
+                        help="Modules to import (default: app).")
+    parser.add_argument("-n", "--top", type=int, default=20,
+                        help="Slowest imports to list.")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="Runs per module; the fastest is reported.")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Fail if a module takes longer to import.")
+    parser.add_argument("--forbid", nargs="+", default=[],
+                        help="Fail if any of these packages is imported.")
+    args = parser.parse_args(argv)
+
+    failed = False
+
+    for module in args.modules:
+        try:
+            times = profile(module, args.repeat)
+
+        except ImportError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+        print_profile(module, times, args.top)
+
+        imported = {t.module.split(".")[0] for t in times}
+        forbidden = sorted(imported.intersection(args.forbid))
+
+        if forbidden:
+            failed = True
+            print(f"FAIL: import {module} loads {', '.join(forbidden)}")
+
+        if args.budget_ms is not None and total_ms(times) > args.budget_ms:
+            failed = True
+            print(f"FAIL: import {module} took {total_ms(times):.1f}ms, "
+                  f"over the {args.budget_ms:.0f}ms budget")
+
+        print()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
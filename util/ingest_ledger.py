@@ -0,0 +1,135 @@
+import hashlib
+import os
+from datetime import datetime
+
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(file_path: str) -> str:
+    """
+    SHA-256 of the raw file contents, read in 1 MiB chunks.
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def sheet_digest(sheet) -> str:
+    """
+    SHA-256 of every cell value in an xlrd sheet.
+
+    Only the values are hashed, so re-saving a workbook without
+    touching a sheet's data leaves its digest unchanged.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{sheet.nrows}x{sheet.ncols}".encode())
+
+    for row in range(sheet.nrows):
+        digest.update(repr(sheet.row_values(row)).encode())
+
+    return digest.hexdigest()
+
+
+class IngestLedger:
+    """
+    Record of every report that has been written to the database.
+
+    A file whose hash is already in the ledger is skipped outright.
+    A changed file is checked sheet by sheet, so only the sheets
+    whose contents changed are parsed and written again.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.file_size = os.path.getsize(self.file_path)
+        self.file_hash = file_digest(self.file_path)
+        self.sheets = []
+        self.start_dates = []
+
+    async def is_ingested(self) -> bool:
+        async with AsyncDBInterface(read_only=True) as db:
+            result = await db._read_ingest_ledger(args=(self.file_hash,))
+
+        if result == ERROR:
+            log.warning("Could not read ingest ledger for %s", self.file_path)
+            return False
+
+        return bool(result) and result[0][1] == self.file_size
+
+    async def known_sheets(self, sheet_hashes: list[str]) -> set[str]:
+        if not sheet_hashes:
+            return set()
+
+        async with AsyncDBInterface(read_only=True) as db:
+            result = await db._read_ingested_sheets(args=tuple(sheet_hashes))
+
+        if result == ERROR:
+            log.warning("Could not read sheet ledger for %s", self.file_path)
+            return set()
+
+        return {row[0] for row in result}
+
+    def add_sheet(self, index: int, sheet_hash: str, row_count: int, start_date):
+        self.sheets.append((sheet_hash, index, row_count))
+        self.start_dates.append(str(start_date))
+
+    @property
+    def row_count(self) -> int:
+        return sum(sheet[2] for sheet in self.sheets)
+
+    async def record(self, sheet_count: int, duration: float,
+                     db: AsyncDBInterface = None) -> Result:
+        if db is None:
+            async with AsyncDBInterface.writer() as db:
+                return await self.record(sheet_count, duration, db=db)
+
+        args = (
+            self.file_hash,
+            self.file_path,
+            self.file_size,
+            sheet_count,
+            min(self.start_dates, default=None),
+            max(self.start_dates, default=None),
+            self.row_count,
+            datetime.now().isoformat(timespec="seconds"),
+            round(duration, 4),
+        )
+
+        result = await db.save_ingest_ledger(args=args)
+
+        if result == ERROR:
+            log.error("Failed to record ingest ledger: %s", self.file_path)
+            return ERROR
+
+        id_result = await db._read_ingest_ledger(args=(self.file_hash,))
+
+        if id_result == ERROR or not id_result:
+            log.error("Failed to fetch ledger ID: %s", self.file_path)
+            return ERROR
+
+        ledger_id = int(id_result[0][0])
+
+        for sheet_hash, index, row_count in self.sheets:
+            result = await db.save_ingest_ledger_sheet(
+                args=(sheet_hash, ledger_id, index, row_count)
+            )
+
+            if result == ERROR:
+                log.error("Failed to record sheet %d of %s",
+                          index, self.file_path)
+                return ERROR
+
+        return SUCCESS
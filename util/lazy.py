@@ -0,0 +1,47 @@
+import importlib
+import importlib.util
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    The real module's namespace is copied in once it is loaded, so
+    later lookups are plain attribute hits. Loading goes through
+    `importlib.import_module`, which serializes concurrent imports, so
+    the first access may come from any thread (e.g. the parse workers).
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__lock = threading.Lock()
+
+    def __getattr__(self, attr: str):
+        with self.__lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+
+        return getattr(module, attr)
+
+
+def lazy_import(name: str, optional: bool = False):
+    """
+    Returns a LazyModule for `name`, so heavy dependencies (numpy,
+    xlrd) only cost startup time in the code paths that use them.
+
+    With `optional`, a module that isn't installed returns None instead
+    of raising, like the `try: import X except ImportError: X = None`
+    pattern.
+
+    Modules imported this way must not be touched at import time:
+    annotate with them under `from __future__ import annotations`.
+    """
+    if importlib.util.find_spec(name) is None:
+        if optional:
+            return None
+
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    return LazyModule(name)
@@ -1,67 +1,241 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-import inspect
+import queue
+import sys
+import threading
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
 
-class CLogger:
+LOG_DIRECTORY = "logs"
+LOG_FILE_NAME = f"log_for_{str(date.today()).replace('-', '_')}.log"
+LOG_FORMAT = '[%(asctime)s] [%(levelname)s] [%(name)s:%(lineno)d] %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# .env keys read by `configure`.
+ENV_LEVEL = "LOG_LEVEL"              # default level, e.g. INFO
+ENV_MODULE_LEVELS = "LOG_LEVELS"     # e.g. util.async_db=DEBUG,ui=WARNING
+ENV_FORMAT = "LOG_FORMAT"            # text or json
+ENV_MAX_BYTES = "LOG_MAX_BYTES"      # rotate the log file past this size
+ENV_BACKUP_COUNT = "LOG_BACKUP_COUNT"
+
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+_configured = False
+_level = logging.INFO
+_module_levels = {}
+_listener = None
+_lock = threading.Lock()
+
+
+def _get_level(level_str: str) -> int:
+    return LEVELS.get(str(level_str).upper(), logging.INFO)
+
+
+def parse_module_levels(value: str) -> dict[str, int]:
     """
-        A robust wrapper around the Python logging module that:
-        - Logs to both console and file
-        - Automatically tags logs with caller file
-        - Supports configurable log levels
+    "util.async_db=DEBUG, ui=WARNING" -> {"util.async_db": 10, "ui": 30}
     """
+    levels = {}
 
-    LOG_DIRECTORY = "logs"
-    LOG_FILE_NAME = f"log_for_{str(date.today()).replace('-', '_')}.log"
-
-    def __init__(self, level: Optional[str] = "INFO"):
-        # Ensure log directory exists
-        os.makedirs(self.LOG_DIRECTORY, exist_ok=True)
-
-        # Determine caller for context-aware logging
-        caller_frame = inspect.stack()[1]
-        caller_file = os.path.basename(caller_frame.filename)
-        self.logger_name = caller_file
-
-        # Create logger instance
-        self.logger = logging.getLogger(self.logger_name)
-        self.logger.setLevel(self._get_level(level))
-
-        # Avoid adding duplicate handlers
-        if not self.logger.handlers:
-            self._add_handlers()
-
-    def _get_level(self, level_str: str) -> int:
-        return {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "WARN": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL,
-        }.get(level_str.upper(), logging.INFO)
-
-    def _add_handlers(self):
-        log_path = os.path.join(
-            self.LOG_DIRECTORY, self.LOG_FILE_NAME)
-
-        # Formatter
-        formatter = logging.Formatter(
-            '[%(asctime)s] [%(levelname)s] [%(name)s:%(lineno)d] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+    for item in str(value or "").split(","):
+        name, _, level = item.partition("=")
+
+        if name.strip() and level.strip():
+            levels[name.strip()] = _get_level(level.strip())
+
+    return levels
+
+
+def level_for(name: str) -> int:
+    """
+    Level of the longest `LOG_LEVELS` entry that `name` falls under
+    (the module itself or a parent package), else the default level.
+    """
+    while name:
+        if name in _module_levels:
+            return _module_levels[name]
+
+        name = name.rpartition(".")[0]
+
+    return _level
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, for log shippers.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+def stop_listener():
+    """
+    Writes out every queued record and stops the logging thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+
+        for handler in _listener.handlers:
+            handler.close()
+
+        _listener = None
+
+
+def configure(level: Optional[str] = None,
+              directory: str = LOG_DIRECTORY,
+              json_format: bool = None,
+              force: bool = False):
+    """
+    Sets up logging once for the whole application.
+
+    The root logger gets a single QueueHandler, so logging from the
+    event loop only puts the record on a queue. A QueueListener thread
+    does the console and file I/O. The file rotates by size.
+
+    Module loggers propagate to the root logger. Each one gets its level
+    from `LOG_LEVELS`, or from `level` / `LOG_LEVEL` if it has no entry
+    there. The root logger stays at WARNING, so third-party libraries
+    only report problems.
+
+    `get_logger` calls this the first time it runs. Call it earlier, or
+    with `force`, to override the .env settings.
+    """
+    global _configured, _level, _module_levels, _listener
+
+    with _lock:
+        if _configured and not force:
+            return
+
+        if load_dotenv is not None:
+            load_dotenv()
+
+        _level = _get_level(level or os.environ.get(ENV_LEVEL, "INFO"))
+        _module_levels = parse_module_levels(
+            os.environ.get(ENV_MODULE_LEVELS))
+
+        if json_format is None:
+            json_format = os.environ.get(ENV_FORMAT, "").lower() == "json"
+
+        root = logging.getLogger()
+
+        for handler in list(root.handlers):
+            if getattr(handler, "timesheet_handler", False):
+                root.removeHandler(handler)
+
+        stop_listener()
+
+        os.makedirs(directory, exist_ok=True)
+
+        if json_format:
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
 
-        # Console Handler
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(directory, LOG_FILE_NAME),
+            maxBytes=int(os.environ.get(ENV_MAX_BYTES, MAX_BYTES)),
+            backupCount=int(os.environ.get(ENV_BACKUP_COUNT, BACKUP_COUNT)),
+        )
+
+        for handler in (console_handler, file_handler):
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.timesheet_handler = True
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler,
+            respect_handler_level=True)
+        _listener.start()
+
+        if root.level == logging.NOTSET or root.level < logging.WARNING:
+            root.setLevel(logging.WARNING)
+
+        for logger in logging.Logger.manager.loggerDict.values():
+            if getattr(logger, "timesheet_logger", False):
+                logger.setLevel(level_for(logger.name))
+
+        _configured = True
+
+
+atexit.register(stop_listener)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a module, keyed on its `__name__`:
+
+        log = get_logger(__name__)
+
+    Pass large payloads as arguments, e.g. log.debug("rows: %s", rows),
+    so they are only formatted when the level is enabled.
+    """
+    if not _configured:
+        configure()
+
+    logger = logging.getLogger(name)
+
+    if not getattr(logger, "timesheet_logger", False):
+        logger.setLevel(level_for(name))
+        logger.timesheet_logger = True
+
+    return logger
+
+
+class CLogger:
+    """
+    Backwards-compatible wrapper around `get_logger` that names the
+    logger after the calling module.
+    """
+
+    LOG_DIRECTORY = LOG_DIRECTORY
+    LOG_FILE_NAME = LOG_FILE_NAME
+
+    def __init__(self, level: Optional[str] = None):
+        # Only the calling frame's module name is needed; inspect.stack()
+        # would also read the source of every frame on the stack.
+        self.logger_name = sys._getframe(1).f_globals.get("__name__", "root")
+        self.logger = get_logger(self.logger_name)
 
-        # File Handler
-        file_handler = logging.FileHandler(log_path)
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        if level is not None:
+            self.logger.setLevel(_get_level(level))
 
     def get_logger(self) -> logging.Logger:
         return self.logger
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from util.logger import LOG_DIRECTORY, get_logger
+
+log = get_logger(__name__)
+
+METRICS_FILE = os.path.join(LOG_DIRECTORY, "metrics.jsonl")
+
+SHEET_STAGES = ("parse", "normalize", "write")
+FILE_STAGES = ("read", *SHEET_STAGES)
+
+
+class CellCounter(threading.local):
+    """
+    Per-thread count of worksheet cells visited by `Parser.xls_parser`.
+    Sheets are parsed on worker threads, so each thread keeps its own.
+    """
+    value = 0
+
+    def add(self, cells: int):
+        self.value += cells
+
+
+cells_scanned = CellCounter()
+
+
+class SheetMetrics:
+    """
+    Timings and counts for one sheet of an ingested workbook.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.employee = ""
+        self.seconds = dict.fromkeys(SHEET_STAGES, 0.0)
+        self.cells_scanned = 0
+        self.rows_parsed = 0
+        self.rows_written = 0
+        self.error = None
+
+    def to_dict(self) -> dict:
+        return {
+            "sheet": self.index,
+            "employee": self.employee,
+            "seconds": {k: round(v, 6) for k, v in self.seconds.items()},
+            "cells_scanned": self.cells_scanned,
+            "rows_parsed": self.rows_parsed,
+            "rows_written": self.rows_written,
+            "error": self.error,
+        }
+
+
+class FileMetrics:
+    """
+    Per-stage wall time, cells scanned, rows written and commits for
+    one workbook, plus the metrics of each of its sheets.
+
+    Stage seconds are the time spent on this file's work in each stage.
+    Stages overlap across files in the pipeline, so they can add up to
+    more than `seconds`, the file's wall time.
+    """
+
+    def __init__(self, file_path: str):
+        self.file = str(file_path)
+        self.status = "pending"
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.stage_seconds = dict.fromkeys(FILE_STAGES, 0.0)
+        self.commits = 0
+        self.sheets = []
+
+    def sheet(self, index: int) -> SheetMetrics:
+        metrics = SheetMetrics(index)
+        self.sheets.append(metrics)
+        return metrics
+
+    def add(self, stage: str, seconds: float):
+        self.stage_seconds[stage] += seconds
+
+    @property
+    def cells_scanned(self) -> int:
+        return sum(s.cells_scanned for s in self.sheets)
+
+    @property
+    def rows_written(self) -> int:
+        return sum(s.rows_written for s in self.sheets)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def finish(self, status: str):
+        self.status = status
+        self.seconds = time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """
+        One line for the status bar / summary panel.
+        """
+        stages = " · ".join(
+            f"{stage} {seconds:.3f}s"
+            for stage, seconds in self.stage_seconds.items())
+
+        return (f"{os.path.basename(self.file)}: {len(self.sheets)} sheet(s), "
+                f"{self.rows_written} row(s) in {self.seconds:.3f}s "
+                f"({self.rows_per_second:.0f} rows/s) | {stages} | "
+                f"{self.commits} commit(s), {self.cells_scanned} cells")
+
+    def to_dict(self) -> dict:
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "file": self.file,
+            "status": self.status,
+            "seconds": round(self.seconds, 6),
+            "stages": {k: round(v, 6) for k, v in self.stage_seconds.items()},
+            "cells_scanned": self.cells_scanned,
+            "rows_written": self.rows_written,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "commits": self.commits,
+            "sheets": [s.to_dict() for s in self.sheets],
+        }
+
+
+def save_metrics(metrics: FileMetrics, path: str = None):
+    """
+    Appends one JSON line for a finished file to `path`
+    (logs/metrics.jsonl by default). Blocking; run it in a thread from
+    async code.
+    """
+    path = path or METRICS_FILE
+
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with open(path, "a") as f:
+            f.write(json.dumps(metrics.to_dict()) + "\n")
+
+    except OSError as e:
+        log.warning("Could not write ingest metrics to %s: %s", path, e)
@@ -0,0 +1,211 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+# Query tokens must be at least this similar to a name token to match.
+MIN_SIMILARITY = 0.3
+PREFIX_SIMILARITY = 0.9
+
+
+def tokenize(text: str) -> list[str]:
+    return re.sub(r"[^0-9a-z]+", " ", str(text).lower()).split()
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    In-memory fuzzy index over names, e.g. employees or combo items.
+
+    Names are split into tokens and each distinct token is indexed by
+    its trigrams and kept in a sorted list for prefix lookups. A query
+    token is compared to the indexed tokens sharing a trigram with it,
+    never to every name, so lookups stay fast for large indexes.
+
+    Each query token scores 1.0 for an exact token, 0.9 for a prefix
+    and its trigram similarity otherwise, which tolerates typos. A
+    name's score is the sum of its best score per query token, so
+    word order ("Doe John") does not matter.
+    """
+
+    def __init__(self, names=(), group: str = None):
+        self.clear()
+
+        for name in names:
+            self.add(name, group)
+
+    def clear(self):
+        self.names = []
+        self.groups = []
+        self.positions = {}
+
+        self.tokens = []
+        self.token_ids = {}
+        self.token_trigrams = []
+        self.token_names = []
+        self.trigram_tokens = defaultdict(list)
+        self.sorted_tokens = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+
+    def add(self, name: str, group: str = None) -> bool:
+        """
+        Indexes `name`. Returns False if it was already indexed; its
+        group is updated either way.
+        """
+        name = " ".join(str(name).split())
+
+        if name in self.positions:
+            self.groups[self.positions[name]] = group
+            return False
+
+        position = len(self.names)
+        self.names.append(name)
+        self.groups.append(group)
+        self.positions[name] = position
+
+        for token in set(tokenize(name)):
+            self.token_names[self.__token_id(token)].append(position)
+
+        return True
+
+    def __token_id(self, token: str) -> int:
+        token_id = self.token_ids.get(token)
+
+        if token_id is not None:
+            return token_id
+
+        token_id = len(self.tokens)
+        self.tokens.append(token)
+        self.token_ids[token] = token_id
+        self.token_names.append([])
+
+        grams = trigrams(token)
+        self.token_trigrams.append(len(grams))
+
+        for gram in grams:
+            self.trigram_tokens[gram].append(token_id)
+
+        self.sorted_tokens.insert(
+            bisect_left(self.sorted_tokens, token), token)
+
+        return token_id
+
+    def __similar_tokens(self, token: str) -> dict[int, float]:
+        grams = trigrams(token)
+        shared = defaultdict(int)
+
+        for gram in grams:
+            for token_id in self.trigram_tokens.get(gram, ()):
+                shared[token_id] += 1
+
+        similar = {}
+
+        for token_id, count in shared.items():
+            score = count / (len(grams) + self.token_trigrams[token_id] - count)
+
+            if score >= MIN_SIMILARITY:
+                similar[token_id] = score
+
+        i = bisect_left(self.sorted_tokens, token)
+
+        while i < len(self.sorted_tokens) and \
+                self.sorted_tokens[i].startswith(token):
+            token_id = self.token_ids[self.sorted_tokens[i]]
+            exact = self.sorted_tokens[i] == token
+            similar[token_id] = 1.0 if exact else max(
+                PREFIX_SIMILARITY, similar.get(token_id, 0.0))
+            i += 1
+
+        return similar
+
+    def search(self, query: str, limit: int = 10,
+               group: str = None) -> list[str]:
+        """
+        Names best matching `query`, best first. With `group`, only
+        names indexed under that group are returned. An empty query
+        returns the first `limit` names.
+        """
+        query_tokens = tokenize(query)
+
+        if not query_tokens:
+            return [
+                name for name, g in zip(self.names, self.groups)
+                if group is None or g == group
+            ][:limit]
+
+        scores = defaultdict(float)
+
+        # Longest tokens first: an initial like "j" matches a large
+        # share of all names, so short tokens only re-rank the names
+        # the longer ones already found.
+        for token in sorted(dict.fromkeys(query_tokens), key=len, reverse=True):
+            narrow = len(token) == 1 and scores
+            best = {}
+
+            for token_id, score in self.__similar_tokens(token).items():
+                for position in self.token_names[token_id]:
+                    if narrow and position not in scores:
+                        continue
+
+                    if score > best.get(position, 0.0):
+                        best[position] = score
+
+            for position, score in best.items():
+                scores[position] += score
+
+        if group is not None:
+            scores = {
+                p: s for p, s in scores.items() if self.groups[p] == group
+            }
+
+        ranked = heapq.nsmallest(
+            limit, scores.items(),
+            key=lambda item: (-item[1], self.names[item[0]]))
+
+        return [self.names[position] for position, _ in ranked]
+
+
+employee_index = NameIndex()
+
+
+async def load_employee_index(db: AsyncDBInterface = None) -> NameIndex:
+    """
+    Rebuilds `employee_index` in place from the Employee table.
+    """
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await load_employee_index(db=db)
+
+    rows = await db._read_employee_names()
+
+    if rows == ERROR:
+        log.warning("Could not load employee names for search")
+        return employee_index
+
+    employee_index.clear()
+
+    for first, middle, last, group in rows:
+        employee_index.add(
+            " ".join(filter(None, (first, middle, last))), group)
+
+    log.info("Indexed %d employee names", len(employee_index))
+
+    return employee_index
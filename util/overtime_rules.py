@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from functools import cached_property
+from uuid import uuid4
+
+from structs.records import OvertimeRule
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.lazy import lazy_import
+from util.logger import get_logger
+
+np = lazy_import("numpy")
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+# OvertimeRule row that replaces the company-wide default.
+DEFAULT_GROUP = "*"
+
+ENV_KEYS = OvertimeRule(
+    daily_threshold="OT_DAILY_THRESHOLD",
+    weekly_threshold="OT_WEEKLY_THRESHOLD",
+    period_threshold="OT_PERIOD_THRESHOLD",
+    weekend_multiplier="OT_WEEKEND_MULTIPLIER",
+)
+
+
+def parse_threshold(value) -> float:
+    """
+    Config value to float; blank, "none" and "off" disable the check.
+    """
+    if value is None or str(value).strip().lower() in ("", "none", "off"):
+        return None
+
+    return float(value)
+
+
+class RuleSet:
+    """
+    A company-wide OvertimeRule plus per-EmployeeGroup overrides.
+
+    `apply` evaluates every rule for a whole (rows x 14 days) hours
+    matrix at once: each row's thresholds are gathered into columns
+    and the rules become mask/where operations over the matrix, so a
+    changed rule recomputes the company in one pass.
+
+    For each row, in order:
+        - weekday hours over the daily threshold are overtime
+        - the remaining hours of a week over the weekly threshold are
+          overtime, from the day the threshold is crossed
+        - remaining weekend hours earn `weekend_multiplier` overtime
+        - nothing counts until the period reaches the period threshold
+    """
+
+    def __init__(self, default: OvertimeRule = OvertimeRule(),
+                 overrides: dict[str, OvertimeRule] = None):
+        self.default = default
+        self.overrides = dict(overrides or {})
+
+    @classmethod
+    def from_env(cls) -> "RuleSet":
+        defaults = OvertimeRule()
+        values = [
+            parse_threshold(os.environ.get(key, default))
+            for key, default in zip(ENV_KEYS, defaults)
+        ]
+        values[3] = values[3] or 0.0
+
+        return cls(default=OvertimeRule(*values))
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple], base: "RuleSet" = None) -> "RuleSet":
+        """
+        Applies `_read_overtime_rules` rows on top of `base`.
+        """
+        base = base or cls.from_env()
+        default = base.default
+        overrides = dict(base.overrides)
+
+        for group, *values in rows:
+            values[3] = values[3] or 0.0
+            rule = OvertimeRule(*values)
+
+            if group == DEFAULT_GROUP:
+                default = rule
+            else:
+                overrides[group] = rule
+
+        return cls(default=default, overrides=overrides)
+
+    @cached_property
+    def version(self) -> str:
+        """
+        Short digest of every rule; changes whenever any rule does.
+        """
+        content = repr((self.default, sorted(self.overrides.items())))
+        return hashlib.sha1(content.encode()).hexdigest()[:12]
+
+    def rule_for(self, group: str) -> OvertimeRule:
+        return self.overrides.get(group, self.default)
+
+    def parameters(self, groups: list[str]) -> np.ndarray:
+        """
+        (rows x 4) array of daily, weekly and period thresholds and the
+        weekend multiplier for each row's group. Disabled daily and
+        weekly thresholds become infinity, a disabled period one zero.
+        """
+        names, index = np.unique(
+            np.array([str(g or "") for g in groups], dtype=object),
+            return_inverse=True)
+
+        table = np.array([
+            (
+                np.inf if rule.daily_threshold is None else rule.daily_threshold,
+                np.inf if rule.weekly_threshold is None else rule.weekly_threshold,
+                0.0 if rule.period_threshold is None else rule.period_threshold,
+                rule.weekend_multiplier,
+            )
+            for rule in map(self.rule_for, names)
+        ], dtype=float).reshape(-1, 4)
+
+        return table[index]
+
+    def apply(self, hours: np.ndarray, weekday: np.ndarray,
+              logged: np.ndarray, groups: list[str] = None) -> np.ndarray:
+        """
+        Daily overtime for every cell of a (rows x 14) hours matrix.
+        1-D inputs are treated as a single row.
+        """
+        shape = hours.shape
+        hours = np.atleast_2d(hours)
+        weekday = np.broadcast_to(np.atleast_2d(weekday), hours.shape)
+        logged = np.broadcast_to(np.atleast_2d(logged), hours.shape)
+
+        if groups is None:
+            groups = [""] * len(hours)
+
+        daily, weekly, period, multiplier = \
+            self.parameters(groups).T[:, :, None]
+
+        worked = np.where(logged, hours, 0.0)
+
+        daily_ot = np.where(
+            weekday & logged, np.maximum(worked - daily, 0.0), 0.0)
+
+        straight = (worked - daily_ot).reshape(len(hours), 2, 7)
+        excess = np.maximum(
+            straight.cumsum(axis=2) - weekly[:, :, None], 0.0)
+        weekly_ot = np.diff(excess, axis=2, prepend=0.0).reshape(hours.shape)
+
+        weekend_ot = np.where(
+            ~weekday & logged, (worked - weekly_ot) * multiplier, 0.0)
+
+        eligible = worked.sum(axis=1, keepdims=True) >= period
+        overtime = np.where(eligible, daily_ot + weekly_ot + weekend_ot, 0.0)
+
+        return overtime.reshape(shape)
+
+
+class OvertimeCache:
+    """
+    Daily overtime rows keyed by (rule-set version, PayPeriodID), all
+    valid for one data version of the database.
+
+    Every write to WorkEntry stores a new DataVersion token in Meta
+    (see `record_data_change`). The first lookup under another token
+    drops every row, so changes made by another process (e.g. a CLI
+    reconcile while the UI is open) are never served stale, and a hit
+    is a single dictionary lookup. Rows computed under an older rule
+    set are never returned.
+
+    A writer in this process knows which pay periods it changed, so it
+    calls `invalidate` with them and its new token instead, and the
+    rest of the cache stays valid.
+    """
+
+    def __init__(self, max_size: int = 50_000):
+        self.max_size = max_size
+        self.rows = OrderedDict()
+        self.data_version = None
+        self.rule_versions = set()
+
+    def compute(self, rules: RuleSet, data_version: str, pay_period_ids: list,
+                hours: np.ndarray, weekday: np.ndarray,
+                logged: np.ndarray, groups: list[str]) -> np.ndarray:
+        """
+        Like `RuleSet.apply`, but only rows missing from the cache are
+        computed, in one batch. `data_version` is the token the hours
+        were read under. Rows without a PayPeriodID are never cached.
+        """
+        if data_version != self.data_version:
+            self.clear()
+            self.data_version = data_version
+
+        if not len(pay_period_ids):
+            return np.zeros(hours.shape)
+
+        rows = [self.rows.get((rules.version, pay_period_id))
+                for pay_period_id in pay_period_ids]
+        missing = [i for i, row in enumerate(rows) if row is None]
+
+        if missing:
+            computed = rules.apply(
+                hours[missing], weekday[missing], logged[missing],
+                [groups[i] for i in missing])
+
+            self.rule_versions.add(rules.version)
+
+            for i, row in zip(missing, computed):
+                rows[i] = row
+
+                if pay_period_ids[i] is not None:
+                    self.rows[(rules.version, pay_period_ids[i])] = row
+
+            while len(self.rows) > self.max_size:
+                self.rows.popitem(last=False)
+
+        # One copy of every row; far cheaper than assigning row by row.
+        return np.concatenate(rows).reshape(hours.shape)
+
+    def invalidate(self, pay_period_ids, previous: str = None,
+                   data_version: str = None):
+        """
+        Drops the rows of `pay_period_ids`. Given the `previous` and new
+        `data_version` of a write, the other rows move to the new token
+        if they were still current, and are dropped otherwise.
+        """
+        for pay_period_id in set(pay_period_ids):
+            for version in self.rule_versions:
+                self.rows.pop((version, pay_period_id), None)
+
+        if data_version is None:
+            return
+
+        if previous != self.data_version:
+            self.clear()
+
+        self.data_version = data_version
+
+    def clear(self):
+        self.rows.clear()
+        self.rule_versions.clear()
+
+
+overtime_cache = OvertimeCache()
+
+_active_rules = None
+
+
+def get_rules() -> RuleSet:
+    """
+    The rule set loaded by the last `load_rules` call, or the .env
+    defaults if rules were never loaded from the database.
+    """
+    global _active_rules
+
+    if _active_rules is None:
+        _active_rules = RuleSet.from_env()
+
+    return _active_rules
+
+
+async def load_rules(db: AsyncDBInterface = None) -> RuleSet:
+    """
+    Reads the OvertimeRule table over the .env defaults and makes the
+    result the active rule set.
+    """
+    global _active_rules
+
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await load_rules(db=db)
+
+    rows = await db._read_overtime_rules()
+
+    if rows == ERROR:
+        log.warning("Could not read overtime rules; using .env defaults")
+        rows = []
+
+    previous = _active_rules
+    _active_rules = RuleSet.from_rows(rows)
+
+    if previous is not None and previous.version != _active_rules.version:
+        # Frees the rows computed under the old rules.
+        overtime_cache.clear()
+
+    log.info("Loaded overtime rules %s (%d group override(s))",
+             _active_rules.version, len(_active_rules.overrides))
+
+    return _active_rules
+
+
+async def read_data_version(db: AsyncDBInterface) -> str:
+    """
+    The database's DataVersion token, or None if it has none (nothing
+    is cached then).
+    """
+    rows = await db._read_data_version()
+
+    if rows == ERROR or not rows:
+        return None
+
+    return rows[0][0]
+
+
+async def record_data_change(db: AsyncDBInterface, pay_period_ids) -> str:
+    """
+    Gives the database a new DataVersion for work entry changes made in
+    `db`'s open transaction, and drops the cached overtime of
+    `pay_period_ids`. Returns the new token.
+    """
+    previous = await read_data_version(db)
+    data_version = uuid4().hex[:16]
+
+    if await db.save_data_version(args=(data_version,)) == ERROR:
+        raise Exception("Failed to save the data version.")
+
+    overtime_cache.invalidate(pay_period_ids, previous, data_version)
+
+    return data_version
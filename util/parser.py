@@ -1,5 +1,12 @@
+from __future__ import annotations
+
 import re
 
+from util.lazy import lazy_import
+from util.metrics import cells_scanned
+
+np = lazy_import("numpy")
+
 
 class Parser:
     '''
@@ -10,22 +17,32 @@ class Parser:
         time clock.
     '''
 
-    def hrs_formatter(arr, BUILD):
-        if arr == "":
-            return 0
+    def hrs_to_array(values, round_to: float = None) -> np.ndarray:
+        """
+        Converts a column of "H:MM" strings into hours as a float array.
+
+        Empty cells become 0, minutes are converted as minutes / 60 and,
+        if `round_to` is given (e.g. 0.25), totals are rounded to the
+        nearest multiple of it.
+        """
+        arr = np.char.strip(np.asarray(values, dtype=str))
+
+        if arr.size == 0:
+            return np.zeros(0, dtype=np.float64)
+
+        negative = np.char.startswith(arr, "-")
+        parts = np.char.partition(np.char.lstrip(arr, "-"), ":")
+
+        hours = np.where(parts[..., 0] == "", "0", parts[..., 0])
+        minutes = np.where(parts[..., 2] == "", "0", parts[..., 2])
 
-        else:
-            arr = arr.split(":")
-            stack = [float(i) for i in arr]
+        result = hours.astype(np.float64) + minutes.astype(np.float64) / 60.0
+        result = np.where(negative, -result, result)
 
-            if stack[1] == 15:
-                stack[1] = .25
-            elif stack[1] == 30:
-                stack[1] = .50
-            elif stack[1] == 45:
-                stack[1] = .75
+        if round_to:
+            result = np.round(result / round_to) * round_to
 
-            return stack[0] + stack[1]
+        return result
 
     def xls_parser(sheet,
                    mincolx, minrowy,
@@ -33,6 +50,8 @@ class Parser:
                    target, xbuff, ybuff,
                    BUILD) -> []:
         answer = []
+        cells_scanned.add(
+            max(maxrowy - minrowy, 0) * max(maxcolx - mincolx, 0))
 
         for row in range(minrowy, maxrowy):
             for col in range(mincolx, maxcolx):
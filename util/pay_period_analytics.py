@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from functools import cached_property
+
+from util.analytics import PAY_PERIOD_DAYS, daily_overtime
+from util.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class PayPeriodAnalytics:
+    """
+    Hour totals for one pay period, computed from a single array.
+
+    The 14-day calendar, its weekday flags and the per-day hours are
+    built once and every total is a cached property over them, so
+    asking for weekday hours, weekend hours and overtime never parses
+    the report or rebuilds the calendar again.
+    """
+
+    def __init__(self, start_date: date, entries: dict[date, float],
+                 group: str = None):
+        self.start_date = start_date
+        self.entries = entries
+        self.group = group
+
+    @cached_property
+    def calendar(self) -> tuple[date, ...]:
+        return tuple(
+            self.start_date + timedelta(days=i) for i in range(PAY_PERIOD_DAYS)
+        )
+
+    @cached_property
+    def weekday_mask(self) -> np.ndarray:
+        return np.array([d.weekday() < 5 for d in self.calendar])
+
+    @cached_property
+    def logged_mask(self) -> np.ndarray:
+        return np.array([d in self.entries for d in self.calendar])
+
+    @cached_property
+    def hours(self) -> np.ndarray:
+        """
+        Hours per calendar day; days without an entry hold 0.
+        """
+        return np.array(
+            [self.entries.get(d, 0.0) for d in self.calendar], dtype=float)
+
+    @cached_property
+    def total(self) -> float:
+        return float(sum(self.entries.values()))
+
+    @cached_property
+    def weekly_totals(self) -> tuple[float, float]:
+        week1, week2 = self.hours.reshape(2, 7).sum(axis=1)
+        return float(week1), float(week2)
+
+    @cached_property
+    def weekday_hours(self) -> dict[date, float]:
+        return self.__select(self.logged_mask & self.weekday_mask, self.hours)
+
+    @cached_property
+    def weekend_hours(self) -> dict[date, float]:
+        return self.__select(self.logged_mask & ~self.weekday_mask, self.hours)
+
+    @cached_property
+    def overtime(self) -> dict[date, float]:
+        """
+        Overtime per day under the active rule set for this group.
+        """
+        overtime = daily_overtime(
+            self.hours, self.weekday_mask, self.logged_mask, [self.group])
+        return self.__select(overtime > 0, overtime)
+
+    def __select(self, mask: np.ndarray, values: np.ndarray) -> dict[date, float]:
+        return {
+            self.calendar[i]: float(values[i]) for i in np.flatnonzero(mask)
+        }
@@ -1,8 +1,8 @@
 from structs.result import Result
 from util.async_db import AsyncDBInterface
-from util.logger import CLogger
+from util.logger import get_logger
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -10,42 +10,27 @@ SUCCESS = Result.SUCCESS
 
 class PayPeriodManager:
     async def get_pay_period_dates(self) -> list[str]:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             dates = await db._read_pay_period_dates()
 
             if dates == ERROR:
-                raise RuntimeError(
-                    f"Failed to find dates for {dates}")
+                raise RuntimeError("Failed to find pay period dates")
 
         return [d[0] for d in dates]
 
     async def get_employee_names_by_date(self, date: str) -> list[str]:
-        async with AsyncDBInterface() as db:
-            pp_ids = await db._read_pay_period_id_by_date(args=date)
+        async with AsyncDBInterface(read_only=True) as db:
+            names = await db._read_employee_names_by_date(args=(date,))
 
-            if pp_ids == ERROR:
+            if names == ERROR:
                 raise RuntimeError(
-                    f"Failed to find employee ID for {pp_ids}")
-
-            names = []
-
-            for pp_id in pp_ids:
-                emp_ids = await db._read_employee_ids(args=pp_id)
-
-                for emp_id in emp_ids:
-                    name_tuple = db._read_employee_name(args=emp_id)
-
-                    if name_tuple == ERROR:
-                        raise RuntimeError(
-                            f"Failed to find employee ID for {pp_ids}")
-
-                    full_name = " ".join(" ".join(name_tuple).split())
-                    names.append(full_name)
+                    f"Failed to find employee names for {date}")
 
-        return names
+        return [" ".join(" ".join(filter(None, name)).split())
+                for name in names]
 
     async def get_employee_id(self, full_name: tuple) -> int:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_employee_id(args=full_name)
 
             if result == ERROR or not result:
@@ -55,7 +40,7 @@ class PayPeriodManager:
         return result[0][0]
 
     async def get_pay_period_id(self, emp_id: int, date: str) -> int:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_pay_period_id(args=(emp_id, date))
 
             if result == ERROR or not result:
@@ -64,7 +49,7 @@ class PayPeriodManager:
         return result[0][0]
 
     async def get_work_entries(self, pp_id: int) -> list[tuple[str, float]]:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_work_entries(args=(pp_id,))
 
             if result == ERROR:
@@ -74,7 +59,7 @@ class PayPeriodManager:
         return result
 
     async def get_default_date(self) -> str:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._default_date()
 
             if result == ERROR or not result:
@@ -84,7 +69,7 @@ class PayPeriodManager:
         return result[0][0]
 
     async def get_default_employee(self) -> str:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._default_employee()
 
             if result == ERROR or not result:
@@ -96,7 +81,7 @@ class PayPeriodManager:
     # 🔒 Private helpers
 
     async def _get_pay_period_ids_by_date(self, date: str) -> list[int]:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_pay_period_ids(args=(date,))
 
             if result == ERROR or not result:
@@ -105,7 +90,7 @@ class PayPeriodManager:
         return [pp_id[0] for pp_id in result]
 
     async def _get_employee_ids_by_pp(self, pp_id: int) -> list[int]:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_employee_ids(args=(pp_id,))
 
             if result == ERROR or not result:
@@ -115,7 +100,7 @@ class PayPeriodManager:
         return [eid[0] for eid in result]
 
     async def _get_employee_name_by_id(self, emp_id: int) -> tuple[str, str, str]:
-        async with AsyncDBInterface() as db:
+        async with AsyncDBInterface(read_only=True) as db:
             result = await db._read_employee_name(args=(emp_id,))
 
             if result == ERROR or not result:
@@ -0,0 +1,565 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.ingest_ledger import IngestLedger, sheet_digest
+from util.lazy import lazy_import
+from util.logger import get_logger
+from util.metrics import FileMetrics, save_metrics
+from util.name_index import employee_index
+from util.overtime_rules import load_rules, record_data_change
+from util.reconciler import (
+    CHANGE_KINDS, diff_work_entries, reconcile_work_entries
+)
+from util.summaries import refresh_summaries
+from util.work_entry_worker import WorkEntryWorker
+
+xlrd = lazy_import("xlrd")
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+STAGES = ("read", "parse", "normalize", "write")
+
+# Queue sentinel telling a stage to shut down.
+STOP = object()
+
+
+def load_workbook(file_path: str):
+    """
+    Opens a workbook and hashes every sheet. Blocking; run it in a thread.
+    """
+    workbook = xlrd.open_workbook(file_path)
+    sheet_hashes = [
+        sheet_digest(workbook.sheet_by_index(i))
+        for i in range(workbook.nsheets)
+    ]
+    return workbook, sheet_hashes
+
+
+class FileJob:
+    """
+    Book-keeping for one workbook as its sheets move through the pipeline.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.ledger = None
+        self.sheet_count = 0
+        self.remaining = 0
+        self.errors = 0
+        # Sheets whose hours differ from the stored ones; see __find_conflicts
+        self.conflicts = 0
+        self.status = "pending"
+        self.started = time.perf_counter()
+        self.changes = dict.fromkeys(CHANGE_KINDS, 0)
+        self.stats = {}
+        self.metrics = FileMetrics(file_path)
+
+    async def finish(self, status: str):
+        self.status = status
+        self.metrics.finish(status)
+        # File I/O stays off the event loop.
+        await asyncio.to_thread(save_metrics, self.metrics)
+        sheets_ingested = len(self.ledger.sheets) if self.ledger else 0
+        rows = self.ledger.row_count if self.ledger else 0
+
+        self.stats = {
+            "file": self.file_path,
+            "status": status,
+            "sheets": self.sheet_count,
+            "sheets_ingested": sheets_ingested,
+            "rows": rows,
+            "seconds": time.perf_counter() - self.started,
+            "changes": self.changes,
+        }
+
+
+class SheetTask:
+    """
+    One sheet travelling through the stages. A task with no `index`
+    only asks the writer to finalize its file.
+    """
+
+    def __init__(self, job: FileJob, index: int = None,
+                 sheet_hash: str = None, sheet=None):
+        self.job = job
+        self.index = index
+        self.sheet_hash = sheet_hash
+        self.sheet = sheet
+        self.parsed = None
+        self.worker = None
+        self.error = None
+        self.metrics = job.metrics.sheet(index) if index is not None else None
+
+
+class IngestPipeline:
+    """
+    Staged producer/consumer ingest:
+
+        read workbooks -> parse sheets -> normalize entries -> write
+
+    Stages are connected by bounded queues, so a slow writer applies
+    backpressure all the way to the reader and memory stays flat no
+    matter how many files are queued. Sheet parsing runs on a thread
+    pool while a single writer batches several sheets into each
+    transaction on one connection, so parsing and writing overlap.
+
+    `timings` holds busy seconds and item counts for every stage, and
+    `metrics` the per-file and per-sheet breakdown (see util.metrics).
+
+    Each batch also refreshes PayPeriodSummary for the pay periods it
+    touched, in the same transaction. If a batch fails, its sheets are
+    retried one per transaction, so only the bad sheet is reported.
+
+    With `reconcile`, the writer diffs each batch's parsed entries
+    against the stored ones and applies only the changes, so corrected
+    reports overwrite hours that INSERT OR IGNORE would keep. Reconcile
+    reads every sheet, even those the ingest ledger already has.
+
+    Without it, a sheet whose hours differ from the stored ones is a
+    conflict: it is left out of the ledger and its file finishes as
+    "conflict" instead of being recorded as ingested.
+    """
+
+    def __init__(self,
+                 processor,
+                 BUILD: str = "DEBUG",
+                 force: bool = False,
+                 reconcile: bool = False,
+                 workers: int = 2,
+                 queue_size: int = 8,
+                 batch_size: int = 16):
+        self.processor = processor
+        self.BUILD = BUILD
+        self.force = force
+        self.reconcile = reconcile
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+
+        self.parse_queue = asyncio.Queue(maxsize=queue_size)
+        self.normalize_queue = asyncio.Queue(maxsize=queue_size)
+        self.write_queue = asyncio.Queue(maxsize=queue_size)
+
+        self.timings = {
+            stage: {"seconds": 0.0, "items": 0} for stage in STAGES
+        }
+        self.metrics = []
+
+    async def run(self, files: list[str]) -> list[dict]:
+        jobs = [FileJob(f) for f in files]
+        self.metrics = [job.metrics for job in jobs]
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        parsers = [
+            asyncio.create_task(self.__parse(executor))
+            for _ in range(self.workers)
+        ]
+        normalizer = asyncio.create_task(self.__normalize())
+        writer = asyncio.create_task(self.__write())
+
+        try:
+            await self.__read(jobs)
+
+            for _ in parsers:
+                await self.parse_queue.put(STOP)
+
+            await asyncio.gather(*parsers)
+            await self.normalize_queue.put(STOP)
+            await normalizer
+            await writer
+
+            for job in jobs:
+                if job.status == "pending":
+                    await job.finish("error")
+
+        finally:
+            for task in (*parsers, normalizer, writer):
+                task.cancel()
+
+            executor.shutdown(wait=False)
+
+        return [job.stats for job in jobs]
+
+    def __tick(self, stage: str, started: float, items: int = 1):
+        self.timings[stage]["seconds"] += time.perf_counter() - started
+        self.timings[stage]["items"] += items
+
+    def __record(self, task: SheetTask, stage: str, started: float):
+        """
+        Adds a sheet's time in `stage` to its metrics, its file's
+        metrics and the pipeline timings.
+        """
+        seconds = time.perf_counter() - started
+        task.metrics.seconds[stage] += seconds
+        task.job.metrics.add(stage, seconds)
+
+        if task.error is not None and task.metrics.error is None:
+            task.metrics.error = f"{type(task.error).__name__}: {task.error}"
+
+        self.__tick(stage, started)
+
+    async def __read(self, jobs: list[FileJob]):
+        for job in jobs:
+            started = time.perf_counter()
+
+            try:
+                job.ledger = await asyncio.to_thread(
+                    IngestLedger, job.file_path)
+
+                # Reconcile compares against the stored rows, so it
+                # never trusts the ledger to skip anything.
+                use_ledger = not (self.force or self.reconcile)
+
+                if use_ledger and await job.ledger.is_ingested():
+                    log.info("Skipping %s: already ingested", job.file_path)
+                    job.metrics.add("read", time.perf_counter() - started)
+                    await job.finish("skipped")
+                    continue
+
+                workbook, sheet_hashes = await asyncio.to_thread(
+                    load_workbook, job.file_path)
+
+                known = set()
+                if use_ledger:
+                    known = await job.ledger.known_sheets(sheet_hashes)
+
+                pending = [
+                    i for i, sheet_hash in enumerate(sheet_hashes)
+                    if sheet_hash not in known
+                ]
+
+                job.sheet_count = workbook.nsheets
+                job.remaining = len(pending)
+
+            except Exception as e:
+                log.error("Failed to read %s: %s | %s",
+                          job.file_path, type(e).__name__, e.args)
+                await job.finish("error")
+                continue
+
+            job.metrics.add("read", time.perf_counter() - started)
+            self.__tick("read", started)
+
+            if not pending:
+                await self.write_queue.put(SheetTask(job))
+                continue
+
+            for i in pending:
+                await self.parse_queue.put(SheetTask(
+                    job, i, sheet_hashes[i], workbook.sheet_by_index(i)))
+
+    async def __parse(self, executor: ThreadPoolExecutor):
+        loop = asyncio.get_running_loop()
+
+        while (task := await self.parse_queue.get()) is not STOP:
+            started = time.perf_counter()
+
+            try:
+                task.parsed = await loop.run_in_executor(
+                    executor, self.processor.parse_sheet,
+                    task.sheet, self.BUILD)
+
+                task.metrics.employee = task.parsed.name.full_name
+                task.metrics.cells_scanned = task.parsed.cells_scanned
+                task.metrics.rows_parsed = len(task.parsed.rows)
+
+            except Exception as e:
+                task.error = e
+                log.error("Failed to parse sheet %d of %s: %s | %s",
+                          task.index, task.job.file_path,
+                          type(e).__name__, e.args)
+
+            # The raw sheet is no longer needed once parsed.
+            task.sheet = None
+            self.__record(task, "parse", started)
+
+            await self.normalize_queue.put(task)
+
+    async def __normalize(self):
+        while (task := await self.normalize_queue.get()) is not STOP:
+            started = time.perf_counter()
+
+            if task.error is None:
+                try:
+                    task.worker = WorkEntryWorker(
+                        pay_period_id=None,
+                        report=task.parsed.rows,
+                        start_date=task.parsed.start_date,
+                        build=self.BUILD,
+                        group=task.parsed.group,
+                    )
+                    task.worker.normalize()
+
+                except Exception as e:
+                    task.error = e
+                    log.error("Failed to normalize sheet %d of %s: %s | %s",
+                              task.index, task.job.file_path,
+                              type(e).__name__, e.args)
+
+            self.__record(task, "normalize", started)
+
+            await self.write_queue.put(task)
+
+        await self.write_queue.put(STOP)
+
+    async def __write(self):
+        stopping = False
+
+        try:
+            async with AsyncDBInterface.writer() as db:
+                await load_rules(db)
+
+                while not stopping:
+                    batch = [await self.write_queue.get()]
+
+                    while len(batch) < self.batch_size \
+                            and not self.write_queue.empty():
+                        batch.append(self.write_queue.get_nowait())
+
+                    if batch[-1] is STOP:
+                        stopping = True
+                        batch.pop()
+
+                    if batch:
+                        await self.__write_batch(db, batch)
+
+        except Exception as e:
+            log.error("Writer stopped: %s | %s", type(e).__name__, e.args)
+
+            # Keep consuming so upstream stages never block on a full queue.
+            while not stopping:
+                task = await self.write_queue.get()
+                stopping = task is STOP
+
+    async def __write_batch(self, db: AsyncDBInterface, batch: list):
+        started = time.perf_counter()
+        sheets = [t for t in batch if t.index is not None and t.error is None]
+
+        try:
+            applied = [(sheets, await self.__apply(db, sheets))]
+
+        except Exception as e:
+            if len(sheets) == 1:
+                self.__fail(sheets[0], e)
+                applied = []
+
+            else:
+                # Find the bad sheet(s) so the rest of the batch,
+                # often from other files, is still written.
+                log.warning("Batch of %d sheets failed (%s); retrying "
+                            "one sheet at a time", len(sheets), e)
+                applied = []
+
+                for task in sheets:
+                    try:
+                        applied.append(([task], await self.__apply(db, [task])))
+
+                    except Exception as sheet_error:
+                        self.__fail(task, sheet_error)
+
+        for tasks, (conflicts, changes) in applied:
+            for job, summary in changes.items():
+                for kind, count in summary.items():
+                    job.changes[kind] += count
+
+            for task in tasks:
+                if task in conflicts:
+                    task.job.conflicts += 1
+                    task.metrics.rows_written = 0
+                    continue
+
+                task.job.ledger.add_sheet(
+                    index=task.index,
+                    sheet_hash=task.sheet_hash,
+                    row_count=task.metrics.rows_written,
+                    start_date=task.parsed.start_date,
+                )
+                employee_index.add(task.parsed.name.full_name, task.parsed.group)
+
+        self.__record_batch(sheets, time.perf_counter() - started)
+
+        for task in batch:
+            job = task.job
+
+            if task.index is not None:
+                job.remaining -= 1
+
+            if task.error is not None:
+                job.errors += 1
+
+            if job.remaining == 0 and job.status == "pending":
+                await self.__finish(db, job)
+
+        self.__tick("write", started, len(sheets))
+
+    async def __apply(self, db: AsyncDBInterface, sheets: list) -> tuple:
+        """
+        Writes `sheets` in one transaction and returns the conflicting
+        sheets and the reconcile changes per file. Conflicting sheets
+        write nothing at all. Nothing is kept if it raises.
+        """
+        async with db.transaction():
+            if self.reconcile:
+                conflicts = set()
+            else:
+                conflicts = await self.__find_conflicts(db, sheets)
+
+            written = [task for task in sheets if task not in conflicts]
+
+            for task in written:
+                sheet_started = time.perf_counter()
+                # Reconcile diffs the entries against the stored rows
+                # below instead of inserting them.
+                task.metrics.rows_written = await self.processor.write_sheet(
+                    db, task.parsed, task.worker,
+                    save_entries=not self.reconcile)
+                task.metrics.seconds["write"] += \
+                    time.perf_counter() - sheet_started
+
+            changes = {}
+            if self.reconcile:
+                changes = await self.__reconcile(db, written)
+
+            pay_period_ids = [task.worker.pay_period_id for task in written]
+
+            if pay_period_ids:
+                await record_data_change(db, pay_period_ids)
+                await refresh_summaries(db, pay_period_ids)
+
+        return conflicts, changes
+
+    @staticmethod
+    def __fail(task: SheetTask, error: Exception):
+        log.error("Failed to write sheet %d of %s: %s | %s",
+                  task.index, task.job.file_path,
+                  type(error).__name__, error.args)
+
+        task.error = error
+        task.metrics.rows_written = 0
+        task.metrics.error = f"{type(error).__name__}: {error}"
+
+    @staticmethod
+    def __record_batch(sheets: list, seconds: float):
+        """
+        Splits a batch's write time between its files: each gets its
+        sheets' own write time plus a per-sheet share of the batch
+        overhead (reconcile, summaries, commit), and one commit.
+        """
+        if not sheets:
+            return
+
+        overhead = seconds - sum(t.metrics.seconds["write"] for t in sheets)
+        share = max(overhead, 0.0) / len(sheets)
+
+        for task in sheets:
+            task.job.metrics.add("write", task.metrics.seconds["write"] + share)
+
+        for job in {task.job for task in sheets}:
+            job.metrics.commits += 1
+
+    @staticmethod
+    async def __reconcile(db: AsyncDBInterface, sheets: list) -> dict:
+        """
+        Reconciles the sheets file by file; returns each file's
+        change summary, to be counted once the transaction commits.
+        """
+        by_job = {}
+
+        for task in sheets:
+            by_job.setdefault(task.job, []).append(task.worker)
+
+        return {
+            job: await reconcile_work_entries(db, workers)
+            for job, workers in by_job.items()
+        }
+
+    @staticmethod
+    async def __find_conflicts(db: AsyncDBInterface, sheets: list) -> set:
+        """
+        Sheets whose parsed hours differ from hours already stored for
+        their pay period, i.e. corrected reports that INSERT OR IGNORE
+        would silently drop and only `reconcile` can apply. Runs before
+        anything is written; one read covers the whole batch.
+        """
+        keys = list({
+            (*task.parsed.name, str(task.parsed.start_date))
+            for task in sheets
+        })
+
+        if not keys:
+            return set()
+
+        rows = await db._read_work_entries_by_names(args=keys)
+
+        if rows == ERROR:
+            raise Exception("Failed to read stored work entries.")
+
+        stored = {}
+
+        for row in rows:
+            stored.setdefault(tuple(row[4:]), []).append(row[:4])
+
+        conflicts = set()
+
+        for task in sheets:
+            entries = stored.get(
+                (*task.parsed.name, str(task.parsed.start_date)))
+
+            if not entries:
+                continue
+
+            # The pay period exists; write_sheet would find the same ID.
+            task.worker.pay_period_id = entries[0][1]
+            diff = diff_work_entries(entries, task.worker.work_entry_rows())
+
+            if diff["updates"] or diff["deletes"]:
+                log.warning(
+                    "Sheet %d of %s differs from the stored hours of %s "
+                    "(%d changed, %d missing); run ingest --reconcile to "
+                    "apply it", task.index, task.job.file_path,
+                    task.parsed.name.full_name, len(diff["updates"]),
+                    len(diff["deletes"]))
+                conflicts.add(task)
+
+        return conflicts
+
+    async def __finish(self, db: AsyncDBInterface, job: FileJob):
+        if job.errors:
+            await job.finish("error")
+            return
+
+        if job.conflicts:
+            # Not recorded, so the file is read again by a later run.
+            log.warning("%d sheet(s) of %s were not applied",
+                        job.conflicts, job.file_path)
+            await job.finish("conflict")
+            return
+
+        started = time.perf_counter()
+        duration = started - job.started
+
+        try:
+            async with db.transaction():
+                result = await job.ledger.record(
+                    sheet_count=job.sheet_count, duration=duration, db=db)
+
+                if result == ERROR:
+                    raise Exception("Failed to record ingest ledger")
+
+            job.metrics.add("write", time.perf_counter() - started)
+            job.metrics.commits += 1
+
+        except Exception as e:
+            log.error("Failed to finish %s: %s | %s",
+                      job.file_path, type(e).__name__, e.args)
+            await job.finish("error")
+            return
+
+        log.info("Ingested %d of %d sheets from %s",
+                 len(job.ledger.sheets), job.sheet_count, job.file_path)
+        await job.finish("ingested")
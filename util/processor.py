@@ -1,16 +1,28 @@
-from datetime import datetime
-
-import xlrd
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
 
 from structs.result import Result
 from structs.comments import Comments
 from structs.employee import Employee
 from structs.pay_period import PayPeriod
-from util.logger import CLogger
+from structs.records import (
+    CommentRecord, EmployeeName, ParsedSheet, ReportRow
+)
+from util.ingest_ledger import IngestLedger
+from util.lazy import lazy_import
+from util.logger import get_logger
+from util.metrics import cells_scanned
 from util.parser import Parser as p
+from util.pipeline import IngestPipeline, load_workbook
+from util.profiler import memory_traced
+from util.validator import find_anomalies
 from util.work_entry_worker import WorkEntryWorker
 
-log = CLogger().get_logger()
+xlrd = lazy_import("xlrd")
+
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -22,83 +34,218 @@ class Processor:
     data from XLS file generated by TimeTrax timeclocks.
     """
 
-    async def extract_data(self, file_path: str, BUILD: str = "DEBUG") -> Result:
+    def __init__(self, round_to: float = None):
+        # Round parsed hours to this increment (e.g. 0.25), or keep exact.
+        self.round_to = round_to
+        # Summary of the last extract_data/plan call, used for reporting.
+        self.stats = {}
+        # util.metrics.FileMetrics of the last extract_data call.
+        self.metrics = None
+
+    async def plan(self, file_path: str) -> dict:
+        """
+        Checks a file against the ingest ledger without writing anything.
+        Returns the same stats shape as `extract_data`.
+        """
+
+        started = time.perf_counter()
+        ledger = await asyncio.to_thread(IngestLedger, file_path)
+
+        if await ledger.is_ingested():
+            return self.__set_stats(file_path, "ingested", 0, 0, 0, started)
+
+        workbook, sheet_hashes = await asyncio.to_thread(
+            load_workbook, file_path)
+        known = await ledger.known_sheets(sheet_hashes)
+        pending = len([h for h in sheet_hashes if h not in known])
+
+        return self.__set_stats(file_path, "new" if not known else "changed",
+                                workbook.nsheets, pending, 0, started)
+
+    async def extract_data(self,
+                           file_path: str,
+                           BUILD: str = "DEBUG",
+                           force: bool = False,
+                           reconcile: bool = False) -> Result:
         """
         Method that takes in the path to file and returns
         a list of User objects from the file.
+
+        Files already recorded in the ingest ledger are skipped, and
+        only sheets whose contents changed since the last import are
+        written again. Pass `force` to re-ingest everything.
+
+        With `reconcile`, work entries already stored for the report's
+        pay periods are updated or deleted to match the report instead
+        of being left as they are.
         """
 
-        workbook = xlrd.open_workbook(file_path)
+        pipeline = IngestPipeline(processor=self, BUILD=BUILD, force=force,
+                                  reconcile=reconcile)
 
-        for i in range(0, workbook.nsheets):
-            temp_hrs = []
-            dates = []
-            hrs = []
-            report = []
-
-            currentSheet = workbook.sheet_by_index(i)
-
-            date = self.__get_date(currentSheet, BUILD)
-            name = self.__get_name(currentSheet, BUILD)
-            group = self.__get_group(currentSheet, BUILD)
-            comm_date = self.__get_comm_date(currentSheet, BUILD)
-            pi_comm = self.__get_pi_comm(currentSheet, BUILD)
-            po_comm = self.__get_po_comm(currentSheet, BUILD)
-            sp_comm = self.__get_sp_comm(currentSheet, BUILD)
-            dailyHrsCol = self.__get_daily_hrs_col(currentSheet, BUILD)
-
-            temp_hrs.append(
-                p.xls_parser(
-                    sheet=currentSheet,
-                    mincolx=dailyHrsCol[1],
-                    minrowy=dailyHrsCol[0] + 1,
-                    maxcolx=dailyHrsCol[1] + 1,
-                    maxrowy=currentSheet.nrows,
-                    target="[0-9]*:[0-9]*",
-                    xbuff=None,
-                    ybuff=None,
-                    BUILD=BUILD,
-                )
-            )
+        with memory_traced(f"extract_data_{os.path.basename(file_path)}"):
+            self.stats = (await pipeline.run([file_path]))[0]
+
+        self.metrics = pipeline.metrics[0]
 
-            for i in range(0, len(temp_hrs[0]), 2):
-                hrs.append(p.hrs_formatter(temp_hrs[0][i], BUILD))
+        return ERROR if self.stats["status"] == "error" else SUCCESS
 
-            for i in range(1, len(temp_hrs[0]), 2):
-                currDate = [temp_hrs[0][i][0], 1]
-                dates.append(
-                    f"{currentSheet.cell_value(rowx=currDate[0], colx=currDate[1])}"
+    def dry_run(self, file_path: str, BUILD: str = "DEBUG") -> list[dict]:
+        """
+        Runs the full parse and WorkEntryWorker normalization for every
+        sheet without touching the database, and returns one report
+        per sheet. Blocking; run it in a thread from async code.
+        """
+        workbook = xlrd.open_workbook(file_path)
+        reports = []
+
+        for i in range(workbook.nsheets):
+            started = time.perf_counter()
+            report = {
+                "file": str(file_path),
+                "sheet": i,
+                "employee": "",
+                "group": "",
+                "pay_period_start": "",
+                "pay_period_end": "",
+                "entries": 0,
+                "total_hours": 0.0,
+                "anomalies": [],
+                "parse_seconds": 0.0,
+            }
+
+            try:
+                parsed = self.parse_sheet(workbook.sheet_by_index(i), BUILD)
+                worker = WorkEntryWorker(
+                    pay_period_id=None,
+                    report=parsed.rows,
+                    start_date=parsed.start_date,
+                    build=BUILD,
+                    group=parsed.group,
                 )
+                entries = worker.normalize()
+                end_date = parsed.start_date + timedelta(days=14)
 
-            for i in range(len(dates)):
-                report.append([dates[i], hrs[i]])
+                report.update({
+                    "employee": parsed.name.full_name,
+                    "group": parsed.group,
+                    "pay_period_start": str(parsed.start_date),
+                    "pay_period_end": str(end_date),
+                    "entries": len(entries),
+                    "total_hours": round(sum(entries.values()), 4),
+                    "anomalies": find_anomalies(parsed, entries),
+                })
 
-            c_user = await Employee.create(name=name, group=group[0])
-            c_pay_period = await PayPeriod.create(
-                employee_id=c_user.employee_id,
-                date=date
+            except Exception as e:
+                report["anomalies"].append(
+                    f"failed to parse: {type(e).__name__}: {e}")
+
+            report["parse_seconds"] = time.perf_counter() - started
+            reports.append(report)
+
+        return reports
+
+    def parse_sheet(self, sheet, BUILD: str = "DEBUG") -> ParsedSheet:
+        """
+        Extracts everything needed from one report sheet.
+        Pure parsing: safe to run on a worker thread.
+        """
+        temp_hrs = []
+        dates = []
+        first_cell = cells_scanned.value
+
+        date = self.__get_date(sheet, BUILD)
+        name = self.__get_name(sheet, BUILD)
+        group = self.__get_group(sheet, BUILD)
+        comm_date = self.__get_comm_date(sheet, BUILD)
+        pi_comm = self.__get_pi_comm(sheet, BUILD)
+        po_comm = self.__get_po_comm(sheet, BUILD)
+        sp_comm = self.__get_sp_comm(sheet, BUILD)
+        dailyHrsCol = self.__get_daily_hrs_col(sheet, BUILD)
+
+        temp_hrs.append(
+            p.xls_parser(
+                sheet=sheet,
+                mincolx=dailyHrsCol[1],
+                minrowy=dailyHrsCol[0] + 1,
+                maxcolx=dailyHrsCol[1] + 1,
+                maxrowy=sheet.nrows,
+                target="[0-9]*:[0-9]*",
+                xbuff=None,
+                ybuff=None,
+                BUILD=BUILD,
             )
+        )
 
-            worker = WorkEntryWorker(
-                pay_period_id=c_pay_period.pay_period_id,
-                report=report,
-                start_date=date,
-                build=BUILD
+        hrs = p.hrs_to_array(
+            temp_hrs[0][0::2], round_to=self.round_to).tolist()
+
+        for i in range(1, len(temp_hrs[0]), 2):
+            currDate = [temp_hrs[0][i][0], 1]
+            dates.append(
+                f"{sheet.cell_value(rowx=currDate[0], colx=currDate[1])}"
             )
 
-            await worker.extract_work_entries()
+        comment = None
 
-            if len(pi_comm) >= 2 or len(po_comm) >= 2 or len(sp_comm) >= 2:
-                await Comments.create(
-                    pay_period_id=c_pay_period.pay_period_id,
-                    employee_id=c_user.employee_id,
-                    date=comm_date[0],
-                    punch_in_comment=pi_comm[0],
-                    punch_out_comment=po_comm[0],
-                    special_pay_comment=sp_comm[0],
-                )
+        if len(pi_comm) >= 2 or len(po_comm) >= 2 or len(sp_comm) >= 2:
+            comment = CommentRecord(
+                str(comm_date[0]), pi_comm[0], po_comm[0], sp_comm[0])
 
-        return SUCCESS
+        return ParsedSheet(
+            start_date=date,
+            name=name,
+            group=group[0],
+            rows=tuple(map(ReportRow, dates, hrs)),
+            comment=comment,
+            cells_scanned=cells_scanned.value - first_cell,
+        )
+
+    async def write_sheet(self, db, parsed: ParsedSheet,
+                          worker: WorkEntryWorker,
+                          save_entries: bool = True) -> int:
+        """
+        Writes one parsed sheet on the caller's connection and returns
+        the number of work entries parsed. With `save_entries` off the
+        work entries are left for the caller to reconcile.
+        """
+        c_user = await Employee.create(
+            name=parsed.name, group=parsed.group, db=db)
+        c_pay_period = await PayPeriod.create(
+            employee_id=c_user.employee_id,
+            date=parsed.start_date,
+            db=db,
+        )
+
+        worker.pay_period_id = c_pay_period.pay_period_id
+
+        if save_entries and await worker.save_work_entries(db) == ERROR:
+            raise Exception("Failed to save work entries.")
+
+        if parsed.comment is not None:
+            await Comments.create(
+                pay_period_id=c_pay_period.pay_period_id,
+                employee_id=c_user.employee_id,
+                date=parsed.comment.work_date,
+                punch_in_comment=parsed.comment.punch_in,
+                punch_out_comment=parsed.comment.punch_out,
+                special_pay_comment=parsed.comment.special_pay,
+                db=db,
+            )
+
+        return len(worker.entries)
+
+    def __set_stats(self, file_path, status, sheets, sheets_ingested,
+                    rows, started) -> dict:
+        self.stats = {
+            "file": str(file_path),
+            "status": status,
+            "sheets": sheets,
+            "sheets_ingested": sheets_ingested,
+            "rows": rows,
+            "seconds": time.perf_counter() - started,
+        }
+        return self.stats
 
     def __get_date(self, sheet, BUILD) -> datetime:
         date = p.xls_parser(
@@ -117,7 +264,7 @@ class Processor:
 
         return date
 
-    def __get_name(self, sheet, BUILD) -> [str, [int, int]]:
+    def __get_name(self, sheet, BUILD) -> EmployeeName:
         name = p.xls_parser(
             sheet=sheet,
             mincolx=0,
@@ -143,7 +290,11 @@ class Processor:
                 name["Last Name"].append(i)
                 name["Last Name"].reverse()
 
-        return name
+        return EmployeeName(
+            first=name["First Name"].strip(),
+            middle=name["Middle Name"].strip(),
+            last=" ".join(name["Last Name"]).strip(),
+        )
 
     def __get_group(self, sheet, BUILD) -> [str, [int, int]]:
         group = p.xls_parser(
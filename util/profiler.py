@@ -0,0 +1,245 @@
+"""
+Opt-in profiling for ingest, queries and UI tasks.
+
+Nothing is measured until `enable` is called (`--profile` on app.py and
+cli.py). After that, every `profiled` block writes two files to
+logs/profiles/:
+
+    <name>_<time>.pstats     cProfile of the thread that ran the block
+                             (python -m pstats, snakeviz)
+    <name>_<time>.collapsed  stacks of every thread, sampled every few
+                             ms, in the folded format read by
+                             flamegraph.pl and speedscope
+
+and every `memory_traced` block writes the largest allocation growth,
+by source line, between tracemalloc snapshots taken around it:
+
+    <name>_<time>.memory.txt
+"""
+import cProfile
+import functools
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from util.logger import LOG_DIRECTORY, get_logger
+
+log = get_logger(__name__)
+
+PROFILE_DIRECTORY = os.path.join(LOG_DIRECTORY, "profiles")
+
+# Seconds between stack samples.
+SAMPLE_INTERVAL = 0.005
+# Source lines listed in a memory report.
+MEMORY_TOP = 25
+
+_enabled = False
+_directory = PROFILE_DIRECTORY
+_interval = SAMPLE_INTERVAL
+_active = None
+_lock = threading.Lock()
+
+
+def enable(directory: str = PROFILE_DIRECTORY,
+           interval: float = SAMPLE_INTERVAL):
+    """
+    Turns profiling on for the rest of the process.
+    """
+    global _enabled, _directory, _interval
+
+    _enabled = True
+    _directory = directory
+    _interval = interval
+
+    log.info("Profiling enabled; writing profiles to %s", directory)
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def output_stem(name: str) -> str:
+    """
+    logs/profiles/<name>_<time>, with `name` made file-safe.
+    """
+    os.makedirs(_directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "profile"
+
+    return os.path.join(_directory, f"{name}_{stamp}")
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:" \
+           f"{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of every other thread every `interval` seconds.
+    Parsing runs on worker threads that cProfile doesn't see, so the
+    samples are what show where ingest time goes across threads.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        names = {t.ident: t.name for t in threading.enumerate()}
+
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+
+            stack = []
+
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """
+        One "root;...;leaf count" line per distinct stack.
+        """
+        return "".join(f"{stack} {count}\n"
+                       for stack, count in self.stacks.most_common())
+
+
+@contextmanager
+def profiled(name: str):
+    """
+    Profiles the block when profiling is enabled; a no-op otherwise.
+
+    Only one block is profiled at a time. Blocks that start while
+    another is open run unprofiled, since the open profile already
+    covers them.
+    """
+    global _active
+
+    with _lock:
+        if not _enabled or _active is not None:
+            start = False
+        else:
+            start = True
+            _active = name
+
+    if not start:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    sampler = StackSampler(_interval)
+    started = time.perf_counter()
+
+    sampler.start()
+    profile.enable()
+
+    try:
+        yield
+
+    finally:
+        profile.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        try:
+            stem = output_stem(name)
+            profile.dump_stats(f"{stem}.pstats")
+
+            with open(f"{stem}.collapsed", "w") as f:
+                f.write(sampler.collapsed())
+
+            log.info("Profiled %s (%.3fs) to %s.pstats", name, elapsed, stem)
+
+        except OSError as e:
+            log.warning("Could not write profile of %s: %s", name, e)
+
+        finally:
+            _active = None
+
+
+def profile_coroutine(func):
+    """
+    Runs every call of the coroutine function in a `profiled` block
+    named after it.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with profiled(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def memory_traced(name: str, top: int = MEMORY_TOP):
+    """
+    When profiling is enabled, writes the `top` source lines whose
+    allocations grew the most across the block. tracemalloc slows
+    allocation down, so it only traces while a block is open.
+    """
+    if not _enabled:
+        yield
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+
+    if started_tracing:
+        tracemalloc.start()
+
+    before = tracemalloc.take_snapshot()
+
+    try:
+        yield
+
+    finally:
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        if started_tracing:
+            tracemalloc.stop()
+
+        diff = after.compare_to(before, "lineno")
+        lines = [f"{name}: {current / 1024:.1f} KiB traced, "
+                 f"peak {peak / 1024:.1f} KiB",
+                 f"Top {top} allocation changes by line:"]
+        lines += [str(stat) for stat in diff[:top]]
+
+        try:
+            path = f"{output_stem(name)}.memory.txt"
+
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+
+            log.info("Memory profile of %s written to %s", name, path)
+
+        except OSError as e:
+            log.warning("Could not write memory profile of %s: %s", name, e)
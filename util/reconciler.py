@@ -0,0 +1,105 @@
+import math
+
+from structs.records import StoredWorkEntry, WorkEntryRecord
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+from util.work_entry_worker import WorkEntryWorker
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+CHANGE_KINDS = ("inserted", "updated", "deleted", "unchanged")
+
+
+def diff_work_entries(stored: list[StoredWorkEntry],
+                      parsed: list[WorkEntryRecord]) -> dict:
+    """
+    Compares rows read back from WorkEntry against freshly parsed ones.
+
+    Returns the statement arguments needed to make the stored rows
+    match the parsed ones, plus the number of rows left untouched.
+    """
+    current = {
+        (row.pay_period_id, row.work_date): (row.work_entry_id, row.hours)
+        for row in map(StoredWorkEntry._make, stored)
+    }
+    wanted = {
+        (row.pay_period_id, row.work_date): row.hours
+        for row in map(WorkEntryRecord._make, parsed)
+    }
+
+    inserts = []
+    updates = []
+    unchanged = 0
+
+    for key, hours in wanted.items():
+        if key not in current:
+            inserts.append(WorkEntryRecord(*key, hours))
+
+        elif not math.isclose(current[key][1], hours, abs_tol=1e-9):
+            updates.append((hours, current[key][0]))
+
+        else:
+            unchanged += 1
+
+    deletes = [
+        (entry_id,) for key, (entry_id, _) in current.items()
+        if key not in wanted
+    ]
+
+    return {
+        "inserts": inserts,
+        "updates": updates,
+        "deletes": deletes,
+        "unchanged": unchanged,
+    }
+
+
+async def reconcile_work_entries(db: AsyncDBInterface,
+                                 workers: list[WorkEntryWorker]) -> dict:
+    """
+    Brings the stored WorkEntry rows for the workers' pay periods in
+    line with their parsed reports. Stored rows for every affected pay
+    period are loaded in one query; only the differences are written.
+
+    Run inside `db.transaction()` so the changes apply atomically.
+    Returns a {"inserted", "updated", "deleted", "unchanged"} summary.
+    """
+    parsed = [row for worker in workers for row in worker.work_entry_rows()]
+    pay_period_ids = tuple({worker.pay_period_id for worker in workers})
+
+    if not pay_period_ids:
+        return dict.fromkeys(CHANGE_KINDS, 0)
+
+    stored = await db._read_work_entries_by_pay_periods(args=pay_period_ids)
+
+    if stored == ERROR:
+        raise Exception("Failed to read stored work entries.")
+
+    diff = diff_work_entries(stored, parsed)
+
+    if diff["inserts"] and \
+            await db.save_work_entries(args=diff["inserts"]) == ERROR:
+        raise Exception("Failed to insert work entries.")
+
+    if diff["updates"] and \
+            await db.update_work_entries(args=diff["updates"]) == ERROR:
+        raise Exception("Failed to update work entries.")
+
+    if diff["deletes"] and \
+            await db.delete_work_entries(args=diff["deletes"]) == ERROR:
+        raise Exception("Failed to delete work entries.")
+
+    summary = {
+        "inserted": len(diff["inserts"]),
+        "updated": len(diff["updates"]),
+        "deleted": len(diff["deletes"]),
+        "unchanged": diff["unchanged"],
+    }
+
+    log.info("Reconciled %d pay period(s): %s", len(pay_period_ids), summary)
+
+    return summary
@@ -0,0 +1,98 @@
+from typing import NamedTuple
+
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+from util.summaries import pending_summaries
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+
+class Report(NamedTuple):
+    name: str
+    columns: tuple[str, ...]
+    rows: list[tuple]
+
+
+def join_name(row: tuple, first: int) -> tuple:
+    """
+    Collapses the First/Middle/Last name columns starting at `first`
+    into a single "Employee" column.
+    """
+    name = " ".join(filter(None, row[first:first + 3]))
+    return (*row[:first], name, *row[first + 3:])
+
+
+async def group_totals(db, start_date=None, group=None, **_) -> Report:
+    rows = await db._read_group_totals(
+        args=(start_date, group, await pending_summaries(db)))
+    return Report(
+        "groups",
+        ("Group", "Start", "Employees", "Hours", "Overtime", "Change"),
+        rows,
+    )
+
+
+async def period_totals(db, group=None, **_) -> Report:
+    rows = await db._read_period_totals(
+        args=(group, await pending_summaries(db)))
+    return Report(
+        "periods",
+        ("Start", "Employees", "Hours", "Overtime",
+         "Hours Change", "OT Change"),
+        rows,
+    )
+
+
+async def top_overtime(db, start_date=None, group=None, limit=10, **_) -> Report:
+    rows = await db._read_top_overtime(
+        args=(start_date, group, limit, await pending_summaries(db)))
+    return Report(
+        "top-overtime",
+        ("Start", "Rank", "Employee", "Group", "Hours", "Overtime"),
+        rows if rows == ERROR else [join_name(row, 2) for row in rows],
+    )
+
+
+async def weekly_deltas(db, date_from=None, date_to=None,
+                        group=None, **_) -> Report:
+    rows = await db._read_weekly_deltas(args=(date_from, date_to, group))
+    return Report(
+        "weekly",
+        ("Week", "Employee", "Group", "Hours", "Change"),
+        rows if rows == ERROR else [join_name(row, 1) for row in rows],
+    )
+
+
+REPORTS = {
+    "groups": group_totals,
+    "periods": period_totals,
+    "top-overtime": top_overtime,
+    "weekly": weekly_deltas,
+}
+
+
+async def run_report(name: str, db: AsyncDBInterface = None,
+                     **filters) -> Report:
+    """
+    Runs one of `REPORTS` as a single aggregate query. Overtime comes
+    from PayPeriodSummary, with stale summaries computed in memory.
+
+    Filters: start_date, group, date_from, date_to, limit.
+    """
+    if name not in REPORTS:
+        raise ValueError(f"Unknown report: {name}")
+
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await run_report(name, db=db, **filters)
+
+    report = await REPORTS[name](db, **filters)
+
+    if report.rows == ERROR:
+        raise RuntimeError(f"Failed to run report {name} with {filters}")
+
+    return report
@@ -0,0 +1,161 @@
+import json
+from datetime import datetime
+
+from structs.records import PeriodTotals
+from structs.result import Result
+from util.analytics import HoursMatrix
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+from util.overtime_rules import RuleSet, get_rules, read_data_version
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+
+def summary_rows(matrix: HoursMatrix) -> list[tuple]:
+    """
+    PayPeriodSummary rows, in column order, for every matrix row.
+    """
+    updated_at = datetime.now().isoformat(timespec="seconds")
+
+    return [
+        (t.pay_period_id, t.employee_id, t.start_date,
+         t.week_1, t.week_2, t.total,
+         t.week_1_ot, t.week_2_ot, t.overtime,
+         matrix.rules.version, updated_at)
+        for t in matrix.totals()
+    ]
+
+
+async def refresh_summaries(db: AsyncDBInterface,
+                            pay_period_ids=None,
+                            rules: RuleSet = None) -> int:
+    """
+    Recomputes PayPeriodSummary for the given pay periods, or for every
+    pay period when `pay_period_ids` is None, in one batch pass.
+
+    Pay periods left without work entries lose their summary row.
+    Every refreshed pay period loses its StalePayPeriodSummary mark.
+    Run inside `db.transaction()` to apply it atomically. Returns the
+    number of summaries written.
+    """
+    data_version = await read_data_version(db)
+
+    if pay_period_ids is None:
+        rows = await db._read_period_hours(args=(None, None, None, None))
+        cleared = await db.delete_all_pay_period_summaries()
+        unmarked = await db.delete_all_stale_pay_period_summaries()
+
+    else:
+        pay_period_ids = tuple(
+            {int(pp_id) for pp_id in pay_period_ids if pp_id is not None})
+
+        if not pay_period_ids:
+            return 0
+
+        rows = await db._read_period_hours_by_pay_periods(args=pay_period_ids)
+        cleared = await db.delete_pay_period_summaries(args=pay_period_ids)
+        unmarked = await db.delete_stale_pay_period_summaries(
+            args=pay_period_ids)
+
+    if rows == ERROR or cleared == ERROR or unmarked == ERROR:
+        raise Exception("Failed to refresh pay period summaries.")
+
+    matrix = HoursMatrix.from_rows(
+        rows, rules=rules or get_rules(), data_version=data_version)
+    summaries = summary_rows(matrix)
+
+    if summaries and await db.save_pay_period_summaries(args=summaries) == ERROR:
+        raise Exception("Failed to save pay period summaries.")
+
+    return len(summaries)
+
+
+async def stale_pay_periods(db: AsyncDBInterface,
+                            rules: RuleSet = None) -> list[int]:
+    """
+    Pay periods whose summary is missing or was computed under another
+    rule set than `rules`, the active rules by default.
+    """
+    rules = rules or get_rules()
+    stale = await db._read_unsummarized_pay_periods(args=(rules.version,))
+
+    if stale == ERROR:
+        raise Exception("Failed to find stale pay period summaries.")
+
+    return [row[0] for row in stale]
+
+
+async def refresh_stale_summaries(db: AsyncDBInterface) -> int:
+    """
+    Rebuilds the summaries that are missing or were computed under
+    another rule set. Returns the number of pay periods refreshed.
+
+    Writers only; readers see the same totals via `pending_summaries`.
+    """
+    if db.read_only:
+        raise ValueError("Stale summaries can only be refreshed by the writer.")
+
+    pay_period_ids = await stale_pay_periods(db)
+
+    if pay_period_ids:
+        log.info("Rebuilding %d pay period summaries for rules %s",
+                 len(pay_period_ids), get_rules().version)
+
+        async with db.transaction():
+            await refresh_summaries(db, pay_period_ids)
+
+    return len(pay_period_ids)
+
+
+async def pending_summaries(db: AsyncDBInterface) -> str:
+    """
+    The stale pay periods and their summaries computed in memory under
+    the active rules, as the JSON the summary queries take in place of
+    the stored rows (see `SUMMARIES_CTE`). Only reads, so readers can
+    use it without waiting for the writer to refresh.
+    """
+    rules = get_rules()
+    pay_period_ids = await stale_pay_periods(db, rules)
+    summaries = []
+
+    if pay_period_ids:
+        rows = await db._read_period_hours_by_pay_periods(
+            args=tuple(pay_period_ids))
+
+        if rows == ERROR:
+            raise Exception("Failed to read hours for stale summaries.")
+
+        matrix = HoursMatrix.from_rows(
+            rows, rules=rules, data_version=await read_data_version(db))
+        summaries = [row[:10] for row in summary_rows(matrix)]
+
+    return json.dumps({"stale": pay_period_ids, "rows": summaries})
+
+
+async def read_summaries(start_date: str = None,
+                         group: str = None,
+                         db: AsyncDBInterface = None) -> list[PeriodTotals]:
+    """
+    Stored totals for every matching pay period, most overtime first.
+
+    Summaries the writer hasn't refreshed for the active rules yet are
+    computed in memory, so the overtime always follows those rules.
+    """
+    if db is None:
+        async with AsyncDBInterface(read_only=True) as db:
+            return await read_summaries(start_date, group, db=db)
+
+    args = (start_date, group)
+    rows = await db._read_pay_period_summaries(
+        args=(*args, await pending_summaries(db)))
+
+    if rows == ERROR:
+        raise RuntimeError(f"Failed to read pay period summaries for {args}")
+
+    return [
+        PeriodTotals(row[0], " ".join(filter(None, row[1:4])), *row[4:13])
+        for row in rows
+    ]
@@ -6,10 +6,16 @@ from datetime import datetime
 from typing import Union
 from util.async_db import AsyncDBInterface
 from structs.result import Result
-from util.logger import CLogger
+from util.comment_search import search_comments
+from util.logger import get_logger
+from util.name_index import load_employee_index
+from util.overtime_rules import load_rules
 from util.processor import Processor
+from util.profiler import profile_coroutine
+from util.reports import run_report
+from util.summaries import pending_summaries, refresh_stale_summaries
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
 
 ERROR = Result.ERROR
 SUCCESS = Result.SUCCESS
@@ -29,6 +35,9 @@ class TaskManager(QObject):
     db_names = pyqtSignal(object)
     db_work_entry = pyqtSignal(object)
     db_comment = pyqtSignal(object)
+    db_report = pyqtSignal(object)
+    db_comment_search = pyqtSignal(object)
+    ingest_metrics = pyqtSignal(object)
     action_result = pyqtSignal(str)
     init_summary = pyqtSignal()
     init_result = pyqtSignal(object)
@@ -48,16 +57,21 @@ class TaskManager(QObject):
 
         self._task = None
 
+    @profile_coroutine
     async def db_init(self):
         self.started.emit(f"[{self.now()}] Starting DB...")
 
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface.writer() as db:
                 result = await db.initialize_db()
 
                 if result is None or result == ERROR:
                     raise Exception(f"Error starting DB: {result}")
 
+                await load_rules(db)
+                await refresh_stale_summaries(db)
+                await load_employee_index(db)
+
             self.done.emit(f"[{self.now()}] Successfully Started DB!")
             self.init_finished.emit()
 
@@ -76,7 +90,7 @@ class TaskManager(QObject):
         self.started.emit(f"[{self.now()}] Closing Application...")
 
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface.writer() as db:
 
                 result = await db.dump_db_and_zip()
                 if result == ERROR or None:
@@ -105,6 +119,7 @@ class TaskManager(QObject):
                     self.query_db(method_name=method_name, args=args)
                 )
 
+    @profile_coroutine
     async def query_db(self,
                        method_name: str,
                        args: Union[tuple, str] = None
@@ -112,7 +127,7 @@ class TaskManager(QObject):
         self.started.emit(f"[{self.now()}] Querying DB...")
 
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface(read_only=True) as db:
                 method = getattr(db, method_name)
 
                 if args is None:
@@ -141,9 +156,10 @@ class TaskManager(QObject):
                 self.combo_box_query_db()
             )
 
+    @profile_coroutine
     async def combo_box_query_db(self):
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface(read_only=True) as db:
                 dates_result = await db.read_dates()
 
                 if dates_result == ERROR or dates_result is None:
@@ -167,9 +183,10 @@ class TaskManager(QObject):
                 self.employee_combo_box_query(args=args)
             )
 
+    @profile_coroutine
     async def employee_combo_box_query(self, args: str):
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface(read_only=True) as db:
                 names = await db.read_names(args=(args, ))
 
                 if names == ERROR or names is None:
@@ -187,12 +204,13 @@ class TaskManager(QObject):
                 self.work_entry_query(name=args, start_date=start_date)
             )
 
+    @profile_coroutine
     async def work_entry_query(self, name: tuple, start_date: str):
         self.started.emit(
             f"[{self.now()}] Querying for: {' '.join(' '.join(name).split())}")
 
         try:
-            async with AsyncDBInterface() as db:
+            async with AsyncDBInterface(read_only=True) as db:
                 employee_id = await db._read_employee_id(args=name)
 
                 if employee_id == ERROR or employee_id is None:
@@ -210,12 +228,72 @@ class TaskManager(QObject):
                 if work_entries == ERROR or work_entries is None:
                     raise Exception("pay_period_id not found.")
 
-                self.db_work_entry.emit([work_entries, start_date])
+                group = await db._read_employee_group(
+                    args=(employee_id[0][0], ))
+
+                if group == ERROR or not group:
+                    raise Exception("employee group not found.")
+
+                summary = await db._read_pay_period_summary(
+                    args=(pp_id[0][0], await pending_summaries(db)))
+
+                if summary == ERROR:
+                    raise Exception("pay period summary not found.")
+
+                self.db_work_entry.emit([
+                    work_entries,
+                    start_date,
+                    group[0][0],
+                    summary[0] if summary else None,
+                ])
 
         except Exception as e:
             self.error.emit(str(e))
             log.error("Failed to process file: %s", str(e))
 
+    async def start_report_query(self, name: str, **filters):
+        if self._task is None or self._task.done():
+
+            self._task = await asyncio.create_task(
+                self.report_query(name=name, **filters)
+            )
+
+    @profile_coroutine
+    async def report_query(self, name: str, **filters):
+        self.started.emit(f"[{self.now()}] Running {name} report...")
+
+        try:
+            report = await run_report(name, **filters)
+
+            self.db_report.emit(report)
+            self.done.emit(f"[{self.now()}] Finished {name} report")
+
+        except Exception as e:
+            self.error.emit(str(e))
+            log.error("Failed to run report: %s", str(e))
+
+    async def start_comment_search(self, text: str, **filters):
+        if self._task is None or self._task.done():
+
+            self._task = await asyncio.create_task(
+                self.comment_search_query(text=text, **filters)
+            )
+
+    @profile_coroutine
+    async def comment_search_query(self, text: str, **filters):
+        self.started.emit(f"[{self.now()}] Searching comments for: {text}")
+
+        try:
+            matches = await search_comments(text, **filters)
+
+            self.db_comment_search.emit(matches)
+            self.done.emit(
+                f"[{self.now()}] Found {len(matches)} matching comment(s)")
+
+        except Exception as e:
+            self.error.emit(str(e))
+            log.error("Failed to search comments: %s", str(e))
+
     def start_init_summary(self):
         self.init_summary.emit()
 
@@ -225,13 +303,19 @@ class TaskManager(QObject):
                 self.process_file(file_path=file_path)
             )
 
+    @profile_coroutine
     async def process_file(self, file_path: str = None):
         self.started.emit(
             f"[{self.now()}] Started Processing File: {file_path}"
         )
 
         try:
-            result = await Processor().extract_data(file_path=file_path)
+            processor = Processor()
+            result = await processor.extract_data(file_path=file_path)
+
+            if processor.metrics is not None:
+                self.ingest_metrics.emit(processor.metrics)
+
             if result == ERROR or result is None:
                 raise Exception(
                     f"{result}")
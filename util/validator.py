@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from structs.records import ParsedSheet
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+MAX_DAILY_HOURS = 24.0
+
+
+def find_anomalies(parsed: ParsedSheet, entries: dict) -> list[str]:
+    """
+    Sanity checks on one parsed sheet and its normalized work entries.
+    Returns a human-readable message per problem found.
+    """
+    anomalies = []
+
+    if not parsed.name.first or not parsed.name.last:
+        anomalies.append("employee name is incomplete")
+
+    if not str(parsed.group).strip():
+        anomalies.append("employee group is empty")
+
+    start = parsed.start_date
+    end = start + timedelta(days=14)
+
+    dated_rows = [row for row in parsed.rows if any(
+        c.isdigit() for c in row.label)]
+
+    if len(dated_rows) != len(entries):
+        anomalies.append(
+            f"{len(dated_rows) - len(entries)} duplicate work date(s)")
+
+    if not entries:
+        anomalies.append("no work entries")
+
+    for work_date, hours in sorted(entries.items()):
+        if not start <= work_date < end:
+            anomalies.append(f"{work_date} is outside the pay period")
+
+        if hours < 0:
+            anomalies.append(f"{work_date} has negative hours ({hours})")
+
+        elif hours > MAX_DAILY_HOURS:
+            anomalies.append(f"{work_date} has {hours} hours")
+
+    return anomalies
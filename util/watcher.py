@@ -0,0 +1,203 @@
+import asyncio
+import os
+import time
+
+from structs.result import Result
+from util.logger import get_logger
+from util.processor import Processor
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+
+class DirectoryWatcher:
+    """
+    Watches a directory for new or changed .xls reports and feeds
+    them through `Processor.extract_data`.
+
+    The directory is polled every `interval` seconds. When the optional
+    `inotify_simple` package is installed, filesystem events wake the
+    poll early so new files are picked up immediately.
+
+    A file is only ingested once its size and mtime have been stable
+    for `settle` seconds, so exports that are still being written are
+    left alone. The ingest ledger makes restarts safe: files that were
+    already imported are skipped after a hash check. A file that fails
+    to ingest is only retried once its size or mtime changes.
+
+    With `recursive`, subdirectories are scanned and, under inotify,
+    watched as well, including ones created while watching.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 interval: float = 2.0,
+                 settle: float = 3.0,
+                 workers: int = 2,
+                 recursive: bool = False,
+                 round_to: float = None,
+                 BUILD: str = "RELEASE"):
+        self.directory = os.path.abspath(directory)
+        self.interval = interval
+        self.settle = settle
+        self.recursive = recursive
+        self.round_to = round_to
+        self.BUILD = BUILD
+
+        self.semaphore = asyncio.Semaphore(max(1, workers))
+        self.stop_event = asyncio.Event()
+
+        # path -> (size, mtime, first time this signature was seen)
+        self.pending = {}
+        # path -> (size, mtime) of the last version handed to Processor,
+        # whether it was ingested or failed
+        self.handled = {}
+        # directories with an inotify watch
+        self.watched = set()
+        self.tasks = set()
+
+    def stop(self):
+        self.stop_event.set()
+
+    async def run(self):
+        log.info("Watching %s (poll %.1fs, settle %.1fs, inotify %s)",
+                 self.directory, self.interval, self.settle,
+                 "on" if inotify_simple else "off")
+
+        notifier = self.__make_notifier()
+
+        try:
+            while not self.stop_event.is_set():
+                self.scan()
+                await self.__wait(notifier)
+
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+
+            log.info("Stopped watching %s", self.directory)
+
+    def scan(self):
+        now = time.monotonic()
+        seen = set()
+
+        for path in self.__list_reports():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            seen.add(path)
+            signature = (stat.st_size, stat.st_mtime)
+
+            if self.handled.get(path) == signature:
+                continue
+
+            previous = self.pending.get(path)
+
+            if previous is None or previous[:2] != signature:
+                self.pending[path] = (*signature, now)
+                continue
+
+            if now - previous[2] >= self.settle:
+                del self.pending[path]
+                self.handled[path] = signature
+                self.__submit(path)
+
+        for path in set(self.pending) - seen:
+            del self.pending[path]
+
+    def __submit(self, path: str):
+        task = asyncio.create_task(self.__ingest(path))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def __ingest(self, path: str):
+        async with self.semaphore:
+            processor = Processor(round_to=self.round_to)
+
+            try:
+                result = await processor.extract_data(
+                    file_path=path, BUILD=self.BUILD)
+
+                if result == ERROR:
+                    raise Exception(f"Processor returned {result}")
+
+                stats = processor.stats
+                log.info("%s %s: %d/%d sheets, %d rows in %.3fs",
+                         stats["status"], path, stats["sheets_ingested"],
+                         stats["sheets"], stats["rows"], stats["seconds"])
+
+            except Exception as e:
+                # `handled` keeps the failed signature, so the file is
+                # only retried once it changes.
+                log.error("Failed to ingest %s: %s | %s",
+                          path, type(e).__name__, e.args)
+
+    def __list_reports(self) -> list[str]:
+        reports = []
+
+        for root, dirs, files in os.walk(self.directory):
+            reports.extend(
+                os.path.join(root, f) for f in files
+                if f.lower().endswith(".xls") and not f.startswith(".")
+            )
+
+            if not self.recursive:
+                break
+
+        return reports
+
+    def __make_notifier(self):
+        if inotify_simple is None:
+            return None
+
+        notifier = inotify_simple.INotify()
+        self.__watch_directories(notifier)
+        return notifier
+
+    def __watch_directories(self, notifier):
+        """
+        Adds a watch for the directory and, when recursive, for every
+        subdirectory not watched yet.
+        """
+        flags = inotify_simple.flags
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+        # The kernel drops the watch of a removed directory.
+        self.watched = {d for d in self.watched if os.path.isdir(d)}
+
+        for root, dirs, files in os.walk(self.directory):
+            if root not in self.watched:
+                try:
+                    notifier.add_watch(root, mask)
+                    self.watched.add(root)
+
+                except OSError as e:
+                    log.warning("Could not watch %s: %s", root, e)
+
+            if not self.recursive:
+                break
+
+    async def __wait(self, notifier):
+        if notifier is None:
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        # Wake on the first filesystem event or after one poll interval.
+        await asyncio.to_thread(notifier.read, int(self.interval * 1000))
+
+        if self.recursive:
+            self.__watch_directories(notifier)
@@ -1,10 +1,19 @@
 import re
 from datetime import datetime, timedelta
+from functools import cached_property
 
-from structs.work_entry import WorkEntry
-from util.logger import CLogger
+from structs.records import ReportRow, WorkEntryRecord
+from structs.result import Result
+from util.async_db import AsyncDBInterface
+from util.logger import get_logger
+from util.pay_period_analytics import PayPeriodAnalytics
 
-log = CLogger().get_logger()
+log = get_logger(__name__)
+
+ERROR = Result.ERROR
+SUCCESS = Result.SUCCESS
+
+DATED_ROW = re.compile(r"\d")
 
 
 class WorkEntryWorker:
@@ -12,88 +21,105 @@ class WorkEntryWorker:
     Async Worker to handle Work Entries for a given pay period.
     """
 
-    def __init__(self, pay_period_id: int, report: list, start_date: datetime, build: str):
+    def __init__(self, pay_period_id: int, report: tuple[ReportRow, ...], start_date: datetime, build: str,
+                 group: str = None):
         self.pay_period_id = pay_period_id
+        self.group = group
         self.report = report
         self.start_date = start_date
         self.end_date = start_date + timedelta(days=14)
         self.build = build
+        self.entries = None
 
-    def __extract_hrs(self) -> list[int]:
-        return [row[1] for row in self.report if re.search(r"\d", row[0])]
+    def __extract_report_rows(self) -> list[ReportRow]:
+        return [row for row in self.report if DATED_ROW.search(row.label)]
 
-    def __extract_report_dates(self) -> list[datetime.date]:
-        dates = []
-        for row in self.report:
-            if re.search(r"\d", row[0]):
-                date_str = row[0].split(" ", 1)[1] + f"/{self.start_date.year}"
-                dates.append(datetime.strptime(date_str, "%m/%d/%Y").date())
-        return dates
+    def __extract_report_dates(self, rows: list[ReportRow]) -> list[datetime.date]:
+        year = self.start_date.year
+        return [
+            datetime.strptime(f"{row.label.split(' ', 1)[1]}/{year}", "%m/%d/%Y").date()
+            for row in rows
+        ]
 
-    def __weekday_filter(self) -> list[datetime.date]:
-        days = {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday"}
-        return [d for d in self.pay_period_dates() if d.strftime("%A") in days]
+    def extract_hrs_wrked(self) -> dict[datetime.date, int]:
+        if self.entries is not None:
+            return self.entries
 
-    def __weekend_filter(self) -> list[datetime.date]:
-        days = {"Saturday", "Sunday"}
-        return [d for d in self.pay_period_dates() if d.strftime("%A") in days]
+        rows = self.__extract_report_rows()
+        dates = self.__extract_report_dates(rows)
+        return {d: row.hours for d, row in zip(dates, rows)}
 
-    def __date_name(self, dates: list[datetime.date]) -> list[str]:
-        return [d.strftime("%A") for d in dates]
+    def normalize(self) -> dict[datetime.date, int]:
+        """
+        Parses the report into {work_date: hours} and keeps the result
+        for `save_work_entries`. Runs without touching the database.
 
-    def extract_hrs_wrked(self) -> dict[datetime.date, int]:
-        dates = self.__extract_report_dates()
-        hrs = self.__extract_hrs()
-        return {dates[i]: hrs[i] for i in range(len(dates))}
+        Raises ValueError for negative hours, which WorkEntry rejects,
+        so the sheet fails here instead of inside a write transaction.
+        """
+        entries = self.extract_hrs_wrked()
+        negative = [
+            f"{work_date} ({hours})"
+            for work_date, hours in sorted(entries.items()) if hours < 0
+        ]
 
-    async def extract_work_entries(self):
+        if negative:
+            raise ValueError(f"negative hours on {', '.join(negative)}")
+
+        self.entries = entries
+        return self.entries
+
+    @cached_property
+    def analytics(self) -> PayPeriodAnalytics:
         """
-        Asynchronously creates and returns WorkEntry objects.
+        Totals for this pay period, built from the normalized entries
+        the first time they are asked for.
         """
-        raw_hrs = self.extract_hrs_wrked()
-        counter = 0
+        if self.entries is None:
+            self.normalize()
 
-        for work_date, hours in raw_hrs.items():
-            counter += hours
+        return PayPeriodAnalytics(self.start_date, self.entries, self.group)
 
-            try:
-                await WorkEntry.create(
-                    pay_period_id=self.pay_period_id,
-                    work_date=work_date,
-                    hours=hours,
-                    BUILD=self.build
-                )
+    def work_entry_rows(self) -> list[WorkEntryRecord]:
+        """
+        Rows ready to be bound straight into the WorkEntry table.
+        """
+        if self.entries is None:
+            self.normalize()
 
-            except Exception as e:
-                log.error(f"Failed to create WorkEntry: {e}")
-                continue
+        return [
+            WorkEntryRecord(self.pay_period_id, str(work_date), hours)
+            for work_date, hours in self.entries.items()
+        ]
 
-    def extract_weekday_hrs(self) -> dict[datetime.date, int]:
-        all_dates = self.extract_hrs_wrked()
-        weekdays = self.__weekday_filter()
-        return {d: all_dates[d] for d in weekdays if d in all_dates}
+    async def save_work_entries(self, db: AsyncDBInterface) -> Result:
+        """
+        Writes every normalized entry with a single executemany on
+        the caller's connection.
+        """
+        result = await db.save_work_entries(args=self.work_entry_rows())
 
-    def extract_weekend_hrs(self) -> dict[datetime.date, int]:
-        all_dates = self.extract_hrs_wrked()
-        weekends = self.__weekend_filter()
-        return {d: all_dates[d] for d in weekends if d in all_dates}
+        if result == ERROR:
+            log.error("Failed to save work entries for PayPeriodID: %s",
+                      self.pay_period_id)
 
-    def extract_ot_logged(self) -> dict[datetime.date, int]:
-        all_hrs = self.extract_hrs_wrked()
-        total = sum(all_hrs.values())
+        return result
 
-        if total < 80.0:
-            return {}
+    async def extract_work_entries(self):
+        """
+        Asynchronously creates the WorkEntry rows for this pay period.
+        """
+        async with AsyncDBInterface.writer() as db:
+            return await self.save_work_entries(db)
 
-        overtime = {}
-        weekday_hrs = self.extract_weekday_hrs()
+    def extract_weekday_hrs(self) -> dict[datetime.date, int]:
+        return self.analytics.weekday_hours
 
-        for d, hrs in weekday_hrs.items():
-            excess = hrs - 8.0
-            if excess > 0:
-                overtime[d] = excess
+    def extract_weekend_hrs(self) -> dict[datetime.date, int]:
+        return self.analytics.weekend_hours
 
-        return overtime
+    def extract_ot_logged(self) -> dict[datetime.date, int]:
+        return self.analytics.overtime
 
     def pay_period_dates(self) -> list[datetime.date]:
-        return [self.start_date + timedelta(days=i) for i in range(14)]
+        return list(self.analytics.calendar)